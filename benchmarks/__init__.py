@@ -0,0 +1 @@
+# замеры производительности пакета table_modules
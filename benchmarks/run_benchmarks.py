@@ -0,0 +1,193 @@
+"""
+Замеры времени и памяти для всех публичных операций пакета table_modules.
+
+Запуск из корня репозитория:
+    python -m benchmarks.run_benchmarks --rows 1000,10000,100000 --output bench.json
+    python -m benchmarks.run_benchmarks --baseline bench.json   # сравнение с сохранёнными результатами
+"""
+import argparse
+import contextlib
+import io
+import json
+import os
+import platform
+import sys
+import tempfile
+import time
+import tracemalloc
+
+from table_modules import (
+    load_csv, save_csv, iter_csv, load_pickle, save_pickle, save_text, load_binary, save_binary,
+    get_rows_by_number, get_rows_by_index, get_column_types, set_column_types,
+    get_values, get_value, set_values, set_value, print_table, concat, split,
+    create_index, concat_many, compact, to_columnar, to_rows
+)
+from table_modules.table_operations import auto_detect_column_types
+from table_modules.type_inference import converter_for
+from .synthetic import make_table
+
+def copy_table(table):
+    """Копия таблицы, которую можно изменять, не трогая исходную."""
+    return {"header": list(table['header']), "rows": [list(row) for row in table['rows']]}
+
+def typed_table(table):
+    """Копия таблицы со значениями, приведёнными к определённым типам столбцов (пустые значения - None)."""
+    typed = copy_table(table)
+    for i, col_type in get_column_types(table).items():
+        if col_type is not str:
+            convert = converter_for(col_type)
+            set_values(typed, [convert(value) if value != "" else None for value in get_values(typed, i)], i)
+    return typed
+
+def benchmarks(table, paths):
+    """
+    Список замеров: (имя, функция подготовки). Подготовка не входит в замер и
+    возвращает (функция, аргументы) для одного запуска.
+    """
+    n = len(table['rows'])
+    key = table['rows'][n // 2][0]
+    # set_column_types не принимает пустые значения, поэтому преобразуются только столбцы без пропусков
+    convertible = {i: t for i, t in get_column_types(table).items() if t is not str and "" not in get_values(table, i)}
+    typed = typed_table(table)
+    indexed = copy_table(table)
+    create_index(indexed)
+    one_row = get_rows_by_number(table, 0, 1)
+    halves = split(table, n // 2)
+    return [
+        ("save_csv", lambda: (save_csv, (table, paths['csv']))),
+        ("load_csv", lambda: (load_csv, (paths['csv'],))),
+        ("load_csv[auto_detect_types]", lambda: (load_csv, (paths['csv'], True))),
+        ("load_csv[schema=infer]", lambda: (lambda path: load_csv(path, schema="infer"), (paths['csv'],))),
+        ("iter_csv", lambda: (lambda path: sum(len(chunk['rows']) for chunk in iter_csv(path)), (paths['csv'],))),
+        ("save_pickle", lambda: (save_pickle, (table, paths['pkl']))),
+        ("load_pickle", lambda: (load_pickle, (paths['pkl'],))),
+        ("save_text", lambda: (save_text, (table, paths['txt']))),
+        ("save_binary", lambda: (save_binary, (typed, paths['bin']))),
+        ("load_binary", lambda: (load_binary, (paths['bin'],))),
+        ("get_rows_by_number", lambda: (get_rows_by_number, (table, n // 4, n // 2))),
+        ("get_rows_by_number[copy]", lambda: (lambda t: get_rows_by_number(t, n // 4, n // 2, copy_table=True), (table,))),
+        ("get_rows_by_index", lambda: (get_rows_by_index, (table, key))),
+        ("get_rows_by_index[indexed]", lambda: (get_rows_by_index, (indexed, key))),
+        ("create_index", lambda: (create_index, (copy_table(table),))),
+        ("get_column_types", lambda: (get_column_types, (table,))),
+        ("auto_detect_column_types", lambda: (auto_detect_column_types, (table,))),
+        ("set_column_types", lambda: (set_column_types, (copy_table(table), convertible))),
+        ("get_values", lambda: (get_values, (table, 1))),
+        ("get_value", lambda: (get_value, (one_row, 0))),
+        ("set_values", lambda: (set_values, (copy_table(table), [0] * n, 1))),
+        ("set_value", lambda: (set_value, (copy_table(one_row), 0, 0))),
+        ("print_table", lambda: (_print_quietly, (table,))),
+        ("concat", lambda: (concat, halves)),
+        ("concat_many", lambda: (concat_many, ([halves[0], halves[1], table],))),
+        ("compact", lambda: (compact, (concat(*halves),))),
+        ("split", lambda: (split, (table, n // 2))),
+        ("to_columnar", lambda: (to_columnar, (typed,))),
+        ("to_rows", lambda: (to_rows, (to_columnar(typed),))),
+    ]
+
+def _print_quietly(table):
+    """print_table с выводом в буфер, а не в консоль."""
+    with contextlib.redirect_stdout(io.StringIO()):
+        print_table(table)
+
+def measure(setup, repeat):
+    """
+    Замеряет лучшее время из repeat запусков и пиковое выделение памяти (отдельным запуском под tracemalloc).
+
+    Returns:
+        tuple: (секунды, пиковые байты)
+    """
+    times = []
+    for _ in range(repeat):
+        func, args = setup()
+        start = time.perf_counter()
+        func(*args)
+        times.append(time.perf_counter() - start)
+    func, args = setup()
+    tracemalloc.start()
+    try:
+        func(*args)
+        _, peak = tracemalloc.get_traced_memory()
+    finally:
+        tracemalloc.stop()
+    return min(times), peak
+
+def run(rows_list, columns=6, cardinality=None, null_rate=0.0, repeat=3, only=None, seed=0, log=print):
+    """
+    Выполняет все замеры для каждого размера таблицы.
+
+    Returns:
+        dict: Результаты в машиночитаемом виде ('meta' и список 'results').
+    """
+    results = []
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        paths = {ext: os.path.join(tmp_dir, f"table.{ext}") for ext in ("csv", "pkl", "txt", "bin")}
+        for rows in rows_list:
+            table = make_table(rows, columns, cardinality=cardinality, null_rate=null_rate, seed=seed)
+            save_csv(table, paths['csv']) # файлы для замеров загрузки
+            save_pickle(table, paths['pkl'])
+            save_binary(typed_table(table), paths['bin'])
+            for name, setup in benchmarks(table, paths):
+                if only and not any(part in name for part in only):
+                    continue
+                seconds, peak = measure(setup, repeat)
+                results.append({"name": name, "rows": rows, "seconds": seconds, "peak_bytes": peak})
+                log(f"{name:32} {rows:>10} rows {seconds * 1000:12.3f} ms {peak / 2 ** 20:10.2f} MiB")
+    meta = {"python": platform.python_version(), "platform": platform.platform(), "columns": columns,
+            "cardinality": cardinality, "null_rate": null_rate, "repeat": repeat, "seed": seed}
+    return {"meta": meta, "results": results}
+
+def compare(baseline, current, tolerance=0.25):
+    """
+    Сравнивает результаты с базовыми.
+
+    Args:
+        baseline (dict): Сохранённые результаты run.
+        current (dict): Новые результаты run.
+        tolerance (float): Допустимое относительное ухудшение времени или памяти.
+
+    Returns:
+        list: Строки с описанием регрессий (пустой список - регрессий нет).
+    """
+    base = {(r['name'], r['rows']): r for r in baseline['results']}
+    regressions = []
+    for result in current['results']:
+        old = base.get((result['name'], result['rows']))
+        if old is None:
+            continue
+        for metric in ("seconds", "peak_bytes"):
+            if old[metric] > 0 and result[metric] > old[metric] * (1 + tolerance):
+                regressions.append(f"{result['name']} ({result['rows']} rows): {metric} "
+                                   f"{old[metric]:.6g} -> {result[metric]:.6g} (x{result[metric] / old[metric]:.2f})")
+    return regressions
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Замеры производительности table_modules.")
+    parser.add_argument("--rows", default="1000,10000,100000", help="размеры таблиц через запятую (до 10000000)")
+    parser.add_argument("--columns", type=int, default=6)
+    parser.add_argument("--cardinality", type=int, default=None, help="число различных значений в столбце")
+    parser.add_argument("--null-rate", type=float, default=0.0)
+    parser.add_argument("--repeat", type=int, default=3)
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--only", default="", help="замерять только операции, имя которых содержит одну из подстрок (через запятую)")
+    parser.add_argument("--output", help="куда сохранить результаты в JSON")
+    parser.add_argument("--baseline", help="JSON с базовыми результатами для сравнения")
+    parser.add_argument("--tolerance", type=float, default=0.25)
+    args = parser.parse_args(argv)
+
+    rows_list = [int(value) for value in args.rows.split(",") if value]
+    only = [part for part in args.only.split(",") if part]
+    current = run(rows_list, args.columns, args.cardinality, args.null_rate, args.repeat, only, args.seed)
+    if args.output:
+        with open(args.output, mode="w", encoding="utf-8") as file:
+            json.dump(current, file, ensure_ascii=False, indent=2)
+    if args.baseline:
+        with open(args.baseline, encoding="utf-8") as file:
+            regressions = compare(json.load(file), current, args.tolerance)
+        for line in regressions:
+            print("РЕГРЕССИЯ:", line)
+        return 1 if regressions else 0
+    return 0
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,49 @@
+import random
+
+_TYPES = ("str", "int", "float", "bool")
+
+def make_table(rows, columns=6, type_mix=_TYPES, cardinality=None, null_rate=0.0, seed=0):
+    """
+    Создаёт детерминированную синтетическую таблицу в том же виде, в каком её возвращает load_csv.
+
+    Args:
+        rows (int): Количество строк.
+        columns (int): Количество столбцов.
+        type_mix (tuple): Типы столбцов по кругу: "str", "int", "float", "bool".
+        cardinality (int, optional): Количество различных значений в каждом столбце (по умолчанию не ограничено).
+        null_rate (float): Доля пустых значений (0.0 - 1.0).
+        seed (int): Начальное значение генератора, одинаковые параметры дают одинаковую таблицу.
+
+    Returns:
+        dict: Таблица с ключами 'header' и 'rows', все значения - строки.
+
+    Raises:
+        ValueError: Неизвестный тип в type_mix или null_rate вне диапазона [0, 1].
+    """
+    if any(col_type not in _TYPES for col_type in type_mix):
+        raise ValueError(f"Неизвестный тип в type_mix: {type_mix}")
+    if not 0.0 <= null_rate <= 1.0:
+        raise ValueError("null_rate должен быть в диапазоне [0, 1].")
+
+    rng = random.Random(seed)
+    header = [f"{type_mix[i % len(type_mix)]}_{i}" for i in range(columns)]
+    column_values = []
+    for i in range(columns):
+        col_type = type_mix[i % len(type_mix)]
+        distinct = cardinality or rows
+        pool = [_value(col_type, k, rng) for k in range(min(distinct, rows) or 1)]
+        values = pool if len(pool) == rows else [pool[rng.randrange(len(pool))] for _ in range(rows)]
+        if null_rate:
+            values = ["" if rng.random() < null_rate else value for value in values]
+        column_values.append(values)
+    return {"header": header, "rows": [list(row) for row in zip(*column_values)]}
+
+def _value(col_type, k, rng):
+    """Одно значение столбца в строковом виде."""
+    if col_type == "int":
+        return str(rng.randrange(-10 ** 6, 10 ** 6))
+    if col_type == "float":
+        return f"{rng.uniform(-1e6, 1e6):.3f}"
+    if col_type == "bool":
+        return "true" if k % 2 else "false"
+    return f"value_{k}_{rng.randrange(10 ** 6)}"
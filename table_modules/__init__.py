@@ -1,16 +1,45 @@
 # инициализации пакета
-from .csv_module import load_table as load_csv, save_table as save_csv
-from .pickle_module import load_table as load_pickle, save_table as save_pickle
-from .text_module import save_table as save_text
+from .csv_module import (
+    load_table as load_csv, save_table as save_csv, iter_table as iter_csv,
+    load_table_parallel as load_csv_parallel, build_row_index as build_csv_index, append_table as append_csv,
+    build_stats as build_csv_stats
+)
+from .pickle_module import load_table as load_pickle, save_table as save_pickle, append_table as append_pickle
+from .text_module import save_table as save_text, append_table as append_text
+from .binary_module import load_table as load_binary, save_table as save_binary
 from .table_operations import (
     get_rows_by_number, get_rows_by_index, get_column_types, set_column_types,
-    get_values, get_value, set_values, set_value, print_table, concat, split
+    get_values, get_value, set_values, set_value, print_table, concat, split,
+    create_index, drop_index, concat_many, compact
+)
+from .columnar import to_columnar, to_rows
+from .query import scan_csv
+from .render import render_table, format_table
+from .zone_maps import compute_stats
+from .dataset import load_dataset
+from .async_io import (
+    load_csv_async, load_pickle_async, save_csv_async, save_pickle_async, save_text_async, load_many_async
+)
+from .aggregate import group_by
+from .join import join
+from .sorting import sort_table
+from .cache import TableCache, load_csv_cached, load_pickle_cached, cache_stats, clear_cache, set_cache_limit
+from .instrumentation import (
+    instrument, get_stats, reset_stats, enable as enable_instrumentation, disable as disable_instrumentation,
+    add_callback as add_stats_callback, remove_callback as remove_stats_callback
 )
 
 # определяет список символов (функций, классов, переменных), которые будут экспортированы из пакета при использовании from package import *
 __all__ = [
-    "load_csv", "save_csv", "load_pickle", "save_pickle", "save_text",
+    "load_csv", "save_csv", "iter_csv", "load_csv_parallel", "build_csv_index", "build_csv_stats", "load_pickle", "save_pickle", "save_text",
+    "append_csv", "append_pickle", "append_text",
+    "load_binary", "save_binary",
     "get_rows_by_number", "get_rows_by_index", "get_column_types", "set_column_types",
-    "get_values", "get_value", "set_values", "set_value", "print_table",
-    "concat", "split"
+    "get_values", "get_value", "set_values", "set_value", "print_table", "render_table", "format_table",
+    "concat", "split", "create_index", "drop_index", "concat_many", "compact", "to_columnar", "to_rows",
+    "scan_csv", "group_by", "join", "sort_table", "load_dataset", "compute_stats",
+    "load_csv_async", "load_pickle_async", "save_csv_async", "save_pickle_async", "save_text_async", "load_many_async",
+    "TableCache", "load_csv_cached", "load_pickle_cached", "cache_stats", "clear_cache", "set_cache_limit",
+    "instrument", "get_stats", "reset_stats", "enable_instrumentation", "disable_instrumentation",
+    "add_stats_callback", "remove_stats_callback"
 ]
@@ -0,0 +1,320 @@
+from .instrumentation import instrumented
+from .table_operations import get_values
+from .type_inference import converter_for, infer_type, join_types
+
+AGGREGATES = ("sum", "count", "min", "max", "mean", "nunique")
+_TYPED = ("sum", "min", "max", "mean") # без заданного типа столбца для них тип определяется по значениям
+
+
+def group_by(table, keys):
+    """
+    Группирует строки таблицы по значениям ключевых столбцов.
+
+    Пример:
+        group_by(table, "Отдел").agg({"Зарплата": ["sum", "mean"], "Имя": "count"})
+
+    Args:
+        table (dict): Таблица с ключами 'header' и 'rows'.
+        keys (int, str or list): Индекс или имя ключевого столбца либо список таких столбцов.
+
+    Returns:
+        GroupBy: Объект с методами agg и partial.
+    """
+    return GroupBy(table, keys)
+
+
+class GroupBy:
+    """Группировка таблицы, для которой ещё не заданы агрегатные функции."""
+
+    def __init__(self, table, keys):
+        self.table = table
+        self.keys = [keys] if isinstance(keys, (int, str)) else list(keys)
+
+    @instrumented
+    def agg(self, spec):
+        """
+        Вычисляет агрегатные функции по группам за один проход по таблице.
+
+        Args:
+            spec (dict): Столбец (индекс или имя) -> функция или список функций:
+                         "sum", "count", "min", "max", "mean", "nunique" (число различных значений).
+                         Пустые значения (None и "") не учитываются. Если тип столбца не задан
+                         (нет 'column_types', как после load_csv), для sum, min, max и mean
+                         он определяется по значениям, и строки приводятся к числам.
+
+        Returns:
+            dict: Таблица с ключами 'header', 'rows' и 'column_types'. Столбцы результата -
+                  ключевые столбцы и столбцы вида '<столбец>_<функция>'; группы идут в порядке
+                  первого появления в таблице.
+
+        Raises:
+            ValueError: Неизвестная функция или столбец либо значения нельзя агрегировать.
+        """
+        return self.partial(spec).result()
+
+    def partial(self, spec):
+        """
+        Вычисляет промежуточные состояния агрегатов для этой таблицы (части данных).
+
+        Промежуточные результаты частей объединяются через merge, итог - через result.
+        Состояния сериализуются pickle, поэтому части можно считать в разных процессах.
+
+        Args:
+            spec (dict): Как в agg.
+
+        Returns:
+            PartialAggregation: Промежуточный результат.
+        """
+        header = self.table['header']
+        partial = PartialAggregation([_column_name(header, key) for key in self.keys],
+                                     {_column_name(header, column): funcs for column, funcs in spec.items()})
+        partial.update(self.table)
+        return partial
+
+
+class PartialAggregation:
+    """
+    Промежуточный результат группировки: состояние каждого агрегата для каждой группы.
+
+    Группы хранятся в хеш-таблице "ключ -> номер группы", состояния агрегатов - в списках
+    по номеру группы (сумма, количество, минимум, максимум, сумма и количество для mean,
+    множество значений для nunique). Такие состояния складываются без потери точности,
+    поэтому результат не зависит от того, как данные разбиты на части.
+    """
+
+    def __init__(self, keys, spec):
+        self.keys = list(keys) # имена ключевых столбцов
+        self.aggregates = [] # (столбец, функция)
+        for column, funcs in spec.items():
+            for func in [funcs] if isinstance(funcs, str) else funcs:
+                if func not in AGGREGATES:
+                    raise ValueError(f"Неизвестная агрегатная функция: {func}")
+                self.aggregates.append((column, func))
+        self.groups = {} # ключ группы -> номер группы
+        self.group_keys = [] # ключи групп в порядке появления
+        self.states = [_new_state(func) for _, func in self.aggregates]
+        self.column_types = {} # типы столбцов исходной таблицы
+
+    def update(self, table):
+        """
+        Добавляет строки таблицы (части данных) в промежуточный результат.
+
+        Args:
+            table (dict): Таблица с теми же ключевыми и агрегируемыми столбцами.
+
+        Returns:
+            PartialAggregation: self.
+        """
+        header = table['header']
+        stored_types = getattr(table['rows'], 'column_types', None) # типы столбцовых строк (список)
+        typed = {column for column, func in self.aggregates if func in _TYPED} # эти функции требуют чисел, а не строк
+        raw_values = {}
+        for name in self.keys + [column for column, _ in self.aggregates]:
+            if name not in header:
+                raise ValueError(f"Столбец '{name}' не найден.")
+            col_type = (table.get('column_types') or {}).get(name)
+            if col_type is None and stored_types is not None:
+                col_type = stored_types[header.index(name)]
+            if col_type is None and name in typed and name not in raw_values: # типы не заданы (как после load_csv)
+                raw_values[name] = get_values(table, header.index(name))
+                col_type = infer_type(raw_values[name])
+            if col_type is not None: # тип части может быть шире, чем у прошлых частей (int -> float)
+                self.column_types[name] = join_types(self.column_types.get(name), col_type)
+        for column, func in self.aggregates:
+            if func in ("sum", "mean") and self.column_types.get(column) in (str, object):
+                raise ValueError(f"Невозможно вычислить {func} для нечислового столбца '{column}'.")
+
+        # номер группы для каждой строки
+        groups, group_keys = self.groups, self.group_keys
+        key_columns = [self._typed_values(table, name, raw_values.get(name)) for name in self.keys]
+        keys = key_columns[0] if len(key_columns) == 1 else zip(*key_columns)
+        gids = []
+        append = gids.append
+        for key in keys:
+            gid = groups.get(key)
+            if gid is None:
+                gid = groups[key] = len(group_keys)
+                group_keys.append(key)
+            append(gid)
+
+        values_by_column = {}
+        for (column, func), state in zip(self.aggregates, self.states):
+            values = values_by_column.get(column)
+            if values is None:
+                values = values_by_column[column] = self._typed_values(table, column, raw_values.get(column))
+            _grow(func, state, len(group_keys))
+            try:
+                _UPDATES[func](state, gids, values)
+            except TypeError as e:
+                raise ValueError(f"Невозможно вычислить {func} для столбца '{column}': {e}")
+        return self
+
+    def _typed_values(self, table, column, values=None):
+        """Значения столбца (values - уже прочитанные); строки столбца с числовым типом приводятся к этому типу."""
+        if values is None:
+            values = get_values(table, table['header'].index(column))
+        col_type = self.column_types.get(column)
+        if col_type in (int, float, bool) and any(isinstance(value, str) for value in values):
+            convert = converter_for(col_type)
+            try:
+                values = [None if value == "" or value is None else convert(value) if isinstance(value, str) else value
+                          for value in values]
+            except ValueError as e:
+                raise ValueError(f"Невозможно преобразовать столбец '{column}' в {col_type.__name__}: {e}")
+        return values
+
+    def merge(self, other):
+        """
+        Добавляет к промежуточному результату результат другой части.
+
+        Args:
+            other (PartialAggregation): Результат с теми же ключами и агрегатами.
+
+        Returns:
+            PartialAggregation: self.
+
+        Raises:
+            ValueError: Ключи или агрегаты не совпадают.
+        """
+        if other.keys != self.keys or other.aggregates != self.aggregates:
+            raise ValueError("Нельзя объединить группировки с разными ключами или агрегатами.")
+        for name, col_type in other.column_types.items():
+            self.column_types[name] = join_types(self.column_types.get(name), col_type)
+        # номер группы other -> номер группы self
+        gids = []
+        for key in other.group_keys:
+            gid = self.groups.get(key)
+            if gid is None:
+                gid = self.groups[key] = len(self.group_keys)
+                self.group_keys.append(key)
+            gids.append(gid)
+        for (_, func), state, other_state in zip(self.aggregates, self.states, other.states):
+            _grow(func, state, len(self.group_keys))
+            _MERGES[func](state, gids, other_state)
+        return self
+
+    def result(self):
+        """
+        Вычисляет итоговые значения агрегатов.
+
+        Returns:
+            dict: Таблица, как в GroupBy.agg.
+        """
+        header = list(self.keys) + [f"{column}_{func}" for column, func in self.aggregates]
+        columns = [_FINALIZERS[func](state, len(self.group_keys)) for (_, func), state in zip(self.aggregates, self.states)]
+        if len(self.keys) == 1:
+            key_rows = [[key] for key in self.group_keys]
+        else:
+            key_rows = [list(key) for key in self.group_keys]
+        rows = [key_row + list(values) for key_row, values in zip(key_rows, zip(*columns))] if columns else key_rows
+
+        column_types = {name: self.column_types.get(name, str) for name in self.keys}
+        for (column, func), name in zip(self.aggregates, header[len(self.keys):]):
+            column_types[name] = _result_type(func, self.column_types.get(column, str))
+        return {"header": header, "rows": rows, "column_types": column_types}
+
+    def __repr__(self):
+        return f"PartialAggregation(keys={self.keys}, {len(self.group_keys)} groups)"
+
+
+def _column_name(header, column):
+    """Имя столбца по индексу или имени."""
+    if isinstance(column, int):
+        return header[column]
+    if column not in header:
+        raise ValueError(f"Столбец '{column}' не найден.")
+    return column
+
+def _result_type(func, col_type):
+    if func in ("count", "nunique"):
+        return int
+    if func == "mean":
+        return float
+    if func == "sum" and col_type is bool:
+        return int
+    return col_type
+
+# Состояние агрегата - список (для mean - пара списков) по номерам групп.
+
+def _new_state(func):
+    return ([], []) if func == "mean" else []
+
+def _grow(func, state, groups):
+    """Дополняет состояние начальными значениями для новых групп."""
+    if func == "mean":
+        for part in state:
+            part.extend([0] * (groups - len(part)))
+    elif func == "nunique":
+        state.extend(set() for _ in range(groups - len(state)))
+    else:
+        state.extend([0 if func == "count" else None] * (groups - len(state)))
+
+def _is_null(value):
+    return value is None or value == ""
+
+def _update_sum(state, gids, values):
+    for gid, value in zip(gids, values):
+        if not _is_null(value):
+            current = state[gid]
+            state[gid] = value if current is None else current + value
+
+def _update_count(state, gids, values):
+    for gid, value in zip(gids, values):
+        if not _is_null(value):
+            state[gid] += 1
+
+def _update_min(state, gids, values):
+    for gid, value in zip(gids, values):
+        if not _is_null(value):
+            current = state[gid]
+            if current is None or value < current:
+                state[gid] = value
+
+def _update_max(state, gids, values):
+    for gid, value in zip(gids, values):
+        if not _is_null(value):
+            current = state[gid]
+            if current is None or value > current:
+                state[gid] = value
+
+def _update_mean(state, gids, values):
+    sums, counts = state
+    for gid, value in zip(gids, values):
+        if not _is_null(value):
+            sums[gid] += value
+            counts[gid] += 1
+
+def _update_nunique(state, gids, values):
+    for gid, value in zip(gids, values):
+        if not _is_null(value):
+            state[gid].add(value)
+
+_UPDATES = {"sum": _update_sum, "count": _update_count, "min": _update_min, "max": _update_max,
+            "mean": _update_mean, "nunique": _update_nunique}
+
+def _merge_count(state, gids, other):
+    for gid, count in zip(gids, other):
+        state[gid] += count
+
+def _merge_mean(state, gids, other):
+    sums, counts = state
+    for gid, other_sum, other_count in zip(gids, *other):
+        sums[gid] += other_sum
+        counts[gid] += other_count
+
+def _merge_nunique(state, gids, other):
+    for gid, values in zip(gids, other):
+        state[gid] |= values
+
+# состояние sum/min/max другой части - уже агрегированные значения её групп, они сливаются так же, как значения строк
+_MERGES = {"sum": _update_sum, "count": _merge_count, "min": _update_min, "max": _update_max,
+           "mean": _merge_mean, "nunique": _merge_nunique}
+
+_FINALIZERS = {
+    "sum": lambda state, groups: [0 if value is None else value for value in state[:groups]],
+    "count": lambda state, groups: state[:groups],
+    "min": lambda state, groups: state[:groups],
+    "max": lambda state, groups: state[:groups],
+    "mean": lambda state, groups: [s / c if c else None for s, c in zip(*state)],
+    "nunique": lambda state, groups: [len(values) for values in state[:groups]],
+}
@@ -0,0 +1,170 @@
+import asyncio
+import functools
+import threading
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+from .csv_module import load_table as _load_csv, save_table as _save_csv
+from .pickle_module import load_table as _load_pickle, save_table as _save_pickle
+from .text_module import save_table as _save_text
+
+_LOADERS = {"csv": _load_csv, "pickle": _load_pickle}
+
+# общие пулы создаются при первом обращении
+_thread_pool = None
+_process_pool = None
+_pool_lock = threading.Lock()
+
+
+def _executor(use_processes):
+    """Общий пул потоков (ввод-вывод) или процессов (разбор, нагружающий процессор)."""
+    global _thread_pool, _process_pool
+    with _pool_lock:
+        if use_processes:
+            if _process_pool is None:
+                _process_pool = ProcessPoolExecutor()
+            return _process_pool
+        if _thread_pool is None:
+            _thread_pool = ThreadPoolExecutor(thread_name_prefix="table-io")
+        return _thread_pool
+
+async def _run(func, *args, executor=None, use_processes=False, **kwargs):
+    """
+    Выполняет func в пуле, не блокируя цикл событий.
+
+    При отмене ожидающей корутины задача, которая ещё не начала выполняться,
+    снимается из очереди пула; уже начатая загрузка доводится до конца в пуле,
+    но её результат не возвращается.
+    """
+    loop = asyncio.get_running_loop()
+    executor = executor or _executor(use_processes)
+    return await loop.run_in_executor(executor, functools.partial(func, *args, **kwargs))
+
+async def load_csv_async(file_path, use_processes=False, executor=None, **options):
+    """
+    Асинхронный load_csv: файл читается и разбирается в пуле, цикл событий не блокируется.
+
+    Args:
+        file_path (str): Путь к CSV файлу.
+        use_processes (bool): Разбирать в общем пуле процессов (для больших файлов, где
+                              разбор упирается в процессор), а не в пуле потоков.
+                              Таблица передаётся обратно через pickle.
+        executor (Executor, optional): Свой пул вместо общего.
+        **options: Параметры load_csv.
+
+    Returns:
+        dict: Таблица с ключами 'header' и 'rows'.
+
+    Raises:
+        ValueError: Если возникает ошибка при загрузке файла.
+    """
+    return await _run(_load_csv, file_path, executor=executor, use_processes=use_processes, **options)
+
+async def load_pickle_async(file_path, use_processes=False, executor=None, **options):
+    """
+    Асинхронный load_pickle (см. load_csv_async).
+
+    Args:
+        file_path (str): Путь к Pickle файлу.
+        use_processes (bool): Загружать в общем пуле процессов.
+        executor (Executor, optional): Свой пул вместо общего.
+        **options: Параметры load_pickle.
+
+    Returns:
+        dict: Таблица с ключами 'header' и 'rows'.
+    """
+    return await _run(_load_pickle, file_path, executor=executor, use_processes=use_processes, **options)
+
+async def save_csv_async(table, file_path, executor=None, **options):
+    """
+    Асинхронный save_csv: таблица записывается в пуле потоков.
+
+    Args:
+        table (dict): Таблица с ключами 'header' и 'rows'.
+        file_path (str): Путь, куда нужно сохранить файл.
+        executor (Executor, optional): Свой пул вместо общего пула потоков.
+        **options: Параметры save_csv.
+    """
+    await _run(_save_csv, table, file_path, executor=executor, **options)
+
+async def save_pickle_async(table, file_path, executor=None, **options):
+    """
+    Асинхронный save_pickle (см. save_csv_async).
+
+    Args:
+        table (dict): Таблица с ключами 'header' и 'rows'.
+        file_path (str): Путь, куда нужно сохранить файл.
+        executor (Executor, optional): Свой пул вместо общего пула потоков.
+        **options: Параметры save_pickle.
+    """
+    await _run(_save_pickle, table, file_path, executor=executor, **options)
+
+async def save_text_async(table, file_path, executor=None, **options):
+    """
+    Асинхронный save_text (см. save_csv_async).
+
+    Args:
+        table (dict): Таблица с ключами 'header' и 'rows'.
+        file_path (str): Путь, куда нужно сохранить файл.
+        executor (Executor, optional): Свой пул вместо общего пула потоков.
+        **options: Параметры save_text.
+    """
+    await _run(_save_text, table, file_path, executor=executor, **options)
+
+async def load_many_async(paths, loader="csv", max_concurrency=4, use_processes=False, return_exceptions=False,
+                          executor=None, **options):
+    """
+    Загружает несколько файлов одновременно, как asyncio.gather.
+
+    Одновременно загружается не больше max_concurrency файлов (asyncio.Semaphore),
+    остальные ждут и в пул не передаются. Результаты идут в порядке paths.
+    Если одна из загрузок завершилась ошибкой (и return_exceptions=False) или сама
+    корутина отменена, ещё не начатые загрузки отменяются.
+
+    Args:
+        paths (iterable): Пути к файлам.
+        loader (str or callable): "csv", "pickle" или функция загрузки loader(path, **options).
+        max_concurrency (int): Сколько файлов загружать одновременно.
+        use_processes (bool): Загружать в общем пуле процессов.
+        return_exceptions (bool): Возвращать ошибки на месте результатов, а не выбрасывать первую.
+        executor (Executor, optional): Свой пул вместо общего.
+        **options: Параметры функции загрузки.
+
+    Returns:
+        list: Таблицы (или ошибки при return_exceptions=True) в порядке paths.
+
+    Raises:
+        ValueError: Неизвестный loader, max_concurrency меньше 1 или ошибка загрузки файла.
+    """
+    if max_concurrency < 1:
+        raise ValueError("max_concurrency должен быть не меньше 1.")
+    if isinstance(loader, str):
+        if loader not in _LOADERS:
+            raise ValueError(f"Неизвестный формат: {loader}")
+        loader = _LOADERS[loader]
+    semaphore = asyncio.Semaphore(max_concurrency)
+
+    async def load_one(path):
+        async with semaphore:
+            return await _run(loader, path, executor=executor, use_processes=use_processes, **options)
+
+    tasks = [asyncio.ensure_future(load_one(path)) for path in paths]
+    try:
+        return await asyncio.gather(*tasks, return_exceptions=return_exceptions)
+    except BaseException:
+        for task in tasks: # ошибка или отмена: остальные загрузки больше не нужны
+            task.cancel()
+        await asyncio.gather(*tasks, return_exceptions=True)
+        raise
+
+def shutdown_executors(wait=True):
+    """
+    Останавливает общие пулы потоков и процессов (при следующем вызове они создаются заново).
+
+    Args:
+        wait (bool): Дождаться завершения выполняющихся задач.
+    """
+    global _thread_pool, _process_pool
+    with _pool_lock:
+        pools, _thread_pool, _process_pool = (_thread_pool, _process_pool), None, None
+    for pool in pools:
+        if pool is not None:
+            pool.shutdown(wait=wait, cancel_futures=True)
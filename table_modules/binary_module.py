@@ -0,0 +1,161 @@
+import json
+import mmap
+import pickle
+import struct
+import sys
+from array import array
+from .columnar import Column, ColumnRows, DictionaryColumn, to_columnar
+from .instrumentation import instrumented
+from .io_utils import atomic_write
+
+# Формат файла:
+#   MAGIC (8 байт) | длина заголовка (uint64, little-endian) | заголовок JSON (utf-8)
+#   | блоки столбцов, каждый выровнен на 8 байт.
+# В заголовке хранятся имена и типы столбцов, число строк, порядок байтов и
+# положение (смещение, длина) каждого блока: data, offsets (для str), valid (маска пропусков).
+# Словарный столбец (версия 2) - блоки codes (int32) и dictionary (список значений в pickle).
+MAGIC = b"TBLCOL01"
+VERSION = 2
+_ALIGN = 8
+_TYPE_NAMES = {int: "int", float: "float", bool: "bool", str: "str", object: "object"}
+_TYPES = {name: col_type for col_type, name in _TYPE_NAMES.items()}
+_FORMATS = {int: "q", float: "d", bool: "b"}
+
+@instrumented(file_io=True)
+def load_table(file_path, use_mmap=True):
+    """
+    Загружает таблицу из бинарного столбцового файла.
+
+    При use_mmap=True файл отображается в память, и столбцы ссылаются прямо на его
+    содержимое (memoryview) без копирования: открытие файла любого размера происходит
+    сразу, а с диска читаются только те столбцы, к которым обращаются.
+    Запись в такой столбец сначала копирует его в память.
+
+    Args:
+        file_path (str): Путь к файлу.
+        use_mmap (bool): Если False, файл читается в память целиком.
+
+    Returns:
+        dict: Таблица с ключами 'header', 'rows' (ColumnRows) и 'column_types'.
+
+    Raises:
+        ValueError: Если возникает ошибка при загрузке файла или файл имеет другой формат.
+    """
+    try:
+        with open(file_path, mode="rb") as file:
+            if use_mmap:
+                buffer = memoryview(mmap.mmap(file.fileno(), 0, access=mmap.ACCESS_READ))
+            else:
+                buffer = memoryview(file.read())
+
+        if bytes(buffer[:len(MAGIC)]) != MAGIC:
+            raise ValueError("файл не является бинарной таблицей")
+        (meta_length,) = struct.unpack_from("<Q", buffer, len(MAGIC))
+        meta_start = len(MAGIC) + 8
+        meta = json.loads(bytes(buffer[meta_start:meta_start + meta_length]).decode("utf-8"))
+        if meta['version'] > VERSION:
+            raise ValueError(f"неподдерживаемая версия формата {meta['version']}")
+        swap = meta['byteorder'] != sys.byteorder # файл записан на машине с другим порядком байтов
+
+        columns = []
+        for column_meta in meta['columns']:
+            col_type = _TYPES[column_meta['type']]
+            blocks = {name: buffer[start:start + length] for name, (start, length) in column_meta['blocks'].items()}
+            valid = blocks.get('valid')
+            if column_meta.get('encoding') == "dictionary":
+                columns.append(DictionaryColumn(col_type, _numbers(blocks['codes'], "i", swap), pickle.loads(blocks['dictionary'])))
+            elif col_type is object:
+                columns.append(Column(object, pickle.loads(blocks['data'])))
+            elif col_type is str:
+                columns.append(Column(str, blocks['data'], _numbers(blocks['offsets'], "q", swap), valid))
+            else:
+                columns.append(Column(col_type, _numbers(blocks['data'], _FORMATS[col_type], swap), valid=valid))
+
+        header = meta['header']
+        column_types = {name: _TYPES[column_meta['type']] for name, column_meta in zip(header, meta['columns'])}
+        return {"header": header, "rows": ColumnRows(columns, meta['rows']), "column_types": column_types}
+    except Exception as e:
+        raise ValueError(f"Ошибка при загрузке бинарного файла {file_path}: {e}")
+
+@instrumented(file_io=True)
+def save_table(table, file_path):
+    """
+    Сохраняет таблицу в бинарный столбцовый файл.
+
+    Каждый столбец записывается одним непрерывным блоком. Таблица в виде списка строк
+    сначала переводится в столбцовое представление (с учётом table['column_types']).
+
+    Args:
+        table (dict): Таблица с ключами 'header' и 'rows'.
+        file_path (str): Путь к файлу.
+
+    Raises:
+        ValueError: Если возникает ошибка при сохранении файла.
+    """
+    try:
+        rows = table['rows']
+        if hasattr(rows, 'compact'): # склеенная таблица: собираем сегменты
+            rows = rows.compact()
+        if not isinstance(rows, ColumnRows):
+            rows = to_columnar({"header": table['header'], "rows": rows,
+                                "column_types": table.get('column_types') or {}})['rows']
+
+        blocks = [] # (bytes-like, метаданные столбца, имя блока)
+        columns_meta = []
+        for column in rows.columns:
+            column_meta = {"type": _TYPE_NAMES[column.type], "blocks": {}}
+            if isinstance(column, DictionaryColumn):
+                column_meta['encoding'] = "dictionary"
+                blocks.append((memoryview(column.codes).cast("B"), column_meta, "codes"))
+                blocks.append((pickle.dumps(column.dictionary, protocol=pickle.HIGHEST_PROTOCOL), column_meta, "dictionary"))
+                columns_meta.append(column_meta)
+                continue
+            if column.type is object:
+                blocks.append((pickle.dumps(column.data, protocol=pickle.HIGHEST_PROTOCOL), column_meta, "data"))
+            else:
+                blocks.append((memoryview(column.data).cast("B"), column_meta, "data"))
+                if column.type is str:
+                    blocks.append((memoryview(column.offsets).cast("B"), column_meta, "offsets"))
+            if column.valid is not None:
+                blocks.append((memoryview(column.valid).cast("B"), column_meta, "valid"))
+            columns_meta.append(column_meta)
+
+        # смещения блоков зависят от длины заголовка, а заголовок - от смещений,
+        # поэтому место под заголовок подбирается, пока оно не перестанет расти
+        meta_length = 0
+        while True:
+            position = _aligned(len(MAGIC) + 8 + meta_length)
+            for data, column_meta, name in blocks:
+                column_meta['blocks'][name] = [position, len(data)]
+                position = _aligned(position + len(data))
+            meta = {"version": VERSION, "byteorder": sys.byteorder, "header": list(table['header']),
+                    "rows": len(rows), "columns": columns_meta}
+            encoded = json.dumps(meta, ensure_ascii=False).encode("utf-8")
+            if len(encoded) <= meta_length:
+                break
+            meta_length = len(encoded) + 64
+
+        with atomic_write(file_path, mode="wb") as file:
+            file.write(MAGIC)
+            file.write(struct.pack("<Q", meta_length))
+            file.write(encoded.ljust(meta_length))
+            position = len(MAGIC) + 8 + meta_length
+            for data, column_meta, name in blocks:
+                start = column_meta['blocks'][name][0]
+                file.write(b"\0" * (start - position)) # выравнивание
+                file.write(data) # блок столбца записывается целиком
+                position = start + len(data)
+    except Exception as e:
+        raise ValueError(f"Ошибка при сохранении бинарного файла {file_path}: {e}")
+
+def _aligned(position):
+    """Округляет смещение вверх до границы _ALIGN байт."""
+    return (position + _ALIGN - 1) // _ALIGN * _ALIGN
+
+def _numbers(block, fmt, swap):
+    """Представляет блок байтов как массив чисел без копирования (с копированием, если нужно сменить порядок байтов)."""
+    if swap:
+        numbers = array(fmt, bytes(block))
+        numbers.byteswap()
+        return numbers
+    return block.cast(fmt)
@@ -0,0 +1,201 @@
+import os
+import sys
+import threading
+from collections import OrderedDict
+from .csv_module import load_table as _load_csv
+from .pickle_module import load_table as _load_pickle
+from .views import TableView
+
+_SAMPLE_ROWS = 100 # по скольким строкам оценивается размер таблицы из списков
+
+
+class TableCache:
+    """
+    Кэш загруженных таблиц с вытеснением давно не использованных (LRU).
+
+    Ключ - (абсолютный путь, размер файла, время изменения, функция загрузки, параметры загрузки),
+    поэтому изменённый файл загружается заново. Суммарный оценочный размер таблиц
+    в кэше не превышает max_bytes.
+
+    Таблица из кэша выдаётся как копия при записи: 'rows' - TableView над таблицей
+    в кэше с copy_on_write=True, поэтому set_value, set_values и set_column_types
+    меняют только полученную таблицу. Строки, которые изменяются напрямую
+    (table['rows'][i][j] = ...), не копируются - так менять таблицы из кэша нельзя.
+    """
+
+    def __init__(self, max_bytes=256 * 2 ** 20):
+        self.max_bytes = max_bytes
+        self._entries = OrderedDict() # ключ -> (таблица, оценочный размер)
+        self._keys_by_path = {} # путь -> ключи его записей (для удаления устаревших версий файла)
+        self._bytes = 0
+        self._hits = 0
+        self._misses = 0
+        self._evictions = 0
+        self._lock = threading.Lock()
+
+    def load(self, load_func, file_path, **options):
+        """
+        Возвращает таблицу из кэша или загружает её через load_func(file_path, **options).
+
+        Args:
+            load_func (callable): Функция загрузки (например, load_csv).
+            file_path (str): Путь к файлу.
+            **options: Параметры функции загрузки (входят в ключ кэша).
+
+        Returns:
+            dict: Таблица с ключами 'header' и 'rows' (копия при записи).
+
+        Raises:
+            ValueError: Если возникает ошибка при загрузке файла.
+        """
+        path = os.path.abspath(file_path)
+        try:
+            stat = os.stat(path)
+        except OSError as e:
+            raise ValueError(f"Ошибка при загрузке файла {file_path}: {e}")
+        key = (path, stat.st_size, stat.st_mtime_ns,
+               f"{load_func.__module__}.{load_func.__qualname__}", repr(sorted(options.items())))
+
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None:
+                self._entries.move_to_end(key)
+                self._hits += 1
+                return _handout(entry[0])
+            self._misses += 1
+
+        table = load_func(file_path, **options)
+        size = estimate_bytes(table)
+        with self._lock:
+            for old_key in list(self._keys_by_path.get(path, ())): # файл изменился: старые версии больше не нужны
+                if old_key[1:3] != key[1:3]:
+                    self._remove(old_key)
+            if size <= self.max_bytes and key not in self._entries:
+                self._entries[key] = (table, size)
+                self._keys_by_path.setdefault(path, set()).add(key)
+                self._bytes += size
+                while self._bytes > self.max_bytes:
+                    self._remove(next(iter(self._entries)))
+                    self._evictions += 1
+        return _handout(table)
+
+    def _remove(self, key):
+        entry = self._entries.pop(key, None)
+        if entry is None:
+            return
+        self._bytes -= entry[1]
+        keys = self._keys_by_path.get(key[0])
+        if keys is not None:
+            keys.discard(key)
+            if not keys:
+                del self._keys_by_path[key[0]]
+
+    def stats(self):
+        """
+        Возвращает статистику кэша.
+
+        Returns:
+            dict: Ключи hits, misses, evictions, entries, bytes, max_bytes.
+        """
+        with self._lock:
+            return {"hits": self._hits, "misses": self._misses, "evictions": self._evictions,
+                    "entries": len(self._entries), "bytes": self._bytes, "max_bytes": self.max_bytes}
+
+    def clear(self):
+        """Удаляет все таблицы из кэша и обнуляет статистику."""
+        with self._lock:
+            self._entries.clear()
+            self._keys_by_path.clear()
+            self._bytes = self._hits = self._misses = self._evictions = 0
+
+    def resize(self, max_bytes):
+        """
+        Меняет допустимый суммарный размер таблиц, вытесняя лишние.
+
+        Args:
+            max_bytes (int): Новый предел в байтах.
+        """
+        with self._lock:
+            self.max_bytes = max_bytes
+            while self._bytes > self.max_bytes and self._entries:
+                self._remove(next(iter(self._entries)))
+                self._evictions += 1
+
+
+def _handout(table):
+    """Таблица для вызывающего кода: новые заголовок и словари, строки - представление с копированием при записи."""
+    result = {"header": list(table['header']), "rows": TableView.of(table, copy_on_write=True)}
+    for name in ('column_types', 'errors'):
+        if name in table:
+            result[name] = type(table[name])(table[name])
+    return result
+
+def estimate_bytes(table):
+    """
+    Оценивает объём памяти, занимаемый строками таблицы.
+
+    Для столбцовых строк берётся размер буферов (nbytes), для списка строк -
+    средний размер строки по выборке, умноженный на количество строк.
+
+    Args:
+        table (dict): Таблица с ключами 'header' и 'rows'.
+
+    Returns:
+        int: Оценка в байтах.
+    """
+    rows = table['rows']
+    if hasattr(rows, 'nbytes'):
+        return rows.nbytes
+    count = len(rows)
+    if not count:
+        return 0
+    step = max(1, count // _SAMPLE_ROWS)
+    sample = [rows[i] for i in range(0, count, step)]
+    sample_bytes = sum(sys.getsizeof(row) + sum(sys.getsizeof(value) for value in row) for row in sample)
+    return sys.getsizeof(rows) + sample_bytes * count // len(sample)
+
+
+_default_cache = TableCache()
+
+def load_csv_cached(file_path, **options):
+    """
+    load_csv через общий для процесса кэш (см. TableCache).
+
+    Args:
+        file_path (str): Путь к CSV файлу.
+        **options: Параметры load_csv.
+
+    Returns:
+        dict: Таблица (копия при записи).
+    """
+    return _default_cache.load(_load_csv, file_path, **options)
+
+def load_pickle_cached(file_path, **options):
+    """
+    load_pickle через общий для процесса кэш (см. TableCache).
+
+    Args:
+        file_path (str): Путь к Pickle файлу.
+        **options: Параметры load_pickle.
+
+    Returns:
+        dict: Таблица (копия при записи).
+    """
+    return _default_cache.load(_load_pickle, file_path, **options)
+
+def cache_stats():
+    """Статистика общего кэша: hits, misses, evictions, entries, bytes, max_bytes."""
+    return _default_cache.stats()
+
+def clear_cache():
+    """Очищает общий кэш."""
+    _default_cache.clear()
+
+def set_cache_limit(max_bytes):
+    """
+    Задаёт предельный суммарный размер таблиц в общем кэше.
+
+    Args:
+        max_bytes (int): Предел в байтах.
+    """
+    _default_cache.resize(max_bytes)
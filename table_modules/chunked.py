@@ -0,0 +1,134 @@
+from bisect import bisect_right
+from collections.abc import Sequence
+from itertools import chain
+from .columnar import ColumnRows
+from .type_inference import converter_for
+from .views import TableView
+
+
+class ChunkedRows(Sequence):
+    """
+    Строки таблицы, составленные из нескольких сегментов без копирования.
+
+    Сегменты - строки исходных таблиц (списки, ColumnRows, TableView).
+    Используется как значение ключа 'rows', поэтому concat выполняется
+    за O(число сегментов), а не за O(число строк). Обращение по номеру
+    строки ищет сегмент двоичным поиском; compact() собирает строки в один список.
+    """
+
+    def __init__(self, segments):
+        self.segments = []
+        for segment in segments:
+            if isinstance(segment, ChunkedRows): # вложенные сегменты разворачиваем
+                self.segments.extend(segment.segments)
+            elif len(segment):
+                self.segments.append(segment)
+        self._starts = [0] # номер первой строки каждого сегмента, последний элемент - общее число строк
+        for segment in self.segments:
+            self._starts.append(self._starts[-1] + len(segment))
+
+    def __len__(self):
+        return self._starts[-1]
+
+    def _locate(self, index):
+        """Возвращает (сегмент, номер строки в сегменте)."""
+        if index < 0:
+            index += len(self)
+        if not 0 <= index < len(self):
+            raise IndexError("Номер строки выходит за пределы таблицы.")
+        segment = bisect_right(self._starts, index) - 1
+        return self.segments[segment], index - self._starts[segment]
+
+    def __getitem__(self, index):
+        if isinstance(index, slice):
+            return TableView({"header": None, "rows": self}, range(len(self))[index])
+        segment, local = self._locate(index)
+        return segment[local]
+
+    def __iter__(self):
+        return chain.from_iterable(self.segments)
+
+    def __add__(self, other):
+        return ChunkedRows([self, other])
+
+    def __radd__(self, other):
+        return ChunkedRows([other, self])
+
+    def __eq__(self, other):
+        if isinstance(other, Sequence) and not isinstance(other, str):
+            return len(self) == len(other) and all(list(a) == list(b) for a, b in zip(self, other))
+        return NotImplemented
+
+    def __reduce__(self):
+        # при сериализации сегменты склеиваются в обычный список строк
+        return list, ([list(row) for row in self],)
+
+    @property
+    def column_types(self):
+        """Типы столбцов, если все сегменты хранятся по столбцам с одинаковыми типами, иначе None."""
+        types = [getattr(segment, 'column_types', None) for segment in self.segments]
+        if types and types[0] is not None and all(t == types[0] for t in types):
+            return types[0]
+        return None
+
+    def compact(self):
+        """
+        Склеивает сегменты в один список строк (или ColumnRows, если все сегменты столбцовые).
+
+        Returns:
+            list or ColumnRows: Строки таблицы.
+        """
+        if self.segments and all(isinstance(segment, ColumnRows) for segment in self.segments):
+            rows = self.segments[0]
+            for segment in self.segments[1:]:
+                rows = rows + segment
+            return rows
+        return [list(row) for row in self]
+
+    def get_column(self, col_index):
+        """Возвращает значения столбца списком."""
+        values = []
+        for segment in self.segments:
+            if hasattr(segment, 'get_column'):
+                values.extend(segment.get_column(col_index))
+            else:
+                values.extend(row[col_index] for row in segment)
+        return values
+
+    def set_cell(self, row_index, col_index, value):
+        """Записывает значение в ячейку того сегмента, которому принадлежит строка."""
+        segment, local = self._locate(row_index)
+        if hasattr(segment, 'set_cell'):
+            segment.set_cell(local, col_index, value)
+        else:
+            segment[local][col_index] = value
+
+    def set_column(self, col_index, values):
+        """Записывает значения в столбец, разделяя их по сегментам."""
+        for segment, start in zip(self.segments, self._starts):
+            part = values[start:start + len(segment)]
+            if hasattr(segment, 'set_column'):
+                segment.set_column(col_index, part)
+            else:
+                for row, value in zip(segment, part):
+                    row[col_index] = value
+
+    def set_column_type(self, col_index, col_type):
+        """Приводит значения столбца к типу col_type в каждом сегменте."""
+        convert = converter_for(col_type)
+        for segment in self.segments:
+            if hasattr(segment, 'set_column_type'):
+                segment.set_column_type(col_index, col_type)
+                continue
+            for row in segment:
+                try:
+                    row[col_index] = convert(row[col_index])
+                except ValueError:
+                    raise ValueError(f"Невозможно преобразовать значение '{row[col_index]}' в {col_type.__name__}")
+
+    def take(self, positions):
+        """Возвращает представление строк по указанным позициям (без копирования)."""
+        return TableView({"header": None, "rows": self}, list(positions))
+
+    def __repr__(self):
+        return f"ChunkedRows({len(self.segments)} segments, {len(self)} rows)"
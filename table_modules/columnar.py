@@ -0,0 +1,655 @@
+import pickle
+import sys
+from array import array
+from collections.abc import Sequence
+from itertools import islice
+from .type_inference import converter_for
+
+# коды array.array для типов, которые хранятся в непрерывном буфере
+_TYPECODES = {int: "q", float: "d", bool: "b"}
+
+
+class Column:
+    """
+    Типизированный столбец, хранящий значения в непрерывном буфере.
+
+    int, float и bool хранятся в array.array, str — в одном буфере байтов UTF-8
+    с массивом смещений, остальные типы — в обычном списке Python.
+    Пропущенные значения (None) отмечаются в маске valid.
+    """
+    __slots__ = ("type", "data", "offsets", "valid")
+
+    def __init__(self, col_type, data, offsets=None, valid=None):
+        self.type = col_type # тип значений столбца (int, float, bool, str или object)
+        self.data = data # array.array, буфер байтов или список
+        self.offsets = offsets # смещения строк в буфере (только для str)
+        self.valid = valid # bytearray: 1 - значение есть, 0 - None (или None, если пропусков нет)
+
+    @classmethod
+    def from_values(cls, values, col_type=None):
+        """
+        Создаёт столбец из последовательности значений.
+
+        Args:
+            values (iterable): Значения столбца.
+            col_type (type, optional): Тип столбца. Если None, то str для строковых значений, иначе object.
+
+        Returns:
+            Column: Новый столбец.
+
+        Raises:
+            ValueError: Если значение невозможно привести к типу col_type.
+        """
+        values = values if isinstance(values, list) else list(values)
+        if col_type is None: # тип определяется по типам Python самих значений
+            value_types = set(map(type, values))
+            value_types.discard(type(None))
+            col_type = value_types.pop() if len(value_types) == 1 else (str if not value_types else object)
+            if col_type not in _TYPECODES and col_type is not str:
+                col_type = object
+
+        valid = None
+        if None in values: # маска нужна только если есть пропуски
+            valid = bytearray(v is not None for v in values)
+
+        if col_type in _TYPECODES:
+            if valid is None:
+                try:
+                    return cls(col_type, array(_TYPECODES[col_type], values), valid=valid) # значения уже нужного типа
+                except (TypeError, OverflowError):
+                    pass
+            filler = col_type()
+            convert = converter_for(col_type)
+            try:
+                data = array(_TYPECODES[col_type], [filler if v is None else convert(v) for v in values])
+            except (TypeError, ValueError, OverflowError) as e:
+                raise ValueError(f"Невозможно преобразовать значения столбца в {col_type.__name__}: {e}")
+            return cls(col_type, data, valid=valid)
+
+        if col_type is str:
+            data = bytearray()
+            offsets = array("q", [0])
+            for v in values:
+                if v is not None:
+                    data += (v if isinstance(v, str) else str(v)).encode("utf-8")
+                offsets.append(len(data))
+            return cls(str, data, offsets, valid)
+
+        return cls(object, list(values))
+
+    def __len__(self):
+        if self.type is str:
+            return len(self.offsets) - 1
+        return len(self.data)
+
+    def __getitem__(self, index):
+        if isinstance(index, slice):
+            return self.take(range(*index.indices(len(self))))
+        if index < 0:
+            index += len(self)
+        if self.valid is not None and not self.valid[index]:
+            return None
+        if self.type is str:
+            return bytes(self.data[self.offsets[index]:self.offsets[index + 1]]).decode("utf-8")
+        if self.type is bool:
+            return bool(self.data[index])
+        return self.data[index]
+
+    def __iter__(self):
+        if self.type is str:
+            data, offsets = self.data, self.offsets
+            values = (bytes(data[offsets[i]:offsets[i + 1]]).decode("utf-8") for i in range(len(offsets) - 1))
+        elif self.type is bool:
+            values = map(bool, self.data)
+        else:
+            values = iter(self.data)
+        if self.valid is None:
+            return values
+        return (v if ok else None for v, ok in zip(values, self.valid))
+
+    def to_list(self):
+        """Возвращает значения столбца в виде списка."""
+        if self.type is object:
+            return list(self.data)
+        if self.type in (int, float) and self.valid is None:
+            return self.data.tolist() # у array и memoryview распаковка выполняется на C
+        return list(self)
+
+    def positions(self, values):
+        """
+        Возвращает номера строк, значения которых входят в values.
+
+        Args:
+            values (set or list): Искомые значения.
+
+        Returns:
+            list: Возрастающий список номеров строк.
+        """
+        return [i for i, value in enumerate(self) if value in values]
+
+    def take(self, positions):
+        """
+        Возвращает новый столбец из значений по указанным позициям.
+
+        Args:
+            positions (iterable): Номера строк.
+
+        Returns:
+            Column: Новый столбец того же типа.
+        """
+        positions = positions if isinstance(positions, (list, range)) else list(positions)
+        valid = None if self.valid is None else bytearray(self.valid[i] for i in positions)
+        if self.type is str:
+            data, offsets = self.data, self.offsets
+            new_data = bytearray()
+            new_offsets = array("q", [0])
+            for i in positions:
+                new_data += data[offsets[i]:offsets[i + 1]]
+                new_offsets.append(len(new_data))
+            return Column(str, new_data, new_offsets, valid)
+        if self.type in _TYPECODES:
+            if isinstance(positions, range) and positions.step == 1:
+                return Column(self.type, array(_TYPECODES[self.type], self.data[positions.start:positions.stop]), valid=valid)
+            data = self.data
+            return Column(self.type, array(_TYPECODES[self.type], [data[i] for i in positions]), valid=valid)
+        data = self.data
+        return Column(object, [data[i] for i in positions])
+
+    def set(self, index, value):
+        """
+        Записывает одно значение в столбец.
+
+        Строковый буфер нельзя изменить на месте, поэтому при записи
+        str-столбец (как и типизированный столбец при несовместимом значении)
+        превращается в столбец object.
+
+        Args:
+            index (int): Номер строки.
+            value: Новое значение.
+        """
+        if index < 0:
+            index += len(self)
+        if self.type in _TYPECODES and (value is None or type(value) is self.type or
+                                        (self.type is float and type(value) is int)):
+            if not isinstance(self.data, array): # буфер только для чтения (например, mmap) копируем при записи
+                self.data = array(_TYPECODES[self.type], self.data)
+            if self.valid is not None and not isinstance(self.valid, bytearray):
+                self.valid = bytearray(self.valid)
+            if value is None:
+                if self.valid is None:
+                    self.valid = bytearray(b"\x01") * len(self)
+                self.valid[index] = 0
+                return
+            self.data[index] = value
+            if self.valid is not None:
+                self.valid[index] = 1
+            return
+        if self.type is not object:
+            self.data, self.offsets, self.valid, self.type = self.to_list(), None, None, object
+        self.data[index] = value
+
+    def astype(self, col_type):
+        """
+        Возвращает столбец, приведённый к типу col_type.
+
+        Args:
+            col_type (type): Новый тип значений.
+
+        Returns:
+            Column: Новый столбец.
+
+        Raises:
+            ValueError: Если невозможно преобразовать значение.
+        """
+        converted = []
+        convert = converter_for(col_type)
+        for value in self:
+            try:
+                converted.append(None if value is None else convert(value))
+            except ValueError:
+                raise ValueError(f"Невозможно преобразовать значение '{value}' в {col_type.__name__}")
+        return Column.from_values(converted, col_type if col_type in _TYPECODES or col_type is str else object)
+
+    def __add__(self, other):
+        if not isinstance(other, Column):
+            return NotImplemented
+        if self.type is other.type and self.type in _TYPECODES: # буферы одного типа склеиваем без распаковки значений
+            valid = None
+            if self.valid is not None or other.valid is not None:
+                valid = (bytearray(self.valid) if self.valid is not None else bytearray(b"\x01") * len(self)) + \
+                        (other.valid if other.valid is not None else bytearray(b"\x01") * len(other))
+            return Column(self.type, array(_TYPECODES[self.type], self.data) + array(_TYPECODES[self.type], other.data), valid=valid)
+        col_type = self.type if self.type is other.type else None
+        return Column.from_values(self.to_list() + other.to_list(), col_type)
+
+    @property
+    def nbytes(self):
+        """Примерный объём памяти, занимаемый буферами столбца (в байтах)."""
+        size = len(self.valid) if self.valid is not None else 0
+        if self.type is object:
+            return size + len(self.data) * 8
+        if self.type is str:
+            return size + len(self.data) + len(self.offsets) * 8
+        return size + len(self.data) * self.data.itemsize
+
+    def __getstate__(self):
+        data = self.data
+        if isinstance(data, memoryview): # memoryview нельзя сериализовать, копируем в обычный буфер
+            data = array(data.format, data) if self.type in _TYPECODES else bytes(data)
+        offsets = self.offsets
+        if isinstance(offsets, memoryview):
+            offsets = array("q", offsets)
+        return self.type, data, offsets, self.valid if self.valid is None else bytearray(self.valid)
+
+    def __setstate__(self, state):
+        self.type, self.data, self.offsets, self.valid = state
+
+    def __reduce_ex__(self, protocol):
+        if protocol < 5 or self.type is object:
+            return super().__reduce_ex__(protocol)
+        # pickle 5: буферы передаются как PickleBuffer и при buffer_callback пишутся отдельно (out-of-band)
+        return _restore_column, (self.type, sys.byteorder, _pickle_buffer(self.data),
+                                 _pickle_buffer(self.offsets), _pickle_buffer(self.valid))
+
+    def __repr__(self):
+        return f"Column({self.type.__name__}, {len(self)} values)"
+
+
+class DictionaryColumn:
+    """
+    Столбец со словарным кодированием для столбцов с небольшим числом различных значений.
+
+    Каждое различное значение хранится один раз в списке dictionary, а столбец -
+    это массив целых кодов (номеров значений в словаре, -1 - None). Значения,
+    которые возвращает столбец, - одни и те же объекты из словаря, поэтому
+    повторяющиеся строки не занимают память заново. Поиск и приведение типа
+    работают с кодами и словарём, а не с каждым значением.
+    """
+    __slots__ = ("type", "codes", "dictionary", "_lookup")
+
+    def __init__(self, col_type, codes, dictionary):
+        self.type = col_type # тип значений словаря
+        self.codes = codes # array("i") или memoryview с кодами
+        self.dictionary = dictionary # список различных значений
+        self._lookup = None # значение -> код, строится при первом поиске или записи
+
+    @classmethod
+    def from_values(cls, values, col_type=None):
+        """
+        Кодирует последовательность значений.
+
+        Args:
+            values (iterable): Значения столбца.
+            col_type (type, optional): Тип значений. Если указан, значения приводятся к нему
+                                       (каждое различное значение - один раз).
+
+        Returns:
+            DictionaryColumn: Новый столбец.
+
+        Raises:
+            ValueError: Если значение невозможно привести к типу col_type.
+        """
+        column = cls(str, array("i"), [])
+        column.extend(values)
+        value_types = set(map(type, column.dictionary))
+        column.type = value_types.pop() if len(value_types) == 1 else (str if not value_types else object)
+        if col_type is not None and col_type is not column.type:
+            column = column.astype(col_type)
+        return column
+
+    def extend(self, values):
+        """
+        Добавляет значения в конец столбца, дополняя словарь новыми значениями.
+
+        Args:
+            values (iterable): Новые значения.
+        """
+        lookup = self._get_lookup()
+        lookup[None] = -1
+        size = len(lookup) - 1 # -1: None не входит в словарь
+        add = lookup.setdefault
+        codes = [add(value, len(lookup) - 1) for value in values] # новое значение получает следующий код
+        if len(lookup) - 1 > size:
+            self.dictionary.extend(islice(lookup, size + 1, None))
+        del lookup[None]
+        if not isinstance(self.codes, array):
+            self.codes = array("i", self.codes)
+        self.codes.extend(codes)
+
+    def _get_lookup(self):
+        if self._lookup is None:
+            self._lookup = {}
+            for code, value in enumerate(self.dictionary):
+                self._lookup.setdefault(value, code)
+        return self._lookup
+
+    def __len__(self):
+        return len(self.codes)
+
+    def __getitem__(self, index):
+        if isinstance(index, slice):
+            return self.take(range(*index.indices(len(self))))
+        code = self.codes[index]
+        return None if code < 0 else self.dictionary[code]
+
+    def __iter__(self):
+        dictionary = self.dictionary + [None] # код -1 указывает на последний элемент - None
+        return map(dictionary.__getitem__, self.codes)
+
+    def to_list(self):
+        """Возвращает значения столбца в виде списка."""
+        return list(self)
+
+    def positions(self, values):
+        """
+        Возвращает номера строк, значения которых входят в values (сравниваются коды, а не значения).
+
+        Args:
+            values (iterable): Искомые значения.
+
+        Returns:
+            list: Возрастающий список номеров строк.
+        """
+        lookup = self._get_lookup()
+        codes = set()
+        for value in values:
+            try:
+                code = -1 if value is None else lookup.get(value)
+            except TypeError: # нехешируемое значение не может быть в словаре
+                continue
+            if code is not None:
+                codes.add(code)
+        if len(codes) == 1:
+            code = codes.pop()
+            return [i for i, c in enumerate(self.codes) if c == code]
+        return [i for i, c in enumerate(self.codes) if c in codes]
+
+    def take(self, positions):
+        """Возвращает новый столбец из значений по указанным позициям (словарь общий)."""
+        codes = self.codes
+        if isinstance(positions, range) and positions.step == 1:
+            return DictionaryColumn(self.type, array("i", codes[positions.start:positions.stop]), self.dictionary)
+        return DictionaryColumn(self.type, array("i", [codes[i] for i in positions]), self.dictionary)
+
+    def set(self, index, value):
+        """Записывает одно значение в столбец (новое значение добавляется в словарь)."""
+        if index < 0:
+            index += len(self)
+        if value is None:
+            code = -1
+        else:
+            lookup = self._get_lookup()
+            code = lookup.get(value)
+            if code is None:
+                code = lookup[value] = len(self.dictionary)
+                self.dictionary = self.dictionary + [value] # словарь может быть общим с другими столбцами (take)
+                if type(value) is not self.type:
+                    self.type = object
+        if not isinstance(self.codes, array): # буфер только для чтения (например, mmap) копируем при записи
+            self.codes = array("i", self.codes)
+        self.codes[index] = code
+
+    def astype(self, col_type):
+        """
+        Возвращает столбец, приведённый к типу col_type. Преобразуется только словарь, коды сохраняются.
+
+        Args:
+            col_type (type): Новый тип значений.
+
+        Returns:
+            DictionaryColumn: Новый столбец.
+
+        Raises:
+            ValueError: Если невозможно преобразовать значение.
+        """
+        convert = converter_for(col_type)
+        converted = []
+        for value in self.dictionary:
+            try:
+                converted.append(convert(value))
+            except ValueError:
+                raise ValueError(f"Невозможно преобразовать значение '{value}' в {col_type.__name__}")
+        column = DictionaryColumn(col_type, self.codes, converted)
+        if len(set(converted)) < len(converted): # разные строки дали одно значение ("1" и "01"): объединяем коды
+            column = DictionaryColumn.from_values(column, col_type)
+        return column
+
+    def __add__(self, other):
+        if isinstance(other, DictionaryColumn):
+            column = DictionaryColumn(self.type, array("i", self.codes), list(self.dictionary))
+            if other.dictionary == self.dictionary: # общий словарь: коды склеиваются как есть
+                column.codes.extend(other.codes)
+            else:
+                column.extend(other)
+                if other.type is not self.type:
+                    column.type = object
+            return column
+        if isinstance(other, Column):
+            column = DictionaryColumn(self.type, array("i", self.codes), list(self.dictionary))
+            column.extend(other)
+            if other.type is not self.type:
+                column.type = object
+            return column
+        return NotImplemented
+
+    def __radd__(self, other):
+        if isinstance(other, Column):
+            return DictionaryColumn.from_values(other) + self
+        return NotImplemented
+
+    @property
+    def nbytes(self):
+        """Примерный объём памяти: коды и значения словаря (в байтах)."""
+        return len(self.codes) * 4 + sum(sys.getsizeof(value) for value in self.dictionary) + len(self.dictionary) * 8
+
+    def __getstate__(self):
+        codes = self.codes
+        if isinstance(codes, memoryview): # memoryview нельзя сериализовать
+            codes = array("i", codes)
+        return self.type, codes, self.dictionary
+
+    def __setstate__(self, state):
+        self.type, self.codes, self.dictionary = state
+        self._lookup = None
+
+    def __reduce_ex__(self, protocol):
+        if protocol < 5:
+            return super().__reduce_ex__(protocol)
+        return _restore_dictionary_column, (self.type, sys.byteorder, _pickle_buffer(self.codes), self.dictionary)
+
+    def __repr__(self):
+        return f"DictionaryColumn({self.type.__name__}, {len(self)} values, {len(self.dictionary)} distinct)"
+
+
+def _pickle_buffer(buffer):
+    return None if buffer is None else pickle.PickleBuffer(buffer)
+
+def _from_buffer(buffer, typecode, byteorder):
+    """Массив чисел поверх буфера из pickle без копирования (с копированием, если нужно сменить порядок байтов)."""
+    if byteorder != sys.byteorder:
+        numbers = array(typecode, bytes(buffer))
+        numbers.byteswap()
+        return numbers
+    return memoryview(buffer).cast("B").cast(typecode)
+
+def _restore_column(col_type, byteorder, data, offsets, valid):
+    """Восстанавливает Column из буферов (pickle 5)."""
+    if col_type is str:
+        data = memoryview(data).cast("B")
+        offsets = _from_buffer(offsets, "q", byteorder)
+    else:
+        data = _from_buffer(data, _TYPECODES[col_type], byteorder)
+    if valid is not None:
+        valid = memoryview(valid).cast("B")
+    return Column(col_type, data, offsets, valid)
+
+def _restore_dictionary_column(col_type, byteorder, codes, dictionary):
+    """Восстанавливает DictionaryColumn из буфера кодов (pickle 5)."""
+    return DictionaryColumn(col_type, _from_buffer(codes, "i", byteorder), dictionary)
+
+
+class ColumnRows(Sequence):
+    """
+    Строки таблицы, хранящейся по столбцам.
+
+    Используется как значение ключа 'rows', поэтому все функции, которые
+    перебирают строки, продолжают работать. Строка собирается из столбцов
+    при обращении, поэтому изменения в ней не попадают в таблицу —
+    для записи используются set_cell, set_column и set_column_type.
+    """
+
+    def __init__(self, columns, length=None):
+        self.columns = list(columns)
+        self._length = len(self.columns[0]) if self.columns else (length or 0)
+
+    def __len__(self):
+        return self._length
+
+    def __getitem__(self, index):
+        if isinstance(index, slice):
+            positions = range(*index.indices(self._length))
+            return ColumnRows([column.take(positions) for column in self.columns], len(positions))
+        if index < 0:
+            index += self._length
+        if not 0 <= index < self._length:
+            raise IndexError("Номер строки выходит за пределы таблицы.")
+        return [column[index] for column in self.columns]
+
+    def __iter__(self):
+        return map(list, zip(*self.columns))
+
+    def __add__(self, other):
+        if isinstance(other, ColumnRows) and len(self.columns) == len(other.columns):
+            return ColumnRows([a + b for a, b in zip(self.columns, other.columns)], len(self) + len(other))
+        return list(self) + list(other)
+
+    def __radd__(self, other):
+        return list(other) + list(self)
+
+    def __eq__(self, other):
+        if isinstance(other, Sequence) and not isinstance(other, str):
+            return len(self) == len(other) and all(a == list(b) for a, b in zip(self, other))
+        return NotImplemented
+
+    @property
+    def column_types(self):
+        """Список типов столбцов."""
+        return [column.type for column in self.columns]
+
+    def get_column(self, col_index):
+        """Возвращает значения столбца списком."""
+        return self.columns[col_index].to_list()
+
+    def set_column(self, col_index, values):
+        """
+        Заменяет значения столбца. Тип столбца сохраняется, если все значения этого типа;
+        иначе он определяется по самим значениям, которые записываются как есть (как в списке строк).
+        """
+        values = values if isinstance(values, list) else list(values)
+        column = self.columns[col_index]
+        kind = DictionaryColumn if isinstance(column, DictionaryColumn) else Column # кодирование столбца сохраняется
+        col_type = column.type
+        if col_type is object or any(value is not None and type(value) is not col_type for value in values):
+            col_type = None
+        self.columns[col_index] = kind.from_values(values, col_type)
+
+    def set_cell(self, row_index, col_index, value):
+        """Записывает одно значение в ячейку."""
+        self.columns[col_index].set(row_index, value)
+
+    def set_column_type(self, col_index, col_type):
+        """Приводит столбец к типу col_type."""
+        self.columns[col_index] = self.columns[col_index].astype(col_type)
+
+    def positions(self, col_index, values):
+        """Номера строк, в которых значение столбца входит в values (для словарного столбца - сравнением кодов)."""
+        return self.columns[col_index].positions(values)
+
+    def take(self, positions):
+        """Возвращает строки по указанным позициям в виде новых ColumnRows."""
+        positions = list(positions)
+        return ColumnRows([column.take(positions) for column in self.columns], len(positions))
+
+    @property
+    def nbytes(self):
+        """Примерный объём памяти всех столбцов (в байтах)."""
+        return sum(column.nbytes for column in self.columns)
+
+    def __repr__(self):
+        return f"ColumnRows({len(self.columns)} columns, {self._length} rows)"
+
+
+def is_columnar(table):
+    """
+    Проверяет, хранится ли таблица по столбцам.
+
+    Args:
+        table (dict): Таблица с ключами 'header' и 'rows'.
+
+    Returns:
+        bool
+    """
+    return isinstance(table['rows'], ColumnRows)
+
+
+def to_columnar(table, column_types=None, dictionary_columns=None):
+    """
+    Преобразует таблицу из списка строк в столбцовое представление.
+
+    Args:
+        table (dict): Таблица с ключами 'header' и 'rows'.
+        column_types (dict, optional): Типы столбцов (ключи — имена или индексы столбцов).
+                                       Если не указаны, берутся из table['column_types'].
+                                       Значения приводятся к этим типам так же, как в set_column_types;
+                                       пустые строки в нестроковых столбцах считаются пропусками (None),
+                                       как при загрузке со schema.
+        dictionary_columns (list, optional): Имена или индексы столбцов, которые хранятся
+                                             со словарным кодированием (DictionaryColumn).
+
+    Returns:
+        dict: Таблица с ключами 'header' и 'rows', где 'rows' — ColumnRows.
+
+    Raises:
+        ValueError: Если значение невозможно привести к типу столбца.
+    """
+    if is_columnar(table):
+        return table
+    if column_types is None:
+        column_types = table.get('column_types') or {}
+    header = table['header']
+    rows = table['rows']
+
+    dictionary_columns = dictionary_columns or ()
+    columns = []
+    for col_index, col_name in enumerate(header):
+        col_type = column_types.get(col_index, column_types.get(col_name))
+        values = [row[col_index] for row in rows]
+        if col_type is not None and col_type is not str: # пустая ячейка CSV - пропуск, а не значение
+            values = [None if value == "" else value for value in values]
+        if col_index in dictionary_columns or col_name in dictionary_columns:
+            columns.append(DictionaryColumn.from_values(values, col_type))
+        elif col_type is None or col_type is str or col_type in _TYPECODES:
+            columns.append(Column.from_values(values, col_type)) # from_values сам приводит значения к типу
+        else:
+            columns.append(Column.from_values(values, object).astype(col_type))
+
+    new_table = {"header": header, "rows": ColumnRows(columns, len(rows))}
+    if 'column_types' in table:
+        new_table['column_types'] = table['column_types']
+    return new_table
+
+
+def to_rows(table):
+    """
+    Преобразует таблицу в обычное представление со списком строк.
+
+    Args:
+        table (dict): Таблица с ключами 'header' и 'rows' (любое представление строк).
+
+    Returns:
+        dict: Таблица, в которой 'rows' — список списков.
+    """
+    new_table = {"header": table['header'], "rows": [list(row) for row in table['rows']]}
+    if 'column_types' in table:
+        new_table['column_types'] = table['column_types']
+    return new_table
@@ -1,13 +1,55 @@
 import csv
+import io
+import mmap
+import os
+import pickle
+import struct
+import sys
+from array import array
+from concurrent.futures import ProcessPoolExecutor
+from itertools import islice
+from .columnar import DictionaryColumn, to_columnar
+from .instrumentation import instrumented
+from .io_utils import atomic_write, detect_compression, open_append, open_input
 from .table_operations import auto_detect_column_types
+from .type_inference import TypeInferencer, converter_for, infer_column_types
+from .zone_maps import compute_stats, without_stamp
 
-def load_table(file_path, auto_detect_types=False):
+_ERROR_MODES = ("raise", "null", "collect")
+_BATCH_ROWS = 10000 # строки преобразуются пачками сразу после чтения, пока они ещё в кэше
+_INDEX_STEP = 1000 # в индексе строк запоминается смещение каждой _INDEX_STEP-й записи
+_INDEX_MAGIC = b"CSVIDX01"
+_INDEX_HEADER = struct.Struct("<QqQQ") # размер CSV, время изменения (нс), шаг, количество записей
+_AUTO_DICTIONARY_RATIO = 10 # dictionary_columns="auto": различных значений в первой пачке не больше 1/10 строк
+
+@instrumented(file_io=True)
+def load_table(file_path, auto_detect_types=False, sample_rows=None, schema=None, on_error="raise", columnar=False,
+               dictionary_columns=None, compression="infer", background=False):
     """
     Загружает таблицу из CSV файла.
 
+    Если указана схема, значения приводятся к типам столбцов прямо при чтении,
+    и отдельный вызов set_column_types не нужен. Пустые значения типизированных
+    столбцов становятся None.
+
     Args:
         file_path (str): Путь к CSV файлу.
         auto_detect_types (bool): Если True, автоматически определяет типы столбцов.
+        sample_rows (int, optional): Определять типы только по первым sample_rows строкам.
+        schema (dict or str, optional): Типы столбцов (ключи — имена или индексы столбцов)
+                                        или "infer" — определить типы по первым sample_rows (по умолчанию 1000) строкам.
+        on_error (str): Что делать со значением, которое не приводится к типу:
+                        "raise" — ошибка, "null" — заменить на None,
+                        "collect" — заменить на None и записать в table['errors'].
+        columnar (bool): Если True, таблица возвращается в столбцовом представлении (см. to_columnar).
+        dictionary_columns (list or str, optional): Имена или индексы столбцов, которые хранятся
+                                                    со словарным кодированием (DictionaryColumn): целые коды
+                                                    и список различных значений. "auto" - столбцы, у которых
+                                                    в первых строках мало различных значений. Значения кодируются
+                                                    сразу при чтении. Таблица возвращается в столбцовом представлении.
+        compression (str, optional): Сжатие файла: "infer" - по расширению (.gz, .bz2, .xz) или первым байтам,
+                                     "gzip", "bz2", "lzma" или None. Сжатый файл распаковывается потоково.
+        background (bool): Если True, файл читается и распаковывается в фоновом потоке одновременно с разбором.
 
     Returns:
         dict: Таблица с ключами 'header' и 'rows'.
@@ -15,28 +57,169 @@ def load_table(file_path, auto_detect_types=False):
     Raises:
         ValueError: Если возникает ошибка при загрузке файла.
     """
+    if on_error not in _ERROR_MODES:
+        raise ValueError(f"Неизвестный режим обработки ошибок: {on_error}")
     try:
-        with open(file_path, mode="r", newline="", encoding="utf-8") as file:
+        with open_input(file_path, "r", compression, background, newline="", encoding="utf-8") as file:
             reader = csv.reader(file) # reader для чтения строк
             header = next(reader) # читаем 1 строку как заголовок
-            rows = [row for row in reader] # список списков каждый внутренний список представляет одну строку из CSV
+            encoded = {} # индекс столбца -> DictionaryColumn
+            if schema is None and dictionary_columns is None:
+                rows = [row for row in reader] # список списков каждый внутренний список представляет одну строку из CSV
+            else:
+                column_types, batch = _resolve_schema(header, schema, reader, sample_rows) if schema is not None else (None, [])
+                errors = [] if on_error == "collect" else None
+                batch = batch or list(islice(reader, _BATCH_ROWS)) # первая пачка - строки, прочитанные для определения схемы
+                if dictionary_columns is not None:
+                    encoded = {i: DictionaryColumn.from_values(()) for i in _dictionary_indexes(header, dictionary_columns, batch)}
+                converters = [c for c in _converters(header, column_types) if c[0] not in encoded] if column_types else []
+                rows = []
+                while batch: # преобразуем пачку строк сразу после чтения
+                    _convert_rows(batch, len(rows), header, converters, on_error, errors)
+                    for i, column in encoded.items():
+                        column.extend([row[i] for row in batch])
+                        for row in batch:
+                            row[i] = None # значение хранится только в словаре, строка из csv.reader освобождается
+                    rows.extend(batch)
+                    batch = list(islice(reader, _BATCH_ROWS))
 
         table = {"header": header, "rows": rows} # внутреннее представление таблицы
 
-        if auto_detect_types: # если параметр auto_detect_types=True
-            table['column_types'] = auto_detect_column_types(table) # функция создает новый ключ и возвращает вложеный словарь с определёнными типами данных для каждого столбца
+        if schema is not None:
+            table['column_types'] = column_types
+        if encoded:
+            for i, column in encoded.items(): # значения словарного столбца приводятся к типу по одному разу
+                col_type = column_types[header[i]] if schema is not None else str
+                encoded[i] = _convert_dictionary(column, col_type, header[i], on_error, errors)
+            if errors:
+                errors.sort(key=lambda error: error['row'])
+            table = to_columnar(table)
+            table['rows'].columns[:] = [encoded.get(i, column) for i, column in enumerate(table['rows'].columns)]
+        if schema is not None:
+            if errors is not None:
+                table['errors'] = errors
+        elif auto_detect_types: # если параметр auto_detect_types=True
+            table['column_types'] = auto_detect_column_types(table, sample_rows) # функция создает новый ключ и возвращает вложеный словарь с определёнными типами данных для каждого столбца
 
+        if columnar:
+            table = to_columnar(table)
         return table
     except Exception as e:
         raise ValueError(f"Ошибка при загрузке CSV файла {file_path}: {e}")
 
-def save_table(table, file_path):
+def _resolve_schema(header, schema, reader, sample_rows):
+    """
+    Приводит схему к словарю {имя столбца: тип} для всех столбцов.
+
+    Для schema="infer" читает первые строки файла и определяет по ним типы.
+
+    Returns:
+        tuple: (словарь типов, уже прочитанные строки)
+    """
+    prefix = []
+    if schema == "infer":
+        prefix = list(islice(reader, sample_rows or 1000))
+        schema = infer_column_types({"header": header, "rows": prefix})
+    elif not isinstance(schema, dict):
+        raise ValueError(f"Схема должна быть словарём или 'infer', а не {schema!r}")
+    column_types = dict.fromkeys(header, str)
+    for key, col_type in schema.items():
+        column_types[header[key] if isinstance(key, int) else header[header.index(key)]] = col_type
+    return column_types, prefix
+
+def _dictionary_indexes(header, dictionary_columns, batch):
+    """Индексы столбцов со словарным кодированием; для "auto" - по различным значениям первой пачки строк."""
+    if dictionary_columns == "auto":
+        limit = len(batch) // _AUTO_DICTIONARY_RATIO
+        return [i for i in range(len(header)) if len({row[i] for row in batch}) <= limit]
+    indexes = []
+    for column in dictionary_columns:
+        if not isinstance(column, int) and column not in header:
+            raise ValueError(f"Столбец '{column}' не найден.")
+        indexes.append(column if isinstance(column, int) else header.index(column))
+    return indexes
+
+def _convert_dictionary(column, col_type, column_name, on_error, errors):
+    """
+    Приводит значения словарного столбца к типу: каждое различное значение преобразуется один раз.
+    Пустые и непреобразуемые (при on_error="null"/"collect") значения становятся None.
+    """
+    if col_type is str:
+        return column
+    convert = converter_for(col_type)
+    remap = [] # старый код -> новый код
+    lookup = {}
+    for code, value in enumerate(column.dictionary):
+        if value == "":
+            remap.append(-1)
+            continue
+        try:
+            converted = convert(value)
+        except (ValueError, TypeError, OverflowError):
+            if on_error == "raise":
+                raise ValueError(f"Невозможно преобразовать значение '{value}' в {col_type.__name__} "
+                                 f"(строка {column.codes.index(code)}, столбец '{column_name}')")
+            if errors is not None:
+                errors.extend({"row": row, "column": column_name, "value": value}
+                              for row, c in enumerate(column.codes) if c == code)
+            remap.append(-1)
+            continue
+        remap.append(lookup.setdefault(converted, len(lookup))) # "1" и "01" дают один код
+    remap.append(-1) # код -1 (None) остаётся -1
+    return DictionaryColumn(col_type, array("i", map(remap.__getitem__, column.codes)), list(lookup))
+
+def _converters(header, column_types):
+    """Список (индекс столбца, функция преобразования, тип) для столбцов, которые нужно преобразовывать."""
+    return [(i, converter_for(column_types[name]), column_types[name])
+            for i, name in enumerate(header) if column_types[name] is not str]
+
+def _convert_rows(rows, first_row, header, converters, on_error, errors):
+    """
+    Приводит значения строк к типам столбцов на месте.
+
+    Args:
+        rows (list): Строки, только что прочитанные из файла.
+        first_row (int): Номер первой из них в таблице (для сообщений об ошибках).
+        header (list): Заголовок таблицы.
+        converters (list): Результат _converters.
+        on_error (str): "raise", "null" или "collect".
+        errors (list or None): Куда записывать ошибки в режиме "collect".
+    """
+    for row_number, row in enumerate(rows, first_row):
+        for i, convert, col_type in converters:
+            value = row[i]
+            if value == "": # пустое значение - пропуск
+                row[i] = None
+                continue
+            try:
+                row[i] = convert(value)
+            except (ValueError, TypeError, OverflowError):
+                if on_error == "raise":
+                    raise ValueError(f"Невозможно преобразовать значение '{value}' в {col_type.__name__} "
+                                     f"(строка {row_number}, столбец '{header[i]}')")
+                row[i] = None
+                if errors is not None:
+                    errors.append({"row": row_number, "column": header[i], "value": value})
+
+@instrumented(file_io=True)
+def save_table(table, file_path, row_index=False, compression="infer", level=None, background=False, stats=False):
     """
     Сохраняет таблицу в CSV-файл.
 
+    Файл записывается во временный файл и затем заменяет исходный (atomic_write),
+    поэтому при ошибке старое содержимое не теряется.
+
     Args:
         table (dict): Таблица в виде словаря с ключами header и rows.
         file_path (str): Путь, куда нужно сохранить файл.
+        row_index (bool): Если True, сразу строит индекс строк для get_rows_by_number (см. build_row_index).
+                          Для сжатых файлов индекс не строится.
+        compression (str, optional): Сжатие: "infer" - по расширению (.gz, .bz2, .xz), "gzip", "bz2", "lzma" или None.
+        level (int, optional): Уровень сжатия (по умолчанию 6 для gzip и lzma, 9 для bz2).
+        background (bool): Если True, данные сжимаются в фоновом потоке, пока формируются следующие строки.
+        stats (bool): Если True, рядом с файлом сохраняется статистика частей (file_path + ".stats",
+                      см. build_stats), а для несжатого файла - и индекс строк, чтобы scan_csv
+                      пропускал части, в которых нет подходящих строк.
 
     Returns:
         None: Функция ничего не возвращает.
@@ -45,10 +228,502 @@ def save_table(table, file_path):
         ValueError: Если возникает ошибка при сохранении файла.
     """
     try:
-        with open(file_path, mode="w", newline='', encoding='utf-8') as file:
+        codec = detect_compression(file_path, compression, reading=False)
+        with atomic_write(file_path, mode="w", compression=codec, level=level, background=background,
+                          newline='', encoding='utf-8') as file:
             writer = csv.writer(file) # для записи данных в файл.
             writer.writerow(table['header']) # записывает список заголовков как первую строку.
             writer.writerows(table['rows']) # записывает все строки таблицы.
+        if (row_index or stats) and codec is None: # смещения в сжатом файле не позволяют перейти к записи
+            build_row_index(file_path)
+        if stats:
+            _write_stats(file_path, compute_stats(table, _INDEX_STEP, _table_types(table)))
     except Exception as e:
         raise ValueError(f"Ошибка при сохранении файла {file_path}: {e}")
-        
+
+@instrumented(file_io=True)
+def append_table(table, file_path):
+    """
+    Дописывает строки таблицы в конец CSV файла, не перезаписывая его.
+
+    Заголовок файла должен совпадать с заголовком таблицы (как в concat). Если файла
+    нет или он пуст, он создаётся как в save_table. Актуальный индекс строк
+    (build_row_index) дополняется только новыми записями. В сжатый файл
+    (.gz, .bz2, .xz) строки дописываются новым сжатым потоком.
+
+    Args:
+        table (dict): Таблица с новыми строками.
+        file_path (str): Путь к CSV файлу.
+
+    Raises:
+        ValueError: Заголовки не совпадают или возникает ошибка при записи файла.
+    """
+    if not os.path.exists(file_path) or os.path.getsize(file_path) == 0:
+        save_table(table, file_path)
+        return
+    try:
+        with open_input(file_path, "r", newline="", encoding="utf-8") as file:
+            header = next(csv.reader(file), None)
+        if header != list(table['header']):
+            raise ValueError("Таблицы имеют разные заголовки и не могут быть объединены.")
+        if detect_compression(file_path) is not None: # save_table всегда завершает запись переводом строки
+            with open_append(file_path, "a", newline="", encoding="utf-8") as file:
+                csv.writer(file).writerows(table['rows'])
+            return
+        index = _read_row_index(file_path) # индекс, актуальный до дописывания
+        size = os.path.getsize(file_path)
+        with open(file_path, mode="rb") as file:
+            file.seek(size - 1)
+            terminated = file.read(1) == b"\n"
+        with open(file_path, mode="a", newline="", encoding="utf-8") as file:
+            if not terminated: # последняя запись без перевода строки
+                file.write("\r\n")
+            csv.writer(file).writerows(table['rows'])
+        if index is not None:
+            offsets, step, records = index
+            start = size if terminated else size + 2
+            with open(file_path, mode="rb") as file:
+                file.seek(start)
+                records = _scan_records(file, start, records, offsets, step)
+            _write_row_index(file_path, offsets, step, records)
+    except Exception as e:
+        raise ValueError(f"Ошибка при дописывании в файл {file_path}: {e}")
+
+def build_row_index(file_path, step=_INDEX_STEP):
+    """
+    Строит индекс строк CSV файла и сохраняет его рядом с файлом (file_path + ".idx").
+
+    В индексе хранятся смещения в байтах каждой step-й записи, а также размер и
+    время изменения CSV файла, по которым устаревший индекс обнаруживается и
+    строится заново. Запись заканчивается переводом строки вне кавычек, поэтому
+    поля с переводами строк внутри кавычек учитываются правильно.
+
+    Args:
+        file_path (str): Путь к CSV файлу.
+        step (int): Через сколько записей запоминать смещение.
+
+    Returns:
+        tuple: (смещения array('q'), шаг, количество записей без заголовка)
+
+    Raises:
+        ValueError: Файл сжат или возникает ошибка при чтении файла.
+    """
+    if detect_compression(file_path) is not None:
+        raise ValueError(f"Индекс строк не строится для сжатого файла {file_path}.")
+    try:
+        offsets = array("q")
+        with open(file_path, mode="rb") as file:
+            records = max(_scan_records(file, 0, -1, offsets, step), 0) # первая запись - заголовок
+        _write_row_index(file_path, offsets, step, records)
+        return offsets, step, records
+    except Exception as e:
+        raise ValueError(f"Ошибка при построении индекса строк {file_path}: {e}")
+
+def _scan_records(file, position, records, offsets, step):
+    """
+    Находит начала записей в двоичном файле с текущей позиции и дополняет offsets.
+
+    Args:
+        file: Файл, открытый в режиме "rb", на начале записи.
+        position (int): Смещение текущей позиции.
+        records (int): Номер записи, которая начинается в этой позиции.
+        offsets (array): Смещения каждой step-й записи.
+        step (int): Шаг индекса.
+
+    Returns:
+        int: Количество записей в файле (номер следующей записи).
+    """
+    start = position
+    quotes = 0
+    for line in file:
+        position += len(line)
+        quotes += line.count(b'"')
+        if quotes % 2: # перевод строки внутри кавычек - запись продолжается
+            continue
+        if records >= 0 and records % step == 0:
+            offsets.append(start)
+        records += 1
+        start, quotes = position, 0
+    return records
+
+def _write_row_index(file_path, offsets, step, records):
+    """Сохраняет индекс строк вместе с размером и временем изменения CSV файла."""
+    stat = os.stat(file_path)
+    data = array("q", offsets)
+    if sys.byteorder != "little":
+        data.byteswap()
+    try:
+        with atomic_write(file_path + ".idx", mode="wb") as file:
+            file.write(_INDEX_MAGIC)
+            file.write(_INDEX_HEADER.pack(stat.st_size, stat.st_mtime_ns, step, records))
+            file.write(data.tobytes())
+    except OSError: # индекс не удалось сохранить (например, нет прав) - используем его только сейчас
+        pass
+
+def _table_types(table):
+    """Типы столбцов таблицы для статистики: column_types, типы столбцовых строк или определённые по данным."""
+    if table.get('column_types'):
+        return dict(table['column_types'])
+    stored = getattr(table['rows'], 'column_types', None)
+    if stored is not None and object not in stored:
+        return dict(zip(table['header'], stored))
+    return infer_column_types(table)
+
+def build_stats(file_path, schema=None):
+    """
+    Вычисляет статистику частей CSV файла (zone maps, см. zone_maps.compute_stats)
+    и сохраняет её рядом с файлом (file_path + ".stats").
+
+    Части совпадают с частями индекса строк (по _INDEX_STEP записей), поэтому по индексу
+    можно перейти к началу любой части. Файл читается потоково; если схема не задана,
+    типы столбцов сначала определяются отдельным проходом. Статистика, как и индекс,
+    запоминает размер и время изменения файла и после его изменения не используется.
+
+    Args:
+        file_path (str): Путь к CSV файлу.
+        schema (dict, optional): Типы столбцов (ключи - имена или индексы).
+
+    Returns:
+        dict: Статистика.
+
+    Raises:
+        ValueError: Если возникает ошибка при чтении файла.
+    """
+    column_types = None
+    if schema is None:
+        for chunk in iter_table(file_path, chunk_rows=_BATCH_ROWS, auto_detect_types=True):
+            column_types = chunk['column_types'] # типы последней части верны для всего файла
+    stats = None
+    for chunk in iter_table(file_path, chunk_rows=_INDEX_STEP):
+        if column_types is None: # схема задана: ключи приводятся к именам по заголовку
+            header = chunk['header']
+            column_types = {header[key] if isinstance(key, int) else key: col_type for key, col_type in schema.items()}
+        part = compute_stats(chunk, _INDEX_STEP, column_types)
+        if stats is None:
+            stats = without_stamp(part) # статистика файла, а не строк в памяти
+            continue
+        stats['rows'] += part['rows']
+        for name, column in part['columns'].items():
+            for key, values in column.items():
+                stats['columns'][name][key].extend(values)
+    _write_stats(file_path, stats)
+    return stats
+
+def _write_stats(file_path, stats):
+    """Сохраняет статистику частей вместе с размером и временем изменения CSV файла."""
+    stat = os.stat(file_path)
+    try:
+        with atomic_write(file_path + ".stats", mode="wb") as file:
+            pickle.dump({"size": stat.st_size, "mtime_ns": stat.st_mtime_ns, "stats": without_stamp(stats)}, file)
+    except OSError: # статистику не удалось сохранить - файл читается без неё
+        pass
+
+def read_stats(file_path):
+    """
+    Читает статистику частей CSV файла (build_stats).
+
+    Args:
+        file_path (str): Путь к CSV файлу.
+
+    Returns:
+        dict or None: Статистика или None, если её нет или файл изменился после её вычисления.
+    """
+    try:
+        stat = os.stat(file_path)
+        with open(file_path + ".stats", mode="rb") as file:
+            data = pickle.load(file)
+    except (OSError, pickle.UnpicklingError, EOFError):
+        return None
+    if (data.get('size'), data.get('mtime_ns')) != (stat.st_size, stat.st_mtime_ns):
+        return None
+    return data['stats']
+
+def _read_row_index(file_path):
+    """Читает индекс строк. Возвращает None, если индекса нет или CSV файл изменился после его построения."""
+    try:
+        stat = os.stat(file_path)
+        with open(file_path + ".idx", mode="rb") as file:
+            if file.read(len(_INDEX_MAGIC)) != _INDEX_MAGIC:
+                return None
+            size, mtime_ns, step, records = _INDEX_HEADER.unpack(file.read(_INDEX_HEADER.size))
+            if (size, mtime_ns) != (stat.st_size, stat.st_mtime_ns):
+                return None
+            offsets = array("q")
+            offsets.frombytes(file.read())
+    except (OSError, struct.error):
+        return None
+    if sys.byteorder != "little":
+        offsets.byteswap()
+    return offsets, step, records
+
+def _load_row_index(file_path):
+    """Читает индекс строк; если его нет или CSV файл изменился, строит заново."""
+    return _read_row_index(file_path) or build_row_index(file_path)
+
+@instrumented(file_io=True)
+def get_rows_by_number(file_path, start, stop=None, schema=None, on_error="raise"):
+    """
+    Читает из CSV файла только строки с номерами из интервала [start, stop), не разбирая остальные.
+
+    По индексу строк (см. build_row_index; строится при первом обращении и перестраивается,
+    если файл изменился) находится смещение ближайшей предыдущей записи, после чего
+    разбирается не больше step лишних записей и сам интервал. Сжатый файл индекса
+    не имеет и читается потоково до конца интервала.
+
+    Args:
+        file_path (str): Путь к CSV файлу.
+        start (int): Номер первой строки (отрицательный - от конца файла).
+        stop (int, optional): Номер строки, до которой идёт выборка (не включая). None - до конца файла.
+        schema (dict or str, optional): Схема, как в load_table ("infer" - по строкам интервала).
+        on_error (str): "raise", "null" или "collect", как в load_table.
+
+    Returns:
+        dict: Таблица с ключами 'header' и 'rows' (и 'column_types', 'errors' при указанной схеме).
+
+    Raises:
+        ValueError: Если возникает ошибка при чтении файла.
+    """
+    if on_error not in _ERROR_MODES:
+        raise ValueError(f"Неизвестный режим обработки ошибок: {on_error}")
+    if detect_compression(file_path) is not None:
+        return _rows_by_number_stream(file_path, start, stop, schema, on_error)
+    offsets, step, records = _load_row_index(file_path)
+    positions = range(records)[start:stop]
+    try:
+        with open(file_path, mode="rb") as raw:
+            text = io.TextIOWrapper(raw, encoding="utf-8", newline="")
+            header = next(csv.reader(text))
+            text.detach() # файл остаётся открытым для перехода к нужной записи
+            rows = []
+            if len(positions):
+                first = positions.start
+                raw.seek(offsets[first // step])
+                text = io.TextIOWrapper(raw, encoding="utf-8", newline="")
+                reader = islice(csv.reader(text), first % step, None) # пропускаем записи до начала интервала
+                rows = list(islice(reader, len(positions)))
+        return _rows_table(header, rows, positions.start if len(positions) else 0, schema, on_error)
+    except Exception as e:
+        raise ValueError(f"Ошибка при загрузке CSV файла {file_path}: {e}")
+
+def _rows_by_number_stream(file_path, start, stop, schema, on_error):
+    """get_rows_by_number для сжатого файла: записи перебираются от начала файла."""
+    try:
+        with open_input(file_path, "r", newline="", encoding="utf-8") as file:
+            reader = csv.reader(file)
+            header = next(reader)
+            if start < 0 or (stop is not None and stop < 0): # номера от конца: нужно количество записей
+                records = list(reader)
+                positions = range(len(records))[start:stop]
+                rows = records[positions.start:positions.stop]
+            else:
+                positions = range(start, sys.maxsize if stop is None else max(start, stop))
+                rows = list(islice(reader, positions.start, positions.stop))
+        return _rows_table(header, rows, positions.start, schema, on_error)
+    except Exception as e:
+        raise ValueError(f"Ошибка при загрузке CSV файла {file_path}: {e}")
+
+def _rows_table(header, rows, first, schema, on_error):
+    """Таблица из строк интервала; first - номер первой строки (для ошибок преобразования)."""
+    table = {"header": header, "rows": rows}
+    if schema is not None:
+        column_types, _ = _resolve_schema(header, schema, iter(rows), None) # "infer" - по строкам интервала
+        errors = [] if on_error == "collect" else None
+        _convert_rows(rows, first, header, _converters(header, column_types), on_error, errors)
+        table['column_types'] = column_types
+        if errors is not None:
+            table['errors'] = errors
+    return table
+
+@instrumented(file_io=True)
+def iter_table(file_path, chunk_rows=10000, auto_detect_types=False, sample_rows=None, schema=None, on_error="raise",
+               compression="infer", background=False):
+    """
+    Читает CSV файл по частям, не загружая его целиком в память.
+
+    Каждая часть - обычная таблица с не более чем chunk_rows строками,
+    все части используют один и тот же список заголовков.
+
+    Args:
+        file_path (str): Путь к CSV файлу.
+        chunk_rows (int): Максимальное количество строк в одной части.
+        auto_detect_types (bool): Если True, типы столбцов определяются постепенно:
+                                  в 'column_types' каждой части лежат типы, определённые
+                                  по всем строкам, прочитанным к этому моменту.
+                                  Типы последней части верны для всего файла.
+        sample_rows (int, optional): Определять типы только по первым sample_rows строкам файла.
+        schema (dict or str, optional): Схема, как в load_table; значения приводятся к типам в каждой части.
+        on_error (str): "raise", "null" или "collect", как в load_table (ошибки части - в chunk['errors']).
+        compression (str, optional): Сжатие файла, как в load_table.
+        background (bool): Читать и распаковывать файл в фоновом потоке, как в load_table.
+
+    Returns:
+        iterator: Итератор по таблицам с ключами 'header' и 'rows'.
+
+    Raises:
+        ValueError: Если chunk_rows меньше 1 или возникает ошибка при чтении файла.
+    """
+    if chunk_rows < 1:
+        raise ValueError("Размер части chunk_rows должен быть не меньше 1.")
+    if on_error not in _ERROR_MODES:
+        raise ValueError(f"Неизвестный режим обработки ошибок: {on_error}")
+    return _iter_chunks(file_path, chunk_rows, auto_detect_types, sample_rows, schema, on_error, compression, background)
+
+def _iter_chunks(file_path, chunk_rows, auto_detect_types, sample_rows, schema, on_error, compression, background):
+    """Генератор частей для iter_table."""
+    try:
+        with open_input(file_path, "r", compression, background, newline="", encoding="utf-8") as file:
+            reader = csv.reader(file)
+            header = next(reader)
+            inferencer = None
+            if schema is not None:
+                column_types, pending = _resolve_schema(header, schema, reader, sample_rows)
+                converters = _converters(header, column_types)
+            elif auto_detect_types:
+                inferencer = TypeInferencer(header, sample_rows) # типы по всем прочитанным строкам
+            first = True
+            row_count = 0
+            while True:
+                if schema is not None and pending: # строки, прочитанные для определения схемы
+                    rows, pending = pending[:chunk_rows], pending[chunk_rows:]
+                    rows.extend(islice(reader, chunk_rows - len(rows)))
+                else:
+                    rows = list(islice(reader, chunk_rows)) # читаем не больше chunk_rows строк
+                if not rows and not first: # пустую часть отдаём только если в файле нет строк, чтобы передать заголовок
+                    break
+                first = False
+                chunk = {"header": header, "rows": rows}
+                if schema is not None:
+                    errors = [] if on_error == "collect" else None
+                    _convert_rows(rows, row_count, header, converters, on_error, errors)
+                    chunk['column_types'] = column_types
+                    if errors is not None:
+                        chunk['errors'] = errors
+                row_count += len(rows)
+                if inferencer is not None:
+                    inferencer.update(rows)
+                    chunk['column_types'] = inferencer.result()
+                yield chunk
+                if len(rows) < chunk_rows:
+                    break
+    except Exception as e:
+        raise ValueError(f"Ошибка при загрузке CSV файла {file_path}: {e}")
+
+@instrumented(file_io=True)
+def load_table_parallel(file_path, auto_detect_types=False, workers=None, min_range_bytes=1 << 20):
+    """
+    Загружает таблицу из CSV файла, разбирая его в нескольких процессах.
+
+    Файл делится на диапазоны байтов, границы которых выравниваются по концам записей
+    (перевод строки вне кавычек, поэтому поля с переводами строк внутри кавычек не разрываются).
+    Диапазоны разбираются в ProcessPoolExecutor и склеиваются в исходном порядке.
+    Как и ProcessPoolExecutor, функцию нужно вызывать под if __name__ == "__main__".
+    Сжатый файл нельзя разделить на диапазоны, он загружается через load_table.
+
+    Args:
+        file_path (str): Путь к CSV файлу.
+        auto_detect_types (bool): Если True, типы определяются в каждом диапазоне (TypeInferencer) и затем объединяются.
+        workers (int, optional): Количество процессов (по умолчанию os.cpu_count()).
+        min_range_bytes (int): Минимальный размер одного диапазона; маленькие файлы разбираются в текущем процессе.
+
+    Returns:
+        dict: Таблица с ключами 'header' и 'rows'.
+
+    Raises:
+        ValueError: Если возникает ошибка при загрузке файла.
+    """
+    if detect_compression(file_path) is not None:
+        return load_table(file_path, auto_detect_types=auto_detect_types)
+    try:
+        workers = workers or os.cpu_count() or 1
+        with open(file_path, mode="rb") as file:
+            size = os.fstat(file.fileno()).st_size
+            if size == 0:
+                raise ValueError("файл пуст")
+            with mmap.mmap(file.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+                header_end = _record_boundaries(mm, 0, [1])[1] # конец первой записи - заголовка
+                header = next(csv.reader(io.StringIO(mm[:header_end].decode("utf-8"), newline="")))
+                data_size = size - header_end
+                parts = max(1, min(workers, data_size // max(min_range_bytes, 1)))
+                targets = [header_end + data_size * k // parts for k in range(1, parts)]
+                bounds = _record_boundaries(mm, header_end, targets)
+
+        ranges = list(zip(bounds, bounds[1:]))
+        if len(ranges) <= 1:
+            results = [_parse_range(file_path, start, end, header, auto_detect_types) for start, end in ranges]
+        else:
+            with ProcessPoolExecutor(max_workers=min(workers, len(ranges))) as executor:
+                results = list(executor.map(_parse_range, [file_path] * len(ranges), bounds[:-1], bounds[1:],
+                                            [header] * len(ranges), [auto_detect_types] * len(ranges)))
+
+        rows = []
+        inferencer = TypeInferencer(header) if auto_detect_types else None
+        for range_rows, range_inferencer in results: # склеиваем диапазоны в исходном порядке
+            rows.extend(range_rows)
+            if inferencer is not None:
+                inferencer.merge(range_inferencer)
+
+        table = {"header": header, "rows": rows}
+        if inferencer is not None:
+            table['column_types'] = inferencer.result()
+        return table
+    except Exception as e:
+        raise ValueError(f"Ошибка при загрузке CSV файла {file_path}: {e}")
+
+def _count_quotes(mm, start, stop, block=1 << 24):
+    """Считает кавычки в mm[start:stop], читая блоками, чтобы не копировать весь диапазон."""
+    count = 0
+    for pos in range(start, stop, block):
+        count += mm[pos:min(pos + block, stop)].count(b'"')
+    return count
+
+def _record_boundaries(mm, start, targets):
+    """
+    Находит начала записей CSV, ближайшие к заданным смещениям.
+
+    Начиная со start (начала записи), считает чётность кавычек: перевод строки
+    при чётном числе кавычек - конец записи. Экранированные кавычки ("") не меняют чётность.
+
+    Args:
+        mm (mmap.mmap): Содержимое файла.
+        start (int): Смещение начала записи.
+        targets (list): Возрастающие смещения, после которых нужно найти границы.
+
+    Returns:
+        list: Смещения границ, начиная со start и заканчивая размером файла.
+    """
+    size = len(mm)
+    bounds = [start]
+    pos = start
+    parity = 0
+    for target in targets:
+        if target <= pos:
+            continue
+        parity ^= _count_quotes(mm, pos, target) & 1
+        pos = target
+        while pos < size:
+            newline = mm.find(b"\n", pos)
+            if newline == -1:
+                pos = size
+                break
+            parity ^= _count_quotes(mm, pos, newline + 1) & 1
+            pos = newline + 1
+            if parity == 0: # перевод строки вне кавычек - конец записи
+                bounds.append(pos)
+                break
+        if pos >= size:
+            break
+    if bounds[-1] != size:
+        bounds.append(size)
+    return bounds
+
+def _parse_range(file_path, start, end, header, auto_detect_types):
+    """Разбирает записи CSV в диапазоне байтов [start, end) (выполняется в отдельном процессе)."""
+    with open(file_path, mode="rb") as file:
+        file.seek(start)
+        text = file.read(end - start).decode("utf-8")
+    rows = list(csv.reader(io.StringIO(text, newline="")))
+    inferencer = None
+    if auto_detect_types: # состояние определителя типов небольшое и объединяется в основном процессе
+        inferencer = TypeInferencer(header)
+        inferencer.update(rows)
+    return rows, inferencer
@@ -0,0 +1,135 @@
+import glob
+import os
+from array import array
+from concurrent.futures import ProcessPoolExecutor
+from .columnar import ColumnRows, DictionaryColumn
+from .csv_module import load_table as _load_csv
+from .instrumentation import instrumented
+from .io_utils import _EXTENSIONS
+from .pickle_module import load_table as _load_pickle
+from .table_operations import concat_many
+from .type_inference import TypeInferencer, join_types
+
+_LOADERS = {"csv": _load_csv, "pickle": _load_pickle}
+_FORMATS = {".csv": "csv", ".pkl": "pickle", ".pickle": "pickle"}
+
+
+@instrumented
+def load_dataset(pattern, format="auto", workers=None, auto_detect_types=False, source_column=None, **options):
+    """
+    Загружает набор файлов (например, ежедневные части одной таблицы) в одну таблицу.
+
+    Файлы находятся по шаблону glob (поддерживается "**"), загружаются параллельно
+    в ProcessPoolExecutor и склеиваются через concat_many без копирования строк
+    (результат - ChunkedRows). Как и ProcessPoolExecutor, функцию нужно вызывать
+    под if __name__ == "__main__".
+
+    Args:
+        pattern (str or list): Шаблон glob или список путей и шаблонов. Файлы идут в порядке имён.
+        format (str): "csv", "pickle" или "auto" - по расширению (.csv, .pkl, .pickle, в том числе
+                      сжатые .csv.gz и т.п.).
+        workers (int, optional): Количество процессов (по умолчанию os.cpu_count()); 1 - загрузка в текущем процессе.
+        auto_detect_types (bool): Если True, типы определяются в каждом файле (TypeInferencer) и
+                                  объединяются, так что 'column_types' верны для всего набора.
+        source_column (str, optional): Имя добавляемого столбца, в котором для каждой строки записан путь
+                                       к её файлу.
+        **options: Параметры функции загрузки (например, schema или dictionary_columns для load_csv).
+
+    Returns:
+        dict: Таблица с ключами 'header' и 'rows' (и 'column_types', если типы определялись
+              или были у всех файлов).
+
+    Raises:
+        ValueError: Файлы не найдены, формат не определён, заголовки файлов не совпадают
+                    (как в concat) или возникает ошибка при загрузке файла.
+    """
+    paths = _find_files(pattern)
+    formats = [_format(path, format) for path in paths]
+    workers = min(workers or os.cpu_count() or 1, len(paths))
+    arguments = (paths, formats, [auto_detect_types] * len(paths), [source_column] * len(paths),
+                 [options] * len(paths))
+    if workers <= 1:
+        results = list(map(_load_file, *arguments))
+    else:
+        with ProcessPoolExecutor(max_workers=workers) as executor:
+            results = list(executor.map(_load_file, *arguments))
+
+    header = results[0][0]['header']
+    for path, (table, _) in zip(paths, results):
+        if table['header'] != header:
+            raise ValueError(f"Таблицы имеют разные заголовки и не могут быть объединены: {paths[0]} и {path}")
+    dataset = concat_many(table for table, _ in results)
+
+    if auto_detect_types:
+        inferencer = results[0][1]
+        for _, other in results[1:]:
+            inferencer.merge(other)
+        dataset['column_types'] = inferencer.result()
+    elif all(table.get('column_types') for table, _ in results): # например, при общей схеме
+        column_types = dict(results[0][0]['column_types'])
+        for table, _ in results[1:]:
+            for name, col_type in table['column_types'].items():
+                column_types[name] = join_types(column_types.get(name, col_type), col_type)
+        dataset['column_types'] = column_types
+    if source_column is not None and 'column_types' in dataset:
+        dataset['column_types'][source_column] = str
+    return dataset
+
+def _find_files(pattern):
+    """Пути файлов по шаблону или списку шаблонов, без повторов, в порядке имён."""
+    patterns = [pattern] if isinstance(pattern, (str, os.PathLike)) else list(pattern)
+    paths = set()
+    for item in patterns:
+        item = os.fspath(item)
+        matches = glob.glob(item, recursive=True) if glob.has_magic(item) else [item] * os.path.exists(item)
+        paths.update(path for path in matches if os.path.isfile(path))
+    if not paths:
+        raise ValueError(f"Не найдено файлов по шаблону {pattern}")
+    return sorted(paths)
+
+def _format(path, format):
+    """Формат файла: заданный или определённый по расширению (без расширения сжатия)."""
+    if format != "auto":
+        if format not in _LOADERS:
+            raise ValueError(f"Неизвестный формат: {format}")
+        return format
+    base, extension = os.path.splitext(path)
+    if extension.lower() in _EXTENSIONS:
+        extension = os.path.splitext(base)[1]
+    if extension.lower() not in _FORMATS:
+        raise ValueError(f"Не удалось определить формат файла {path}")
+    return _FORMATS[extension.lower()]
+
+def _load_file(path, format, auto_detect_types, source_column, options):
+    """
+    Загружает один файл набора (выполняется в отдельном процессе).
+
+    Returns:
+        tuple: (таблица, TypeInferencer или None). Состояние определителя типов небольшое
+               и объединяется в основном процессе.
+    """
+    table = _LOADERS[format](path, **options)
+    inferencer = None
+    if auto_detect_types:
+        inferencer = TypeInferencer(table['header'])
+        inferencer.update(table['rows'])
+    if source_column is not None:
+        _add_source(table, source_column, path)
+    return table, inferencer
+
+def _add_source(table, source_column, path):
+    """Добавляет столбец с путём к файлу."""
+    if source_column in table['header']:
+        raise ValueError(f"Столбец '{source_column}' уже есть в файле {path}")
+    rows = table['rows']
+    if isinstance(rows, ColumnRows): # одно значение на все строки - словарный столбец из одного элемента
+        codes = array("i", [0]) * len(rows)
+        table['rows'] = ColumnRows(rows.columns + [DictionaryColumn(str, codes, [path])], len(rows))
+    else:
+        rows = rows if isinstance(rows, list) else [list(row) for row in rows]
+        for row in rows:
+            row.append(path) # при передаче из процесса pickle сохраняет одну строку path на все строки
+        table['rows'] = rows
+    table['header'] = table['header'] + [source_column]
+    if table.get('column_types'):
+        table['column_types'] = {**table['column_types'], source_column: str}
@@ -0,0 +1,199 @@
+import weakref
+
+# хранилища строк - списки строк и ColumnRows, которые могут быть общими у нескольких таблиц
+# (concat, split, get_rows_by_number). Номера изменений ведутся только для хранилищ, на которые
+# ссылается хотя бы одна отметка (RowsStamp): отметка держит хранилище, поэтому его id не может
+# достаться другому объекту, а запись удаляется вместе с последней отметкой.
+_watched = {} # id хранилища -> [число отметок, {номер столбца (None - любой): номер изменения}]
+
+
+class RowsStamp:
+    """
+    Отметка состояния строк: их хранилища и номера изменений на момент построения
+    индекса или статистики частей. Изменение значений через любую таблицу, разделяющую
+    эти хранилища (invalidate_index), делает отметку устаревшей.
+
+    Args:
+        rows: Строки таблицы.
+        col_index (int, optional): Столбец, изменения которого отслеживаются (None - любой столбец).
+    """
+    __slots__ = ("storages", "versions", "col_index", "__weakref__")
+
+    def __init__(self, rows, col_index=None):
+        self.storages = _storages(rows)
+        self.col_index = col_index
+        versions = []
+        for storage in self.storages:
+            entry = _watched.get(id(storage))
+            if entry is None:
+                entry = _watched[id(storage)] = [0, {}]
+            entry[0] += 1
+            versions.append(entry[1].get(col_index, 0))
+        self.versions = tuple(versions)
+        weakref.finalize(self, _release, [id(storage) for storage in self.storages])
+
+    def is_current(self, rows):
+        """True, если строки лежат в тех же хранилищах и значения в них не менялись."""
+        if self.versions is None: # восстановленная из pickle отметка
+            return False
+        storages = _storages(rows)
+        if len(storages) != len(self.storages) or any(a is not b for a, b in zip(storages, self.storages)):
+            return False
+        return all(_watched[id(storage)][1].get(self.col_index, 0) == version
+                   for storage, version in zip(storages, self.versions))
+
+    def __reduce__(self):
+        # хранилища не сериализуются: восстановленная отметка всегда устаревшая
+        return _stale_stamp, ()
+
+    def __repr__(self):
+        return f"RowsStamp({len(self.storages)} storages)"
+
+
+class HashIndex:
+    """
+    Хеш-индекс по одному столбцу таблицы: значение -> список номеров строк.
+
+    Индекс хранится в table['indexes'][номер столбца] и переиспользуется
+    между вызовами get_rows_by_index. Запоминает количество строк и отметку
+    хранилищ (RowsStamp), по которым построен, чтобы заметить изменение строк.
+    """
+    __slots__ = ("positions", "length", "stamp")
+
+    def __init__(self, positions, length, stamp=None):
+        self.positions = positions # значение -> возрастающий список номеров строк
+        self.length = length # количество строк в таблице на момент построения
+        self.stamp = stamp # отметка хранилищ строк (RowsStamp) на момент построения
+
+    @classmethod
+    def build(cls, rows, col_index):
+        """
+        Строит индекс за один проход по столбцу.
+
+        Args:
+            rows: Строки таблицы (список строк или ColumnRows).
+            col_index (int): Индекс столбца.
+
+        Returns:
+            HashIndex: Построенный индекс.
+
+        Raises:
+            TypeError: Если в столбце есть нехешируемые значения.
+        """
+        values = rows.get_column(col_index) if hasattr(rows, 'get_column') else (row[col_index] for row in rows)
+        positions = {}
+        for i, value in enumerate(values):
+            bucket = positions.get(value)
+            if bucket is None:
+                positions[value] = [i]
+            else:
+                bucket.append(i)
+        return cls(positions, len(rows), RowsStamp(rows, col_index))
+
+    def is_current(self, rows, col_index):
+        """
+        True, если индекс соответствует строкам: их количество, хранилища и номера изменений не поменялись.
+
+        Args:
+            rows: Строки таблицы.
+            col_index (int): Индекс столбца.
+        """
+        return (self.length == len(rows) and self.stamp is not None and self.stamp.col_index == col_index
+                and self.stamp.is_current(rows))
+
+    def lookup(self, values):
+        """
+        Возвращает номера строк, в которых столбец равен одному из values, в порядке строк.
+
+        Args:
+            values (iterable): Искомые значения.
+
+        Returns:
+            list: Возрастающий список номеров строк.
+        """
+        found = []
+        seen = set()
+        for value in values:
+            try:
+                if value in seen: # повторяющиеся значения не должны дублировать строки
+                    continue
+                seen.add(value)
+            except TypeError: # нехешируемое значение не может быть ключом индекса
+                continue
+            found.extend(self.positions.get(value, ()))
+        found.sort()
+        return found
+
+    def __reduce__(self):
+        # отметка не сериализуется: загруженный индекс перестроится при первом поиске
+        return HashIndex, (self.positions, self.length)
+
+    def __repr__(self):
+        return f"HashIndex({len(self.positions)} keys, {self.length} rows)"
+
+
+def invalidate_index(table, col_index):
+    """
+    Сбрасывает индекс столбца после изменения его значений (он перестроится при следующем поиске).
+    Статистика частей (table['stats']) после изменения значений тоже неверна и удаляется.
+
+    Args:
+        table (dict): Таблица с ключами.
+        col_index (int): Индекс столбца.
+    """
+    table.pop('stats', None)
+    indexes = table.get('indexes')
+    if indexes and col_index in indexes:
+        indexes[col_index] = None
+    # строки могут быть общими с другими таблицами: их индексы и статистика заметят новый номер изменения
+    touch_rows(table['rows'], col_index)
+
+def touch_rows(rows, col_index):
+    """
+    Увеличивает номера изменений хранилищ строк (столбца col_index и "любого столбца").
+
+    Args:
+        rows: Строки, значения которых изменены.
+        col_index (int): Индекс изменённого столбца.
+    """
+    for storage in _storages(rows):
+        touch_storage(storage, col_index)
+
+def touch_storage(storage, col_index):
+    """Увеличивает номера изменений одного хранилища (например, копий строк в TableView)."""
+    entry = _watched.get(id(storage))
+    if entry is not None: # за хранилищем без отметок следить незачем
+        versions = entry[1]
+        versions[col_index] = versions.get(col_index, 0) + 1
+        versions[None] = versions.get(None, 0) + 1
+
+def _storages(rows):
+    """
+    Хранилища, в которых лежат строки: сегменты ChunkedRows и родительские строки TableView
+    раскрываются до списков и ColumnRows (представление само хранит скопированные строки).
+    """
+    if hasattr(rows, 'segments'):
+        storages = []
+        for segment in rows.segments:
+            storages.extend(_storages(segment))
+    elif hasattr(rows, 'table') and hasattr(rows, 'positions'):
+        storages = [rows, *_storages(rows.table['rows'])]
+    else:
+        return [rows]
+    unique = {id(storage): storage for storage in storages} # сегмент может повторяться (concat(t, t))
+    return list(unique.values())
+
+def _release(ids):
+    """Снимает отметку с хранилищ (вызывается, когда RowsStamp удаляется)."""
+    for key in ids:
+        entry = _watched.get(key)
+        if entry is not None:
+            entry[0] -= 1
+            if not entry[0]:
+                del _watched[key]
+
+def _stale_stamp():
+    """Отметка без хранилищ: такая отметка никогда не совпадает со строками."""
+    stamp = RowsStamp.__new__(RowsStamp)
+    stamp.storages, stamp.versions, stamp.col_index = (), None, None
+    return stamp
@@ -0,0 +1,209 @@
+import functools
+import inspect
+import os
+import time
+import tracemalloc
+from contextlib import contextmanager
+
+# Инструментирование операций пакета. По умолчанию выключено: обёртка каждой
+# функции проверяет один флаг и сразу вызывает исходную функцию.
+_enabled = False
+_trace_memory = False
+_depth = 0 # глубина вложенных инструментированных вызовов (память меряется только у внешнего)
+_stats = {} # имя операции -> накопленная статистика
+_collectors = [] # статистики активных блоков instrument()
+_callbacks = []
+
+def _new_stats():
+    return {"calls": 0, "errors": 0, "seconds": 0.0, "rows": 0, "bytes": 0, "peak_bytes": 0}
+
+def enable(trace_memory=False):
+    """
+    Включает сбор статистики.
+
+    Args:
+        trace_memory (bool): Если True, для внешних вызовов через tracemalloc измеряется пиковое выделение памяти
+                             (заметно замедляет работу).
+    """
+    global _enabled, _trace_memory
+    _enabled = True
+    _trace_memory = trace_memory
+
+def disable():
+    """Выключает сбор статистики."""
+    global _enabled, _trace_memory
+    _enabled = False
+    _trace_memory = False
+
+def is_enabled():
+    """Возвращает True, если сбор статистики включён."""
+    return _enabled
+
+def get_stats():
+    """
+    Возвращает накопленную статистику.
+
+    Returns:
+        dict: Имя операции (например, 'csv_module.load_table') -> словарь с ключами
+              calls, errors, seconds, rows, bytes, peak_bytes.
+    """
+    return {name: dict(stats) for name, stats in _stats.items()}
+
+def reset_stats():
+    """Очищает накопленную статистику."""
+    _stats.clear()
+
+def add_callback(callback):
+    """
+    Добавляет функцию, которая вызывается после каждой инструментированной операции.
+
+    Args:
+        callback (callable): Принимает словарь события с ключами name, seconds, rows, bytes, peak_bytes, error.
+    """
+    _callbacks.append(callback)
+
+def remove_callback(callback):
+    """
+    Удаляет функцию, добавленную через add_callback.
+
+    Raises:
+        ValueError: Функция не была добавлена.
+    """
+    _callbacks.remove(callback)
+
+@contextmanager
+def instrument(trace_memory=False):
+    """
+    Включает сбор статистики внутри блока with и возвращает статистику только этого блока.
+
+    Пример:
+        with instrument() as stats:
+            load_csv("data.csv", auto_detect_types=True)
+        print(stats['csv_module.load_table']['seconds'])
+
+    Args:
+        trace_memory (bool): Измерять пиковое выделение памяти.
+
+    Yields:
+        dict: Статистика операций блока (заполняется по ходу выполнения).
+    """
+    global _enabled, _trace_memory
+    previous = _enabled, _trace_memory
+    collector = {}
+    _collectors.append(collector)
+    _enabled = True
+    _trace_memory = trace_memory or _trace_memory
+    try:
+        yield collector
+    finally:
+        _collectors.remove(collector)
+        _enabled, _trace_memory = previous
+
+def instrumented(func=None, *, file_io=False):
+    """
+    Декоратор функций пакета: при включённой статистике учитывает вызовы, время,
+    количество строк, размер файла и пиковое выделение памяти.
+
+    Args:
+        func (callable): Декорируемая функция.
+        file_io (bool): Функция читает или пишет файл, путь к которому - первый строковый аргумент
+                        (его размер учитывается в bytes).
+    """
+    if func is None:
+        return functools.partial(instrumented, file_io=file_io)
+    name = f"{func.__module__.rsplit('.', 1)[-1]}.{func.__name__}"
+
+    @functools.wraps(func)
+    def wrapper(*args, **kwargs):
+        if not _enabled:
+            return func(*args, **kwargs)
+        return _call(name, func, args if file_io else (), args, kwargs)
+    return wrapper
+
+def _call(name, func, path_args, args, kwargs):
+    """Выполняет func и записывает статистику вызова."""
+    global _depth
+    track_memory = _trace_memory and _depth == 0
+    started_tracing = False
+    if track_memory:
+        if not tracemalloc.is_tracing():
+            tracemalloc.start()
+            started_tracing = True
+        tracemalloc.reset_peak()
+        memory_before = tracemalloc.get_traced_memory()[0]
+    _depth += 1
+    error = None
+    start = time.perf_counter()
+    try:
+        result = func(*args, **kwargs)
+    except BaseException as e:
+        error = e
+        raise
+    finally:
+        seconds = time.perf_counter() - start
+        _depth -= 1
+        peak = 0
+        if track_memory:
+            peak = max(0, tracemalloc.get_traced_memory()[1] - memory_before)
+            if started_tracing:
+                tracemalloc.stop()
+        if error is not None:
+            _record(name, seconds, 0, _file_bytes(path_args), peak, error)
+    if inspect.isgenerator(result): # потоковое чтение: время и строки учитываются по мере чтения частей
+        return _instrumented_generator(name, result, seconds, path_args)
+    _record(name, seconds, _count_rows(args, result), _file_bytes(path_args), peak, None)
+    return result
+
+def _instrumented_generator(name, generator, seconds, path_args):
+    """Оборачивает генератор частей таблицы: время и строки записываются, когда он исчерпан или закрыт."""
+    rows = 0
+    try:
+        while True:
+            start = time.perf_counter()
+            try:
+                chunk = next(generator)
+            except StopIteration:
+                seconds += time.perf_counter() - start
+                break
+            seconds += time.perf_counter() - start
+            rows += _count_rows((), chunk)
+            yield chunk
+    finally:
+        generator.close()
+        _record(name, seconds, rows, _file_bytes(path_args), 0, None)
+
+def _count_rows(args, result):
+    """Количество строк, обработанных операцией: по результату, а если он не таблица - по первой таблице в аргументах."""
+    for value in (result, *args):
+        if isinstance(value, dict) and 'rows' in value:
+            return len(value['rows'])
+        if isinstance(value, tuple) and value and all(isinstance(v, dict) and 'rows' in v for v in value):
+            return sum(len(v['rows']) for v in value)
+    return 0
+
+def _file_bytes(path_args):
+    """Размер файла, с которым работала операция (первый аргумент-путь)."""
+    for value in path_args:
+        if isinstance(value, (str, os.PathLike)):
+            try:
+                return os.path.getsize(value)
+            except OSError:
+                return 0
+    return 0
+
+def _record(name, seconds, rows, file_bytes, peak, error):
+    """Добавляет вызов в общую статистику, статистики блоков instrument() и передаёт событие обработчикам."""
+    for stats_by_name in (_stats, *_collectors):
+        stats = stats_by_name.get(name)
+        if stats is None:
+            stats = stats_by_name[name] = _new_stats()
+        stats['calls'] += 1
+        stats['errors'] += error is not None
+        stats['seconds'] += seconds
+        stats['rows'] += rows
+        stats['bytes'] += file_bytes
+        stats['peak_bytes'] = max(stats['peak_bytes'], peak)
+    if _callbacks:
+        event = {"name": name, "seconds": seconds, "rows": rows, "bytes": file_bytes, "peak_bytes": peak, "error": error}
+        for callback in list(_callbacks):
+            callback(event)
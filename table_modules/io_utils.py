@@ -0,0 +1,274 @@
+import bz2
+import gzip
+import io
+import lzma
+import os
+import queue
+import tempfile
+import threading
+from contextlib import contextmanager
+
+# Поддерживаемые способы сжатия: расширения файлов и первые байты (magic bytes) сжатых данных.
+_EXTENSIONS = {".gz": "gzip", ".gzip": "gzip", ".bz2": "bz2", ".xz": "lzma", ".lzma": "lzma"}
+_MAGIC = {"gzip": b"\x1f\x8b", "bz2": b"BZh", "lzma": b"\xfd7zXZ\x00"}
+_DEFAULT_LEVELS = {"gzip": 6, "bz2": 9, "lzma": 6}
+_CHUNK_SIZE = 1 << 20 # размер части, которую фоновый поток сжимает или распаковывает за раз
+_QUEUE_CHUNKS = 4 # сколько частей может ждать в очереди между потоками
+
+def detect_compression(file_path, compression="infer", reading=True):
+    """
+    Определяет способ сжатия файла.
+
+    Args:
+        file_path (str): Путь к файлу.
+        compression (str, optional): "infer" - по расширению, а при чтении файла с незнакомым
+                                     расширением - по первым байтам; None - без сжатия;
+                                     "gzip", "bz2" или "lzma" - явно заданный способ.
+        reading (bool): Файл читается (можно проверить его содержимое).
+
+    Returns:
+        str or None: "gzip", "bz2", "lzma" или None.
+
+    Raises:
+        ValueError: Неизвестный способ сжатия.
+    """
+    if compression != "infer":
+        if compression is not None and compression not in _MAGIC:
+            raise ValueError(f"Неизвестный способ сжатия: {compression}")
+        return compression
+    extension = os.path.splitext(os.fspath(file_path))[1].lower()
+    if extension in _EXTENSIONS:
+        return _EXTENSIONS[extension]
+    if reading:
+        try:
+            with open(file_path, mode="rb") as file:
+                start = file.read(6)
+        except OSError:
+            return None
+        for name, magic in _MAGIC.items():
+            if start.startswith(magic):
+                return name
+    return None
+
+def open_input(file_path, mode="r", compression="infer", background=False, **open_kwargs):
+    """
+    Открывает файл для чтения, распаковывая его на лету, если он сжат.
+
+    Данные распаковываются потоково, частями. При background=True чтение и распаковка
+    выполняются в отдельном потоке, а разбор прочитанного - в вызывающем, так что
+    они идут одновременно (zlib, bz2 и lzma отпускают GIL во время работы).
+
+    Args:
+        file_path (str): Путь к файлу.
+        mode (str): "r" (текст) или "rb".
+        compression (str, optional): См. detect_compression.
+        background (bool): Читать и распаковывать в фоновом потоке.
+        **open_kwargs: Параметры текстового режима (encoding, newline).
+
+    Returns:
+        file: Открытый файл (закрывается через with).
+    """
+    codec = detect_compression(file_path, compression)
+    if codec is None and not background:
+        return open(file_path, mode, **open_kwargs)
+    binary = open(file_path, "rb") if codec is None else _CODECS[codec].open(file_path, "rb")
+    if background:
+        binary = io.BufferedReader(_BackgroundReader(binary), buffer_size=_CHUNK_SIZE)
+    if "b" in mode:
+        return binary
+    return io.TextIOWrapper(binary, **open_kwargs)
+
+@contextmanager
+def atomic_write(file_path, mode="w", compression=None, level=None, background=False, **open_kwargs):
+    """
+    Открывает временный файл рядом с file_path и после успешной записи заменяет им file_path.
+
+    Замена выполняется через os.replace, поэтому другие процессы видят либо старый
+    файл целиком, либо новый целиком. При ошибке временный файл удаляется, а
+    исходный файл не меняется.
+
+    Args:
+        file_path (str): Путь к итоговому файлу.
+        mode (str): Режим открытия ("w" или "wb").
+        compression (str, optional): Способ сжатия (см. detect_compression; "infer" - по расширению).
+        level (int, optional): Уровень сжатия (по умолчанию 6 для gzip и lzma, 9 для bz2).
+        background (bool): Сжимать в фоновом потоке, пока вызывающий код готовит следующие данные.
+        **open_kwargs: Параметры open (encoding, newline).
+
+    Yields:
+        file: Открытый временный файл.
+    """
+    codec = detect_compression(file_path, compression, reading=False)
+    directory, name = os.path.split(os.path.abspath(file_path))
+    fd, temp_path = tempfile.mkstemp(dir=directory, prefix=f".{name}.", suffix=".tmp")
+    try:
+        if codec is None and not background:
+            with open(fd, mode, **open_kwargs) as file:
+                yield file
+                file.flush()
+                os.fsync(file.fileno())
+        else:
+            with open(fd, "wb") as raw:
+                # слои: [текст] -> [фоновый поток] -> [сжатие] -> временный файл;
+                # закрытие верхнего слоя закрывает нижние, кроме самого файла
+                binary = raw if codec is None else _compressor(codec, raw, level)
+                if background:
+                    binary = io.BufferedWriter(_BackgroundWriter(binary, close_target=codec is not None),
+                                               buffer_size=_CHUNK_SIZE)
+                file = binary if "b" in mode else io.TextIOWrapper(binary, **open_kwargs)
+                try:
+                    yield file
+                finally:
+                    file.close()
+                raw.flush()
+                os.fsync(raw.fileno())
+        if os.path.exists(file_path): # сохраняем права доступа заменяемого файла
+            os.chmod(temp_path, os.stat(file_path).st_mode)
+        else:
+            umask = os.umask(0)
+            os.umask(umask)
+            os.chmod(temp_path, 0o666 & ~umask)
+        os.replace(temp_path, file_path)
+    except BaseException:
+        try:
+            os.remove(temp_path)
+        except OSError:
+            pass
+        raise
+
+def open_append(file_path, mode="a", compression="infer", level=None, **open_kwargs):
+    """
+    Открывает файл для дописывания в конец. В сжатый файл дописывается новый сжатый поток
+    (gzip, bz2 и xz допускают несколько потоков подряд и читают их как один).
+
+    Args:
+        file_path (str): Путь к файлу.
+        mode (str): "a" (текст) или "ab".
+        compression (str, optional): См. detect_compression.
+        level (int, optional): Уровень сжатия.
+        **open_kwargs: Параметры текстового режима (encoding, newline).
+
+    Returns:
+        file: Открытый файл.
+    """
+    codec = detect_compression(file_path, compression)
+    if codec is None:
+        return open(file_path, mode, **open_kwargs)
+    level = _DEFAULT_LEVELS[codec] if level is None else level
+    if codec == "lzma":
+        return lzma.open(file_path, mode if "b" in mode else "at", preset=level, **open_kwargs)
+    return _CODECS[codec].open(file_path, mode if "b" in mode else "at", compresslevel=level, **open_kwargs)
+
+def _compressor(codec, raw, level):
+    """Файловый объект, который сжимает записываемые данные и пишет их в raw (raw при закрытии не закрывается)."""
+    level = _DEFAULT_LEVELS[codec] if level is None else level
+    if codec == "gzip":
+        return gzip.GzipFile(fileobj=raw, mode="wb", compresslevel=level)
+    if codec == "bz2":
+        return bz2.BZ2File(raw, mode="wb", compresslevel=level)
+    return lzma.LZMAFile(raw, mode="wb", preset=level)
+
+_CODECS = {"gzip": gzip, "bz2": bz2, "lzma": lzma}
+
+
+class _BackgroundReader(io.RawIOBase):
+    """Читает (и распаковывает) source частями в фоновом потоке; вызывающий поток забирает готовые части."""
+
+    def __init__(self, source):
+        self._source = source
+        self._queue = queue.Queue(_QUEUE_CHUNKS)
+        self._stop = threading.Event()
+        self._chunk = memoryview(b"")
+        self._eof = False
+        self._thread = threading.Thread(target=self._run, name="table-io-reader", daemon=True)
+        self._thread.start()
+
+    def _run(self):
+        try:
+            while not self._stop.is_set():
+                chunk = self._source.read(_CHUNK_SIZE)
+                self._put(chunk)
+                if not chunk:
+                    return
+        except BaseException as e: # ошибку чтения передаём вызывающему потоку
+            self._put(e)
+
+    def _put(self, item):
+        while not self._stop.is_set():
+            try:
+                self._queue.put(item, timeout=0.1)
+                return
+            except queue.Full:
+                continue
+
+    def readable(self):
+        return True
+
+    def readinto(self, buffer):
+        if not self._chunk:
+            if self._eof:
+                return 0
+            item = self._queue.get()
+            if isinstance(item, BaseException):
+                raise item
+            if not item:
+                self._eof = True
+                return 0
+            self._chunk = memoryview(item)
+        size = min(len(buffer), len(self._chunk))
+        buffer[:size] = self._chunk[:size]
+        self._chunk = self._chunk[size:]
+        return size
+
+    def close(self):
+        if not self.closed:
+            self._stop.set()
+            self._thread.join()
+            self._source.close()
+        super().close()
+
+
+class _BackgroundWriter(io.RawIOBase):
+    """Передаёт записываемые данные фоновому потоку, который сжимает их и пишет в target."""
+
+    def __init__(self, target, close_target=True):
+        self._target = target
+        self._close_target = close_target
+        self._queue = queue.Queue(_QUEUE_CHUNKS)
+        self._error = None
+        self._thread = threading.Thread(target=self._run, name="table-io-writer", daemon=True)
+        self._thread.start()
+
+    def _run(self):
+        while True:
+            item = self._queue.get()
+            if item is None:
+                return
+            if self._error is None:
+                try:
+                    self._target.write(item)
+                except BaseException as e: # ошибку записи передаём вызывающему потоку
+                    self._error = e
+
+    def writable(self):
+        return True
+
+    def write(self, data):
+        if self._error is not None:
+            raise self._error
+        self._queue.put(bytes(data))
+        return len(data)
+
+    def close(self):
+        if not self.closed:
+            self._queue.put(None)
+            self._thread.join()
+            try:
+                if self._close_target:
+                    self._target.close()
+                else:
+                    self._target.flush()
+            finally:
+                super().close()
+            if self._error is not None:
+                raise self._error
@@ -0,0 +1,217 @@
+from .instrumentation import instrumented
+from .table_operations import get_values
+
+_HOW = ("inner", "left", "outer")
+_STRATEGIES = ("auto", "hash", "merge")
+
+@instrumented
+def join(left, right, on, how="inner", strategy="auto", suffixes=("_left", "_right")):
+    """
+    Соединяет две таблицы по значениям ключевых столбцов.
+
+    Стратегии:
+        "hash" - хеш-таблица строится по меньшей таблице, большая просматривается один раз: O(n + m).
+        "merge" - сортировка слиянием: обе таблицы проходятся по возрастанию ключа без хеш-таблицы.
+                  Если таблицы уже отсортированы по ключу, сортировка не выполняется.
+        "auto" - "merge", если обе таблицы уже отсортированы по ключу, иначе "hash" (и "hash", если ключи сторон несравнимы).
+
+    При стратегии "hash" и отсортированных таблицах строки результата идут в порядке
+    строк левой таблицы (для одной левой строки - в порядке правых), несовпавшие строки
+    правой таблицы (how="outer") - в конце. При сортировке слиянием - по возрастанию ключа.
+    Значения None в ключе ни с чем не совпадают.
+
+    Args:
+        left (dict): Левая таблица.
+        right (dict): Правая таблица.
+        on (int, str or list): Имя (или индекс) ключевого столбца, либо список имён; столбцы с такими
+                               именами должны быть в обеих таблицах.
+        how (str): "inner" - только совпавшие строки, "left" - все строки левой таблицы,
+                   "outer" - все строки обеих таблиц. Недостающие значения - None.
+        strategy (str): "auto", "hash" или "merge".
+        suffixes (tuple): Суффиксы для одноимённых неключевых столбцов левой и правой таблиц.
+
+    Returns:
+        dict: Таблица с ключами 'header' и 'rows' (и 'column_types', если они были у исходных таблиц).
+              Заголовок: столбцы левой таблицы, затем неключевые столбцы правой.
+
+    Raises:
+        ValueError: Неизвестный how или strategy, ключевой столбец не найден или ключи нельзя сравнить.
+    """
+    if how not in _HOW:
+        raise ValueError(f"Неизвестный тип соединения: {how}")
+    if strategy not in _STRATEGIES:
+        raise ValueError(f"Неизвестная стратегия соединения: {strategy}")
+
+    names = [on] if isinstance(on, (int, str)) else list(on)
+    names = [left['header'][name] if isinstance(name, int) else name for name in names]
+    for name in names:
+        if name not in left['header'] or name not in right['header']:
+            raise ValueError(f"Ключевой столбец '{name}' должен быть в обеих таблицах.")
+    left_keys = _keys(left, names)
+    right_keys = _keys(right, names)
+
+    auto = strategy == "auto"
+    if auto:
+        strategy = "merge" if _is_sorted(left_keys) and _is_sorted(right_keys) else "hash"
+    if strategy == "hash":
+        pairs = _hash_pairs(left_keys, right_keys, how)
+    else:
+        try:
+            pairs = _merge_pairs(left_keys, right_keys, how)
+        except TypeError as e:
+            if not auto:
+                raise ValueError(f"Ключи нельзя упорядочить для сортировки слиянием: {e}")
+            # каждая сторона упорядочена, но ключи сторон несравнимы (например, int и str) - хеш-соединение
+            pairs = _hash_pairs(left_keys, right_keys, how)
+
+    header, right_columns = _output_header(left['header'], right['header'], names, suffixes)
+    right_key_columns = [right['header'].index(name) for name in names]
+    left_key_columns = [left['header'].index(name) for name in names]
+    left_rows, right_rows = left['rows'], right['rows']
+    left_width, missing_right = len(left['header']), [None] * len(right_columns)
+    rows = []
+    for left_position, right_position in pairs:
+        if left_position is None: # строка только из правой таблицы: ключ берём из неё
+            right_row = right_rows[right_position]
+            row = [None] * left_width
+            for left_column, right_column in zip(left_key_columns, right_key_columns):
+                row[left_column] = right_row[right_column]
+            row.extend(right_row[i] for i in right_columns)
+        else:
+            row = list(left_rows[left_position])
+            if right_position is None:
+                row.extend(missing_right)
+            else:
+                right_row = right_rows[right_position]
+                row.extend(right_row[i] for i in right_columns)
+        rows.append(row)
+
+    table = {"header": header, "rows": rows}
+    if left.get('column_types') or right.get('column_types'):
+        left_types, right_types = left.get('column_types') or {}, right.get('column_types') or {}
+        types = [left_types.get(name, str) for name in left['header']]
+        types += [right_types.get(right['header'][i], str) for i in right_columns]
+        table['column_types'] = dict(zip(header, types))
+    return table
+
+def _keys(table, names):
+    """Ключ каждой строки: значение столбца или кортеж значений для нескольких столбцов."""
+    columns = [get_values(table, table['header'].index(name)) for name in names]
+    if len(columns) == 1:
+        return columns[0]
+    return [None if None in key else key for key in zip(*columns)]
+
+def _is_sorted(keys):
+    """True, если ключи (без None) идут по неубыванию."""
+    values = [key for key in keys if key is not None]
+    try:
+        return all(a <= b for a, b in zip(values, values[1:]))
+    except TypeError:
+        return False
+
+def _output_header(left_header, right_header, names, suffixes):
+    """
+    Заголовок результата и индексы столбцов правой таблицы, которые в него входят.
+
+    Одноимённые неключевые столбцы получают суффиксы; если имя с суффиксом тоже занято,
+    к нему добавляется номер. Результат зависит только от заголовков.
+    """
+    right_columns = [i for i, name in enumerate(right_header) if name not in names]
+    right_names = [right_header[i] for i in right_columns]
+    collisions = set(left_header) & set(right_names) - set(names)
+    header = [name + suffixes[0] if name in collisions else name for name in left_header]
+    header += [name + suffixes[1] if name in collisions else name for name in right_names]
+    used = set()
+    for i, name in enumerate(header):
+        candidate, number = name, 2
+        while candidate in used:
+            candidate, number = f"{name}_{number}", number + 1
+        header[i] = candidate
+        used.add(candidate)
+    return header, right_columns
+
+def _hash_pairs(left_keys, right_keys, how):
+    """Пары (номер левой строки, номер правой строки); хеш-таблица строится по меньшей стороне."""
+    pairs = []
+    if len(right_keys) <= len(left_keys):
+        table = {}
+        for position, key in enumerate(right_keys):
+            if key is not None:
+                table.setdefault(key, []).append(position)
+        matched_right = set() if how == "outer" else None
+        for left_position, key in enumerate(left_keys):
+            matches = table.get(key) if key is not None else None
+            if matches:
+                pairs.extend((left_position, right_position) for right_position in matches)
+                if matched_right is not None:
+                    matched_right.update(matches)
+            elif how != "inner":
+                pairs.append((left_position, None))
+        if matched_right is not None:
+            pairs.extend((None, position) for position in range(len(right_keys)) if position not in matched_right)
+        return pairs
+
+    # левая таблица меньше: хеш-таблица по ней, совпадения собираются для каждой левой строки
+    table = {}
+    for position, key in enumerate(left_keys):
+        if key is not None:
+            table.setdefault(key, []).append(position)
+    matches = [[] for _ in left_keys]
+    unmatched_right = []
+    for right_position, key in enumerate(right_keys):
+        left_positions = table.get(key) if key is not None else None
+        if left_positions:
+            for left_position in left_positions:
+                matches[left_position].append(right_position)
+        elif how == "outer":
+            unmatched_right.append(right_position)
+    for left_position, right_positions in enumerate(matches):
+        if right_positions:
+            pairs.extend((left_position, right_position) for right_position in right_positions)
+        elif how != "inner":
+            pairs.append((left_position, None))
+    pairs.extend((None, position) for position in unmatched_right)
+    return pairs
+
+def _merge_pairs(left_keys, right_keys, how):
+    """Пары (номер левой строки, номер правой строки) сортировкой слиянием по возрастанию ключа."""
+    left_order = _sorted_positions(left_keys)
+    right_order = _sorted_positions(right_keys)
+    pairs = []
+    i = j = 0
+    while i < len(left_order) and j < len(right_order):
+        left_key, right_key = left_keys[left_order[i]], right_keys[right_order[j]]
+        if left_key < right_key:
+            if how != "inner":
+                pairs.append((left_order[i], None))
+            i += 1
+        elif right_key < left_key:
+            if how == "outer":
+                pairs.append((None, right_order[j]))
+            j += 1
+        else: # группы равных ключей с обеих сторон соединяются каждая с каждой
+            i_end, j_end = i, j
+            while i_end < len(left_order) and left_keys[left_order[i_end]] == left_key:
+                i_end += 1
+            while j_end < len(right_order) and right_keys[right_order[j_end]] == right_key:
+                j_end += 1
+            for left_position in left_order[i:i_end]:
+                pairs.extend((left_position, right_position) for right_position in right_order[j:j_end])
+            i, j = i_end, j_end
+    if how != "inner":
+        pairs.extend((position, None) for position in left_order[i:])
+    if how == "outer":
+        pairs.extend((None, position) for position in right_order[j:])
+    # строки с ключом None ни с чем не совпадают
+    if how != "inner":
+        pairs.extend((position, None) for position, key in enumerate(left_keys) if key is None)
+    if how == "outer":
+        pairs.extend((None, position) for position, key in enumerate(right_keys) if key is None)
+    return pairs
+
+def _sorted_positions(keys):
+    """Номера строк с ключом не None по возрастанию ключа (без сортировки, если ключи уже упорядочены)."""
+    positions = [position for position, key in enumerate(keys) if key is not None]
+    if _is_sorted(keys):
+        return positions
+    return sorted(positions, key=keys.__getitem__) # устойчивая сортировка
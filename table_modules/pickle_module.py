@@ -1,13 +1,37 @@
+import os
 import pickle
+from .chunked import ChunkedRows
+from .instrumentation import instrumented
+from .io_utils import atomic_write, open_append, open_input
 from .table_operations import auto_detect_column_types
+from .zone_maps import compute_stats, stamp_stats, stats_match, without_stamp
 
-def load_table(file_path, auto_detect_types=False):
+FORMAT = "table_modules.pickle"
+VERSION = 2 # версия 1 - одна таблица целиком (pickle.dump(table)), без заголовочной записи
+PROTOCOL = 5 # буферы столбцов (array) пишутся отдельно от pickle (out-of-band), без копирования
+
+@instrumented(file_io=True)
+def load_table(file_path, auto_detect_types=False, sample_rows=None, compression="infer", background=False):
     """
     Загружает таблицу из Pickle файла.
 
+    Файл начинается с небольшой заголовочной записи (заголовок, типы столбцов, статистика),
+    за которой идут записи со строками. Буферы столбцовых таблиц читаются прямо
+    в память и используются столбцами без копирования. Файлы старого формата
+    (одна таблица, записанная pickle.dump) читаются как раньше.
+
+    Если в файл дописывались строки (append_table), он состоит из нескольких таблиц
+    подряд, и их строки склеиваются в одну таблицу.
+
     Args:
         file_path (str): Путь к Pickle файлу.
-        auto_detect_types (bool): Если True, автоматически определяет типы столбцов.
+        auto_detect_types (bool): Если True, 'column_types' заполняется типами столбцов. Типы, сохранённые
+                                  в файле (save_table), берутся без просмотра строк; иначе они определяются
+                                  по данным.
+        sample_rows (int, optional): Определять типы только по первым sample_rows строкам (если их нет в файле).
+        compression (str, optional): Сжатие файла: "infer" - по расширению (.gz, .bz2, .xz) или первым байтам,
+                                     "gzip", "bz2", "lzma" или None. Сжатый файл распаковывается потоково.
+        background (bool): Если True, файл читается и распаковывается в фоновом потоке.
 
     Returns:
         dict: Таблица с ключами 'header' и 'rows'.
@@ -16,30 +40,200 @@ def load_table(file_path, auto_detect_types=False):
         ValueError: Если возникает ошибка при загрузке файла.
     """
     try:
-        with open(file_path, mode="rb") as file: # (read binary), т.к. Pickle сохраняет данные в бинарном формате.
-            table = pickle.load(file) # восстанавливает объект из бинарного файла.
+        with open_input(file_path, "rb", compression, background) as file: # (read binary), т.к. Pickle сохраняет данные в бинарном формате.
+            first = pickle.load(file) # восстанавливает объект из бинарного файла.
+            if _is_meta(first):
+                table, types, parts = _read_frames(file, first)
+            else: # файл старого формата: первая запись - вся таблица
+                table, types = first, None
+                parts = _read_appended(file, table['header'])
+
+        if parts:
+            table.pop('stats', None) # статистика относится только к первой таблице файла
+            rows = table['rows']
+            if isinstance(rows, list) and all(isinstance(part, list) for part in parts):
+                for part in parts:
+                    rows.extend(part)
+            else:
+                table['rows'] = ChunkedRows([rows, *parts]) # столбцовые части склеиваются без копирования
 
         if auto_detect_types:
-            table['column_types'] = auto_detect_column_types(table)
+            table['column_types'] = dict(types) if types else auto_detect_column_types(table, sample_rows)
+        if table.get('stats') is not None: # статистика действительна, пока строки не изменены
+            table['stats'] = stamp_stats(table['stats'], table)
 
         return table
     except Exception as e:
         raise ValueError(f"Ошибка при загрузке Pickle файла {file_path}: {e}")
 
-def save_table(table, file_path):
+@instrumented(file_io=True)
+def save_table(table, file_path, compression="infer", level=None, background=False, stats=False, detect_types=False):
     """
     Сохраняет таблицу в Pickle-файл.
 
+    Первой записывается заголовочная запись: версия формата, заголовок, типы столбцов
+    и статистика частей; затем строки. Используется pickle протокола 5: буферы
+    столбцов столбцовой таблицы (array) пишутся в файл напрямую, без копирования в pickle.
+
     Args:
         table (dict): Таблица, представленная в виде словаря с ключами.
         file_path (str): Путь к файлу, в который будет сохранена таблица.
+        compression (str, optional): Сжатие: "infer" - по расширению (.gz, .bz2, .xz), "gzip", "bz2", "lzma" или None.
+        level (int, optional): Уровень сжатия (по умолчанию 6 для gzip и lzma, 9 для bz2).
+        background (bool): Если True, данные сжимаются в фоновом потоке, пока pickle сериализует следующие.
+        stats (bool): Если True, в файл вместе с таблицей записывается статистика частей
+                      (table['stats'], см. zone_maps.compute_stats): по ней get_rows_by_index
+                      пропускает части загруженной таблицы, в которых нет искомых значений.
+                      Имеющаяся table['stats'] записывается и без stats=True; если строки
+                      изменились после её вычисления, она вычисляется заново.
+        detect_types (bool): Если True и типы столбцов неизвестны (нет 'column_types', строки не столбцовые),
+                             они определяются при сохранении, чтобы load_table(auto_detect_types=True)
+                             не просматривал строки.
 
     Raises:
         ValueError: Если возникает ошибка при сохранении файла (например, проблемы с доступом к файлу).
     """
     try:
-        with open(file_path, mode='wb') as file: # (write binary)
-            pickle.dump(table, file) # сериализует переданный объект table и записывает его в файл.
+        table_stats = table.get('stats')
+        if stats or (table_stats is not None and not stats_match(table_stats, table)): # устаревшая статистика пересчитывается
+            table_stats = compute_stats(table)
+        if table_stats is not None:
+            table_stats = without_stamp(table_stats)
+        meta = {"format": FORMAT, "version": VERSION, "header": list(table['header']),
+                "column_types": table.get('column_types'), "types": _known_types(table, detect_types),
+                "stats": table_stats, "rows": len(table['rows'])}
+        extra = {key: value for key, value in table.items() if key not in ('header', 'rows', 'column_types', 'stats')}
+        with atomic_write(file_path, mode='wb', compression=compression, level=level, background=background) as file: # (write binary) во временный файл, который затем заменяет исходный
+            pickle.dump(meta, file, protocol=PROTOCOL)
+            _write_rows(file, table['rows'], {"extra": extra})
     except Exception as e:
         raise ValueError(f"Ошибка при сохранении Pickle файла {file_path}: {e}")
-        
+
+@instrumented(file_io=True)
+def append_table(table, file_path):
+    """
+    Дописывает строки таблицы в конец Pickle файла отдельной записью, не перезаписывая файл.
+
+    Файл становится последовательностью таблиц, которую load_table читает как одну таблицу.
+    Заголовок должен совпадать с заголовком таблицы в файле (как в concat); для проверки
+    читается только заголовочная запись (у файлов старого формата - первая таблица).
+    Если файла нет или он пуст, он создаётся как в save_table.
+    В сжатый файл (.gz, .bz2, .xz) запись дописывается новым сжатым потоком.
+
+    Args:
+        table (dict): Таблица с новыми строками.
+        file_path (str): Путь к Pickle файлу.
+
+    Raises:
+        ValueError: Заголовки не совпадают или возникает ошибка при записи файла.
+    """
+    if not os.path.exists(file_path) or os.path.getsize(file_path) == 0:
+        save_table(table, file_path)
+        return
+    try:
+        with open_input(file_path, "rb") as file:
+            first = pickle.load(file)
+        if list(first['header']) != list(table['header']):
+            raise ValueError("Таблицы имеют разные заголовки и не могут быть объединены.")
+        with open_append(file_path, "ab") as file:
+            if _is_meta(first):
+                _write_rows(file, table['rows'], {"header": list(table['header']),
+                                                  "column_types": table.get('column_types'),
+                                                  "types": _known_types(table)})
+            else: # файл старого формата дополняется таблицами, как раньше
+                pickle.dump({"header": list(table['header']), "rows": table['rows']}, file)
+    except Exception as e:
+        raise ValueError(f"Ошибка при дописывании в Pickle файл {file_path}: {e}")
+
+def _is_meta(record):
+    """True, если запись - заголовочная запись файла нового формата."""
+    return isinstance(record, dict) and record.get('format') == FORMAT
+
+def _known_types(table, detect_types=False):
+    """Типы столбцов, известные без просмотра строк ('column_types' или типы столбцовых строк), иначе None."""
+    if table.get('column_types'):
+        return dict(table['column_types'])
+    stored = getattr(table['rows'], 'column_types', None) # столбцовые строки знают свои типы
+    if stored is not None and object not in stored:
+        return dict(zip(table['header'], stored))
+    return auto_detect_column_types(table) if detect_types else None
+
+def _write_rows(file, rows, info):
+    """
+    Записывает строки одной записью: описание (info и размеры буферов), сами буферы и pickle строк.
+
+    Буферы, которые pickle 5 передаёт в buffer_callback (данные столбцов), пишутся
+    в файл как есть; в pickle строк остаются только ссылки на них по порядку.
+    """
+    buffers = []
+    payload = pickle.dumps(rows, protocol=PROTOCOL, buffer_callback=buffers.append)
+    views = [buffer.raw() for buffer in buffers]
+    pickle.dump({**info, "buffers": [view.nbytes for view in views]}, file, protocol=PROTOCOL)
+    for view in views:
+        file.write(view)
+    file.write(payload)
+
+def _read_rows(file):
+    """Читает запись со строками (см. _write_rows). Возвращает (описание, строки) или None в конце файла."""
+    try:
+        info = pickle.load(file)
+    except EOFError:
+        return None
+    buffers = [_read_exact(file, size) for size in info['buffers']]
+    return info, pickle.load(file, buffers=buffers)
+
+def _read_exact(file, size):
+    """Читает ровно size байт в новый bytearray (без промежуточных копий)."""
+    buffer = bytearray(size)
+    view = memoryview(buffer)
+    position = 0
+    while position < size:
+        count = file.readinto(view[position:])
+        if not count:
+            raise EOFError("файл обрывается внутри буфера столбца")
+        position += count
+    return buffer
+
+def _read_frames(file, meta):
+    """
+    Читает записи файла нового формата после заголовочной.
+
+    Returns:
+        tuple: (таблица, типы столбцов из файла или None, строки дописанных частей)
+    """
+    if meta['version'] > VERSION:
+        raise ValueError(f"неподдерживаемая версия формата {meta['version']}")
+    header = meta['header']
+    info, rows = _read_rows(file)
+    table = {"header": header, "rows": rows}
+    if meta['column_types'] is not None:
+        table['column_types'] = meta['column_types']
+    if meta['stats'] is not None:
+        table['stats'] = meta['stats']
+    table.update(info.get('extra', {}))
+    types = meta['types']
+    parts = []
+    while True:
+        record = _read_rows(file)
+        if record is None:
+            return table, types, parts
+        info, part = record
+        if list(info['header']) != list(header):
+            raise ValueError("Таблицы имеют разные заголовки и не могут быть объединены.")
+        if info.get('types') != types: # типы дописанных строк не известны или другие - определяются по данным
+            types = None
+        if info.get('column_types') != table.get('column_types'):
+            table.pop('column_types', None)
+        parts.append(part)
+
+def _read_appended(file, header):
+    """Читает дописанные после первой таблицы части. Возвращает список их строк."""
+    parts = []
+    while True:
+        try:
+            part = pickle.load(file)
+        except EOFError:
+            return parts
+        if list(part['header']) != list(header):
+            raise ValueError("Таблицы имеют разные заголовки и не могут быть объединены.")
+        parts.append(part['rows'])
@@ -0,0 +1,395 @@
+import csv
+import io
+import operator
+from itertools import chain, islice
+from .csv_module import _load_row_index, read_stats
+from .instrumentation import instrumented
+from .io_utils import detect_compression, open_input
+from .type_inference import converter_for, infer_column_types
+from .zone_maps import matching_chunks, summarize
+
+# операторы сравнения для filter; значение ячейки - левый операнд
+_OPERATORS = {
+    "==": operator.eq, "!=": operator.ne,
+    "<": operator.lt, "<=": operator.le, ">": operator.gt, ">=": operator.ge,
+    "in": lambda cell, value: cell in value,
+    "not in": lambda cell, value: cell not in value,
+}
+
+def scan_csv(file_path, schema=None, on_error="raise", sample_rows=None):
+    """
+    Создаёт ленивый запрос к CSV файлу. Файл читается только при вызове collect() или при переборе строк.
+
+    Пример:
+        table = scan_csv("data.csv", schema={"Возраст": int}).filter("Возраст", ">", 30).select(["Имя"]).limit(10).collect()
+
+    Args:
+        file_path (str): Путь к CSV файлу.
+        schema (dict or str, optional): Типы столбцов (ключи — имена или индексы) или "infer" —
+                                        определить типы нужных запросу столбцов по первым sample_rows строкам.
+                                        Столбцы без типа остаются строками.
+        on_error (str): "raise" — ошибка при значении, которое не приводится к типу, "null" — заменить его на None.
+        sample_rows (int, optional): Сколько строк читать для schema="infer" (по умолчанию 1000).
+
+    Returns:
+        Query: Запрос без фильтров, со всеми столбцами.
+    """
+    if on_error not in ("raise", "null"):
+        raise ValueError(f"Неизвестный режим обработки ошибок: {on_error}")
+    return Query(file_path, schema, on_error, sample_rows)
+
+
+class Query:
+    """
+    Ленивый запрос к CSV файлу: цепочка filter / select / limit.
+
+    Каждый метод возвращает новый запрос, сам файл не читается. При выполнении план
+    собирается целиком: фильтры проверяются сразу при чтении строки (каждый фильтр
+    преобразует только свой столбец), преобразуются и сохраняются только выбранные
+    столбцы, а после limit подходящих строк чтение файла прекращается.
+
+    Если у файла есть статистика частей (save_csv(stats=True) или build_stats), части,
+    в которых по минимуму и максимуму столбца нет подходящих строк, не читаются:
+    к остальным частям чтение переходит по индексу строк. count, min и max без фильтров
+    вычисляются по статистике, не читая файл.
+    """
+
+    def __init__(self, file_path, schema, on_error, sample_rows, filters=(), columns=None, row_limit=None):
+        self.file_path = file_path
+        self.schema = schema
+        self.on_error = on_error
+        self.sample_rows = sample_rows
+        self.filters = filters # кортеж (столбец, оператор, значение)
+        self.columns = columns # выбранные столбцы, None - все
+        self.row_limit = row_limit
+
+    def _replace(self, **changes):
+        params = {"filters": self.filters, "columns": self.columns, "row_limit": self.row_limit, **changes}
+        return Query(self.file_path, self.schema, self.on_error, self.sample_rows, **params)
+
+    def filter(self, column, op, value=None):
+        """
+        Добавляет условие отбора строк. Несколько условий объединяются через "и".
+
+        Args:
+            column (int or str): Индекс или имя столбца.
+            op (str or callable): Оператор "==", "!=", "<", "<=", ">", ">=", "in", "not in"
+                                  или функция, которая получает значение ячейки и возвращает bool.
+            value: Значение для сравнения (для функции не используется).
+                   Если тип столбца не задан схемой, а value - число или bool,
+                   ячейки приводятся к типу value; непреобразуемые ячейки не проходят условие.
+
+        Returns:
+            Query: Новый запрос.
+
+        Raises:
+            ValueError: Неизвестный оператор.
+        """
+        if not callable(op) and op not in _OPERATORS:
+            raise ValueError(f"Неизвестный оператор: {op}")
+        if op in ("in", "not in"):
+            try:
+                value = frozenset(value)
+            except TypeError: # нехешируемые значения - проверка по списку
+                value = list(value)
+        return self._replace(filters=self.filters + ((column, op, value),))
+
+    def select(self, columns):
+        """
+        Оставляет в результате только указанные столбцы (в указанном порядке).
+
+        Args:
+            columns (list): Индексы или имена столбцов.
+
+        Returns:
+            Query: Новый запрос.
+        """
+        return self._replace(columns=list(columns))
+
+    def limit(self, n):
+        """
+        Ограничивает количество строк результата.
+
+        Args:
+            n (int): Максимальное количество строк.
+
+        Returns:
+            Query: Новый запрос.
+
+        Raises:
+            ValueError: Если n отрицательное.
+        """
+        if n < 0:
+            raise ValueError("Ограничение limit не может быть отрицательным.")
+        return self._replace(row_limit=n if self.row_limit is None else min(n, self.row_limit))
+
+    def explain(self):
+        """
+        Возвращает план выполнения запроса в текстовом виде (файл не читается).
+
+        Returns:
+            str: Описание плана.
+        """
+        lines = [f"scan_csv {self.file_path}"]
+        for column, op, value in self.filters:
+            lines.append(f"  filter {column!r} {getattr(op, '__name__', op)} {value!r} (при чтении)")
+        lines.append(f"  select {self.columns if self.columns is not None else 'все столбцы'}")
+        if self.row_limit is not None:
+            lines.append(f"  limit {self.row_limit} (чтение останавливается)")
+        return "\n".join(lines)
+
+    def __iter__(self):
+        """Перебирает строки результата (списки значений выбранных столбцов), читая файл по мере перебора."""
+        try:
+            with open_input(self.file_path, "r", newline="", encoding="utf-8") as file:
+                reader = csv.reader(file)
+                header = next(reader)
+                yield from self._execute(header, reader)[1]
+        except Exception as e:
+            raise ValueError(f"Ошибка при загрузке CSV файла {self.file_path}: {e}")
+
+    @instrumented
+    def collect(self):
+        """
+        Выполняет запрос.
+
+        Returns:
+            dict: Таблица с ключами 'header', 'rows' и 'column_types' (только выбранные столбцы).
+
+        Raises:
+            ValueError: Если возникает ошибка при чтении файла, столбец не найден
+                        или значение не приводится к типу (при on_error="raise").
+        """
+        try:
+            with open_input(self.file_path, "r", newline="", encoding="utf-8") as file:
+                reader = csv.reader(file)
+                header = next(reader)
+                selected, rows, column_types = self._execute(header, reader, with_types=True)
+                return {"header": selected, "rows": list(rows), "column_types": column_types}
+        except Exception as e:
+            raise ValueError(f"Ошибка при загрузке CSV файла {self.file_path}: {e}")
+
+    def _execute(self, header, reader, with_types=False):
+        """
+        Строит план по заголовку файла.
+
+        Returns:
+            tuple: (имена выбранных столбцов, итератор строк результата[, типы выбранных столбцов])
+        """
+        selected = [_column_index(header, column) for column in (self.columns if self.columns is not None else range(len(header)))]
+        filter_indexes = [_column_index(header, column) for column, _, _ in self.filters]
+
+        # типы нужны только столбцам, которые участвуют в запросе
+        needed = sorted(set(selected) | set(filter_indexes))
+        prefix = []
+        if self.schema == "infer":
+            prefix = list(islice(reader, self.sample_rows or 1000))
+            inferred = infer_column_types({"header": [header[i] for i in needed],
+                                           "rows": [[row[i] for i in needed] for row in prefix]})
+            types = dict(zip(needed, inferred.values()))
+        elif isinstance(self.schema, dict):
+            types = {_column_index(header, column): col_type for column, col_type in self.schema.items()}
+        elif self.schema is None:
+            types = {}
+        else:
+            raise ValueError(f"Схема должна быть словарём или 'infer', а не {self.schema!r}")
+
+        tests = []
+        for i, (column, op, value) in zip(filter_indexes, self.filters):
+            col_type = types.get(i, str)
+            strict = True
+            if col_type is str and type(value) in (int, float, bool):
+                col_type, strict = type(value), False # тип по значению: непреобразуемые ячейки просто не проходят
+            test = op if callable(op) else _bind(_OPERATORS[op], value)
+            tests.append((i, None if col_type is str else converter_for(col_type), col_type, strict, test))
+        outputs = [(position, i, converter_for(types[i]), types[i])
+                   for position, i in enumerate(selected) if types.get(i, str) is not str]
+
+        chunks = self._matching_chunks(header, tests)
+        if chunks is None:
+            source = enumerate(chain(prefix, reader))
+        else: # читаем только части, в которых могут быть подходящие строки
+            source = self._chunk_rows(*chunks)
+        rows = self._rows(header, source, selected, tests, outputs)
+        if with_types:
+            column_types = {header[i]: types.get(i, str) for i in selected}
+            return [header[i] for i in selected], rows, column_types
+        return [header[i] for i in selected], rows
+
+    def _matching_chunks(self, header, tests):
+        """
+        Части файла, которые нужно прочитать, по статистике частей.
+
+        Returns:
+            tuple or None: (номера частей, смещения частей, шаг) или None, если нужно читать весь файл.
+        """
+        if not tests:
+            return None
+        stats = self._stats(header)
+        if stats is None or detect_compression(self.file_path) is not None:
+            return None
+        chunks = None
+        for (i, _, col_type, _, _), (_, op, value) in zip(tests, self.filters):
+            if not _same_domain(col_type, stats['types'].get(header[i])): # значения сравниваются не так, как в статистике
+                continue
+            found = set(matching_chunks(stats, header[i], op, value))
+            chunks = found if chunks is None else chunks & found
+        count = len(stats['columns'][header[0]]['min']) if header else 0
+        if chunks is None or len(chunks) == count:
+            return None
+        offsets, step, _ = _load_row_index(self.file_path)
+        if step != stats['step']:
+            return None
+        return sorted(chunks), offsets, step
+
+    def _chunk_rows(self, chunks, offsets, step):
+        """Пары (номер строки, строка) только из указанных частей; соседние части читаются подряд."""
+        with open(self.file_path, mode="rb") as raw:
+            position = 0
+            while position < len(chunks):
+                end = position + 1
+                while end < len(chunks) and chunks[end] == chunks[end - 1] + 1:
+                    end += 1
+                first = chunks[position]
+                raw.seek(offsets[first])
+                text = io.TextIOWrapper(raw, encoding="utf-8", newline="")
+                reader = islice(csv.reader(text), (end - position) * step)
+                yield from enumerate(reader, first * step)
+                text.detach() # файл остаётся открытым для перехода к следующей части
+                position = end
+
+    def _stats(self, header=None):
+        """Статистика частей файла или None, если её нет или она не относится к файлу."""
+        stats = read_stats(self.file_path)
+        if stats is None or (header is not None and stats['header'] != header):
+            return None
+        return stats
+
+    def _rows(self, header, source, selected, tests, outputs):
+        """Генератор строк результата: фильтрация, проекция, приведение типов и limit. source - пары (номер, строка)."""
+        remaining = self.row_limit
+        if remaining == 0:
+            return
+        convert_value = self._convert
+        for row_number, row in source:
+            passed = True
+            for i, convert, col_type, strict, test in tests:
+                value = row[i]
+                if convert is not None:
+                    value = convert_value(value, convert, col_type, strict, row_number, header[i])
+                    if value is _SKIP:
+                        passed = False
+                        break
+                try:
+                    if not test(value):
+                        passed = False
+                        break
+                except TypeError: # например, сравнение None с числом
+                    passed = False
+                    break
+            if not passed:
+                continue
+            result = [row[i] for i in selected] # невыбранные столбцы не сохраняются
+            for position, i, convert, col_type in outputs:
+                result[position] = convert_value(result[position], convert, col_type, True, row_number, header[i])
+            yield result
+            if remaining is not None:
+                remaining -= 1
+                if remaining == 0: # дальше файл не читаем
+                    return
+
+    def _convert(self, value, convert, col_type, strict, row_number, column_name):
+        """Приводит значение ячейки к типу; пустое значение - None."""
+        if value == "":
+            return None
+        try:
+            return convert(value)
+        except (ValueError, TypeError, OverflowError):
+            if not strict:
+                return _SKIP
+            if self.on_error == "raise":
+                raise ValueError(f"Невозможно преобразовать значение '{value}' в {col_type.__name__} "
+                                 f"(строка {row_number}, столбец '{column_name}')")
+            return None
+
+    def count(self):
+        """
+        Количество строк результата. Без фильтров берётся из статистики частей файла, если она есть.
+
+        Returns:
+            int: Количество строк.
+        """
+        if not self.filters:
+            stats = self._stats()
+            if stats is not None:
+                return stats['rows'] if self.row_limit is None else min(stats['rows'], self.row_limit)
+        return sum(1 for _ in self.select([]))
+
+    def min(self, column):
+        """
+        Наименьшее непустое значение столбца в результате (с учётом схемы).
+
+        Без фильтров и limit, если тип столбца в запросе совпадает с типом в статистике
+        частей файла, значение берётся из статистики без чтения файла.
+
+        Args:
+            column (int or str): Индекс или имя столбца.
+
+        Returns:
+            Наименьшее значение или None, если непустых значений нет.
+        """
+        return self._extreme(column, "min")
+
+    def max(self, column):
+        """
+        Наибольшее непустое значение столбца в результате (см. min).
+
+        Args:
+            column (int or str): Индекс или имя столбца.
+
+        Returns:
+            Наибольшее значение или None, если непустых значений нет.
+        """
+        return self._extreme(column, "max")
+
+    def _extreme(self, column, func):
+        if not self.filters and self.row_limit is None and self.schema != "infer":
+            stats = self._stats()
+            if stats is not None:
+                header = stats['header']
+                name = header[_column_index(header, column)]
+                col_type = str
+                if isinstance(self.schema, dict):
+                    col_type = next((t for c, t in self.schema.items() if header[_column_index(header, c)] == name), str)
+                if _same_domain(col_type, stats['types'].get(name)):
+                    try:
+                        return summarize(stats, name)[func]
+                    except ValueError: # значения частей несравнимы - считаем по данным
+                        pass
+        values = [row[0] for row in self.select([column]) if row[0] is not None]
+        if not values:
+            return None
+        return min(values) if func == "min" else max(values)
+
+    def __repr__(self):
+        return f"Query({self.explain()!r})"
+
+_SKIP = object() # ячейка не приводится к типу значения фильтра
+
+def _same_domain(query_type, stats_type):
+    """True, если значения типа запроса сравниваются так же, как значения типа статистики."""
+    return query_type is stats_type or (query_type in (int, float) and stats_type in (int, float))
+
+def _bind(compare, value):
+    """Функция одной переменной: сравнение значения ячейки с value."""
+    return lambda cell: compare(cell, value)
+
+def _column_index(header, column):
+    """Индекс столбца по индексу или имени."""
+    if isinstance(column, int):
+        if not -len(header) <= column < len(header):
+            raise ValueError(f"Столбец с индексом {column} не найден.")
+        return column % len(header)
+    if column not in header:
+        raise ValueError(f"Столбец '{column}' не найден.")
+    return header.index(column)
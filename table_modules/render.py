@@ -0,0 +1,201 @@
+import io
+import sys
+from collections import deque
+from itertools import islice
+from .columnar import ColumnRows, DictionaryColumn
+
+_BATCH_ROWS = 10000 # строк, которые форматируются и записываются за один вызов write
+_SAMPLE_ROWS = 1000 # по скольким строкам определяется ширина столбцов при align=True
+_SEPARATOR = "  " # разделитель столбцов при выравнивании
+
+
+def render_table(table, file=None, head=None, tail=None, page=None, page_size=100, align=False,
+                 sample_rows=_SAMPLE_ROWS, null="None", header=True, batch_rows=_BATCH_ROWS):
+    """
+    Выводит таблицу в файл или консоль, форматируя строки пачками.
+
+    Значения приводятся к строкам по столбцам для целой пачки строк, пачка собирается
+    в одну строку и записывается одним вызовом write. При head, tail или page
+    форматируются только выводимые строки, поэтому просмотр начала большой
+    таблицы не зависит от её размера.
+
+    Args:
+        table (dict): Таблица с ключами 'header' и 'rows'.
+        file (file, optional): Куда писать (по умолчанию sys.stdout).
+        head (int, optional): Вывести только первые head строк.
+        tail (int, optional): Вывести только последние tail строк (вместе с head - начало и конец таблицы).
+        page (int, optional): Номер страницы (с 0) из page_size строк; не сочетается с head и tail.
+        page_size (int): Строк на странице.
+        align (bool): Если True, столбцы выравниваются по ширине: ширина берётся по заголовку и
+                      sample_rows строкам, равномерно выбранным из выводимых; числа прижимаются вправо.
+                      Если False, значения разделяются табуляцией.
+        sample_rows (int): Сколько строк просматривать для определения ширины столбцов.
+        null (str): Как выводить None.
+        header (bool): Выводить ли строку заголовка.
+        batch_rows (int): Сколько строк форматировать за раз.
+
+    Returns:
+        int: Количество выведенных строк таблицы.
+
+    Raises:
+        ValueError: page задан вместе с head или tail либо размер страницы меньше 1.
+    """
+    if page is not None and (head is not None or tail is not None):
+        raise ValueError("page нельзя сочетать с head и tail.")
+    if page_size < 1 or batch_rows < 1:
+        raise ValueError("Размер страницы и пачки должен быть не меньше 1.")
+    file = sys.stdout if file is None else file
+    rows = table['rows']
+    parts, skipped = _select(rows, head, tail, page, page_size)
+
+    widths = right = None
+    if align:
+        widths, right = _widths(table, rows, parts, sample_rows, null)
+    if header:
+        file.write(_join([[str(name)] for name in table['header']], widths, right, 1)[0] + "\n")
+
+    written = 0
+    for number, part in enumerate(parts):
+        if number and skipped: # между началом и концом таблицы (head и tail)
+            file.write(f"... ({skipped} строк пропущено)\n")
+        for batch in _batches(rows, part, batch_rows):
+            columns = _string_columns(batch, len(table['header']), null)
+            if columns is None: # строки разной длины (например, из csv.reader) выводятся каждая целиком
+                lines = [_join_row(_strings(row, null), widths, right) for row in batch]
+            else:
+                lines = _join(columns, widths, right, len(batch))
+            if lines:
+                file.write("\n".join(lines) + "\n")
+            written += len(lines)
+    return written
+
+def format_table(table, **options):
+    """
+    Возвращает таблицу в виде строки, как её вывел бы render_table.
+
+    Args:
+        table (dict): Таблица с ключами 'header' и 'rows'.
+        **options: Параметры render_table (кроме file).
+
+    Returns:
+        str: Отформатированная таблица.
+    """
+    buffer = io.StringIO()
+    render_table(table, buffer, **options)
+    return buffer.getvalue()
+
+
+def _select(rows, head, tail, page, page_size):
+    """
+    Выбирает выводимые строки.
+
+    Returns:
+        tuple: (части, число пропущенных строк). Часть - range номеров строк или, если у строк
+               нет доступа по номеру, уже прочитанный список строк.
+    """
+    if not (hasattr(rows, '__getitem__') and hasattr(rows, '__len__')): # только перебор (например, SortedRows)
+        iterator = iter(rows)
+        if page is not None:
+            return [list(islice(iterator, page * page_size, (page + 1) * page_size))], 0
+        if head is None and tail is None:
+            return [iterator], 0
+        first = list(islice(iterator, head)) if head is not None else []
+        if tail is None:
+            return [first], 0
+        last = deque(maxlen=tail) # хранятся только последние tail строк
+        seen = 0
+        for row in iterator:
+            last.append(row)
+            seen += 1
+        return [first, list(last)], seen - len(last)
+
+    total = len(rows)
+    if page is not None:
+        return [range(min(page * page_size, total), min((page + 1) * page_size, total))], 0
+    if head is None and tail is None:
+        return [range(total)], 0
+    first = range(min(head, total)) if head is not None else range(0)
+    if tail is None:
+        return [first], 0
+    last = range(max(total - tail, first.stop), total)
+    return [first, last], last.start - first.stop
+
+def _batches(rows, part, batch_rows):
+    """Пачки строк части: списки строк или ColumnRows (для столбцовой таблицы - срезы столбцов)."""
+    if not isinstance(part, range):
+        iterator = iter(part)
+        while True:
+            batch = list(islice(iterator, batch_rows))
+            if not batch:
+                return
+            yield batch
+    for start in range(part.start, part.stop, batch_rows):
+        stop = min(start + batch_rows, part.stop)
+        if isinstance(rows, (list, ColumnRows)):
+            yield rows[start:stop] # срез ColumnRows - срезы столбцов без сборки строк
+        else:
+            yield [rows[i] for i in range(start, stop)]
+
+def _string_columns(batch, width, null):
+    """Значения пачки строк, приведённые к строкам, по столбцам; None, если длина строк отличается от заголовка."""
+    if isinstance(batch, ColumnRows):
+        columns = []
+        for column in batch.columns:
+            if isinstance(column, DictionaryColumn): # каждое значение словаря приводится к строке один раз
+                texts = _strings(column.dictionary, null)
+                columns.append([texts[code] if code >= 0 else null for code in column.codes])
+            else:
+                columns.append(_strings(column.to_list(), null))
+        return columns
+    if any(len(row) != width for row in batch):
+        return None
+    return [_strings(values, null) for values in zip(*batch)] if width else []
+
+def _strings(values, null):
+    if all(value.__class__ is str for value in values):
+        return values if isinstance(values, list) else list(values)
+    return [null if value is None else value if value.__class__ is str else str(value) for value in values]
+
+def _join(columns, widths, right, count):
+    """Строки вывода из столбцов строковых значений."""
+    if not columns:
+        return [""] * count
+    if widths is not None:
+        columns = [[value.rjust(width) for value in column] if is_right else [value.ljust(width) for value in column]
+                   for column, width, is_right in zip(columns, widths, right)]
+        columns[-1] = [value.rstrip() for value in columns[-1]] # без пробелов в конце строк
+        return list(map(_SEPARATOR.join, zip(*columns)))
+    return list(map("\t".join, zip(*columns)))
+
+def _join_row(values, widths, right):
+    """Строка вывода из строковых значений одной строки таблицы (ячейки за пределами заголовка не выравниваются)."""
+    if widths is None:
+        return "\t".join(values)
+    cells = [value if i >= len(widths) else value.rjust(widths[i]) if right[i] else value.ljust(widths[i])
+             for i, value in enumerate(values)]
+    return _SEPARATOR.join(cells).rstrip()
+
+def _widths(table, rows, parts, sample_rows, null):
+    """Ширина каждого столбца и признак выравнивания вправо (числа) по заголовку и выборке строк."""
+    sample = []
+    total = sum(len(part) for part in parts if isinstance(part, (range, list)))
+    step = max(1, total // max(sample_rows, 1))
+    for part in parts:
+        if isinstance(part, range):
+            sample.extend(rows[i] for i in part[::step])
+        elif isinstance(part, list):
+            sample.extend(part[::step])
+    # части-итераторы (вывод всех строк без доступа по номеру) не просматриваются заранее
+    header = table['header']
+    widths = [len(str(name)) for name in header]
+    right = [False] * len(header)
+    types = table.get('column_types') or {}
+    stored = getattr(rows, 'column_types', None)
+    for i, name in enumerate(header):
+        col_type = types.get(name) or (stored[i] if stored else None)
+        values = [row[i] if i < len(row) else None for row in sample] # недостающие ячейки выводятся как null
+        right[i] = col_type in (int, float) or (col_type is None and bool(values) and all(
+            isinstance(value, (int, float)) and not isinstance(value, bool) for value in values if value is not None))
+        if values:
+            widths[i] = max(widths[i], max(len(text) for text in _strings(values, null)))
+    return widths, right
@@ -0,0 +1,255 @@
+import csv
+import heapq
+import os
+import pickle
+import tempfile
+from itertools import islice
+from .instrumentation import instrumented
+from .io_utils import open_input
+from .table_operations import get_values
+from .type_inference import TypeInferencer, converter_for, infer_column_types
+
+_SPILL_BATCH = 1000 # строк в одной записи pickle во временном файле
+
+
+@instrumented
+def sort_table(table_or_path, by, descending=False, max_memory_rows=100000, temp_dir=None, column_types=None):
+    """
+    Сортирует таблицу или CSV файл по значениям столбцов (внешняя сортировка слиянием).
+
+    Строки читаются частями не больше max_memory_rows. Каждая часть сортируется в памяти;
+    если частей больше одной, они сбрасываются во временные файлы и при чтении
+    результата сливаются (k-путевое слияние), так что в памяти одновременно находится
+    не больше одной части. Сортировка устойчивая: строки с равными ключами
+    остаются в исходном порядке. Значения сравниваются с учётом типа столбца
+    (строка "10" больше "9" в столбце int); пустые значения и None - в конце.
+
+    Args:
+        table_or_path (dict or str): Таблица или путь к CSV файлу.
+        by (int, str or list): Столбец (индекс или имя) или список столбцов сортировки.
+        descending (bool or list): Порядок по убыванию - для всех столбцов или для каждого отдельно.
+        max_memory_rows (int): Сколько строк сортировать в памяти за раз.
+        temp_dir (str, optional): Каталог для временных файлов.
+        column_types (dict, optional): Типы столбцов сортировки (ключи - имена). По умолчанию берутся
+                                       из table['column_types'] или определяются по данным
+                                       (для CSV файла - отдельным потоковым проходом).
+
+    Returns:
+        dict: Таблица с ключами 'header' и 'rows'. Если понадобились временные файлы,
+              'rows' - SortedRows: строки выдаются при переборе, не загружаясь в память целиком,
+              поэтому результат можно сразу передать в save_csv или save_text.
+
+    Raises:
+        ValueError: Столбец не найден, max_memory_rows меньше 1, значение не приводится к типу
+                    столбца или ошибка чтения файла.
+    """
+    if max_memory_rows < 1:
+        raise ValueError("max_memory_rows должен быть не меньше 1.")
+    if isinstance(table_or_path, (str, os.PathLike)):
+        header, source, types = _scan_csv(table_or_path, by, max_memory_rows, column_types)
+    else:
+        header = table_or_path['header']
+        source = iter(table_or_path['rows'])
+        types = _table_types(table_or_path, by, column_types)
+
+    columns = [by] if isinstance(by, (int, str)) else list(by)
+    indexes = [_column_index(header, column) for column in columns]
+    flags = [descending] * len(indexes) if isinstance(descending, bool) else list(descending)
+    if len(flags) != len(indexes):
+        raise ValueError("Количество значений descending не совпадает с количеством столбцов сортировки.")
+    key, reverse = _sort_key(header, indexes, [types.get(header[i], str) for i in indexes], flags)
+
+    runs = []
+    temp = None
+    try:
+        while True:
+            run = list(islice(source, max_memory_rows))
+            if not run and runs:
+                break
+            run.sort(key=key, reverse=reverse) # устойчивая сортировка в памяти
+            if len(run) < max_memory_rows and not runs: # всё поместилось в одну часть
+                return {"header": list(header), "rows": run}
+            if temp is None:
+                temp = tempfile.TemporaryDirectory(dir=temp_dir, prefix="sort_table_")
+            runs.append(_spill(run, temp.name, len(runs)))
+            if len(run) < max_memory_rows:
+                break
+    except Exception:
+        if temp is not None:
+            temp.cleanup()
+        raise
+    return {"header": list(header), "rows": SortedRows(runs, key, reverse, temp)}
+
+
+class SortedRows:
+    """
+    Строки результата внешней сортировки: отсортированные части во временных файлах.
+
+    При каждом переборе части сливаются через heapq.merge (слияние устойчиво: из равных
+    строк первой выдаётся строка из более ранней части), в памяти хранится по одной
+    пачке строк каждой части. Временные файлы удаляются при close() или сборке мусора.
+    """
+
+    def __init__(self, runs, key, reverse, temp):
+        self.runs = runs # (путь, количество строк)
+        self.key = key
+        self.reverse = reverse
+        self._temp = temp
+
+    def __len__(self):
+        return sum(count for _, count in self.runs)
+
+    def __iter__(self):
+        if self._temp is None:
+            raise ValueError("Временные файлы сортировки уже удалены.")
+        return heapq.merge(*(_read_run(path) for path, _ in self.runs), key=self.key, reverse=self.reverse)
+
+    def __reduce__(self):
+        # при сериализации (save_pickle) строки собираются в обычный список
+        return list, ([list(row) for row in self],)
+
+    def compact(self):
+        """Возвращает все строки одним списком."""
+        return [list(row) for row in self]
+
+    def close(self):
+        """Удаляет временные файлы."""
+        if self._temp is not None:
+            self._temp.cleanup()
+            self._temp = None
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
+
+    def __repr__(self):
+        return f"SortedRows({len(self.runs)} runs, {len(self)} rows)"
+
+
+def _column_index(header, column):
+    if isinstance(column, int):
+        return column
+    if column not in header:
+        raise ValueError(f"Столбец '{column}' не найден.")
+    return header.index(column)
+
+def _table_types(table, by, column_types):
+    """Типы столбцов сортировки таблицы в памяти: из аргумента, table['column_types'] или по данным."""
+    types = dict(table.get('column_types') or {})
+    stored = getattr(table['rows'], 'column_types', None) # столбцовые строки знают свои типы
+    if stored is not None:
+        types.update((name, col_type) for name, col_type in zip(table['header'], stored) if col_type is not object)
+    types.update(column_types or {})
+    header = table['header']
+    missing = [header[_column_index(header, column)] for column in ([by] if isinstance(by, (int, str)) else by)]
+    missing = [name for name in missing if name not in types]
+    if missing:
+        values = [get_values(table, header.index(name)) for name in missing]
+        types.update(infer_column_types({"header": missing, "rows": list(zip(*values))}))
+    return types
+
+def _scan_csv(file_path, by, max_memory_rows, column_types):
+    """
+    Открывает CSV файл для сортировки.
+
+    Если типы столбцов сортировки не заданы, сначала файл читается целиком потоково
+    и типы определяются только по этим столбцам.
+
+    Returns:
+        tuple: (заголовок, итератор строк, типы столбцов)
+    """
+    try:
+        with open_input(file_path, "r", newline="", encoding="utf-8") as file:
+            header = next(csv.reader(file))
+            names = [header[_column_index(header, column)] for column in ([by] if isinstance(by, (int, str)) else by)]
+            types = dict(column_types or {})
+            missing = [name for name in names if name not in types]
+            if missing:
+                indexes = [header.index(name) for name in missing]
+                inferencer = TypeInferencer(missing)
+                reader = csv.reader(file)
+                while True:
+                    chunk = [[row[i] for i in indexes] for row in islice(reader, max_memory_rows)]
+                    if not chunk:
+                        break
+                    inferencer.update(chunk)
+                types.update(inferencer.result())
+    except Exception as e:
+        raise ValueError(f"Ошибка при загрузке CSV файла {file_path}: {e}")
+    return header, _read_csv_rows(file_path), types
+
+def _read_csv_rows(file_path):
+    """Строки CSV файла без заголовка."""
+    try:
+        with open_input(file_path, "r", newline="", encoding="utf-8") as file:
+            reader = csv.reader(file)
+            next(reader)
+            yield from reader
+    except Exception as e:
+        raise ValueError(f"Ошибка при загрузке CSV файла {file_path}: {e}")
+
+def _sort_key(header, indexes, types, flags):
+    """
+    Функция ключа сортировки и флаг reverse.
+
+    Ключ - кортеж пар (признак пустого значения, значение, приведённое к типу столбца).
+    Если направление у всех столбцов одинаковое, используется reverse; иначе значения
+    столбцов по убыванию оборачиваются в _Descending.
+    """
+    reverse = all(flags)
+    mixed = any(flags) and not reverse
+    specs = []
+    for i, col_type, desc in zip(indexes, types, flags):
+        convert = None if col_type is str else converter_for(col_type)
+        specs.append((i, convert, col_type, mixed and desc))
+    null_last = not reverse # при reverse=True признак инвертируется, чтобы пустые значения оставались в конце
+
+    def key(row):
+        parts = []
+        for i, convert, col_type, wrap in specs:
+            value = row[i]
+            if value is None or value == "":
+                parts.append((null_last, None))
+                continue
+            if convert is not None and isinstance(value, str):
+                try:
+                    value = convert(value)
+                except ValueError:
+                    raise ValueError(f"Невозможно преобразовать значение '{value}' в {col_type.__name__} "
+                                     f"(столбец '{header[i]}')")
+            parts.append((not null_last, _Descending(value) if wrap else value))
+        return parts
+    return key, reverse
+
+class _Descending:
+    """Обёртка значения с обратным порядком сравнения."""
+    __slots__ = ("value",)
+
+    def __init__(self, value):
+        self.value = value
+
+    def __lt__(self, other):
+        return other.value < self.value
+
+    def __eq__(self, other):
+        return self.value == other.value
+
+def _spill(rows, directory, number):
+    """Записывает отсортированную часть во временный файл пачками. Возвращает (путь, количество строк)."""
+    path = os.path.join(directory, f"run_{number}.pkl")
+    with open(path, mode="wb") as file:
+        for start in range(0, len(rows), _SPILL_BATCH):
+            pickle.dump(rows[start:start + _SPILL_BATCH], file, protocol=pickle.HIGHEST_PROTOCOL)
+    return path, len(rows)
+
+def _read_run(path):
+    """Читает строки части из временного файла по одной пачке."""
+    with open(path, mode="rb") as file:
+        while True:
+            try:
+                batch = pickle.load(file)
+            except EOFError:
+                return
+            yield from batch
@@ -1,41 +1,104 @@
+import os
+from .chunked import ChunkedRows
+from .index import HashIndex, invalidate_index
+from .instrumentation import instrumented
+from .render import render_table
+from .type_inference import converter_for, infer_column_types
+from .views import TableView
+from .zone_maps import matching_chunks, stats_match
+
+@instrumented
 def get_rows_by_number(table, start, stop = None, copy_table = False):
     """
     Возвращает строки таблицы по номеру (одна строка или интервал).
 
+    Вместо таблицы можно передать путь к CSV файлу: тогда читаются только нужные строки
+    с помощью индекса строк (см. csv_module.get_rows_by_number).
+
     Args:
-        table (dict): Словарь, представляющий таблицу. В нём должны быть ключи.
+        table (dict or str): Словарь, представляющий таблицу. В нём должны быть ключи. Или путь к CSV файлу.
         start (int): Индекс, с которого начинается выборка строк.
         stop (int, optional): Индекс, до которого продолжается выборка строк (не включая stop). 
                               Если stop не указан (None), выборка идёт до конца списка строк.
-        copy_table (bool, optional): Флаг, который определяет, нужно ли копировать строки таблицы перед возвратом.
+        copy_table (bool, optional): Если True, строки копируются при первой записи (родительская таблица не меняется).
+                                     Если False, запись изменяет строки родительской таблицы.
 
     Returns:
-        dict: Словарь с двумя ключами.
+        dict: Словарь с двумя ключами, где 'rows' — TableView: строки не копируются, выборка создаётся за O(1).
     """
-    rows = table['rows'][start:stop] # выполняет срез строк таблицы
+    if isinstance(table, (str, os.PathLike)): # путь к файлу: читаем только нужные строки
+        from .csv_module import get_rows_by_number as get_csv_rows # csv_module сам импортирует этот модуль
+        return get_csv_rows(table, start, stop)
+    rows = TableView.of(table, start, stop, copy_on_write=copy_table) # представление диапазона строк без копирования
     # создание словаря с теми же заголовками таблицы и строками из среза.
-    return {"header": table['header'], "rows": rows.copy()} if copy_table else {"header": table['header'], "rows": rows}
+    return {"header": table['header'], "rows": rows}
 
-def get_rows_by_index(table, *values, copy_table=False):
+@instrumented
+def get_rows_by_index(table, *values, copy_table=False, column=0):
     """
     Возвращает строки таблицы, где значения в первом столбце совпадают с переданными аргументами.
+    Если для столбца создан индекс (create_index), строки находятся через него без полного просмотра.
+    Если у таблицы есть статистика частей (table['stats'], например из save_pickle(stats=True)),
+    просматриваются только части, в диапазон [min, max] которых попадает одно из значений.
 
     Args:
         table (dict): Таблица с ключами.
         *values: Несколько значений, с которыми будут сравниваться значения в первом столбце таблицы. Это может быть одно или несколько значений.
-        copy_table (bool, optional): Если True, возвращается копия строк таблицы. Если False, возвращаются строки по ссылке.
+        copy_table (bool, optional): Если True, запись в результат не меняет исходную таблицу (строки копируются,
+                                     представления копируют строки при первой записи). Если False, возвращаются
+                                     строки по ссылке.
+        column (int or str, optional): Индекс или имя столбца для сравнения (по умолчанию первый столбец).
 
     Returns:
         dict: Словарь с двумя ключами.
     """
-    filtered_rows = [row for row in table['rows'] if row[0] in values] # сравниваем строки с переданными значениями.
+    col_index = column if isinstance(column, int) else table['header'].index(column) # определение индекса столбца.
+    rows = table['rows']
+    index = _get_index(table, col_index)
+    if index is not None: # есть индекс: находим номера строк за O(k)
+        positions = index.lookup(values)
+        if hasattr(rows, 'take'):
+            return _selected(table, rows.take(positions), copy_table)
+        return _selected(table, [rows[i] for i in positions], copy_table)
+
+    try:
+        values = set(values) # проверка вхождения в множество - O(1)
+    except TypeError: # нехешируемые значения сравниваем как раньше
+        pass
+    if hasattr(rows, 'positions'): # столбцовая таблица ищет в самом столбце (словарный столбец сравнивает коды)
+        return _selected(table, rows.take(rows.positions(col_index, values)), copy_table)
+    if hasattr(rows, 'take'): # сравниваем только нужный столбец и выбираем строки по позициям
+        filtered_rows = rows.take(i for i, value in enumerate(rows.get_column(col_index)) if value in values)
+        return _selected(table, filtered_rows, copy_table)
+    stats = table.get('stats')
+    if isinstance(values, set) and stats_match(stats, table): # части, где значений заведомо нет, пропускаем
+        step = stats['step']
+        chunks = matching_chunks(stats, table['header'][col_index], "in", values)
+        all_rows = rows
+        rows = (all_rows[i] for chunk in chunks for i in range(chunk * step, min((chunk + 1) * step, len(all_rows))))
+    filtered_rows = [row for row in rows if row[col_index] in values] # сравниваем строки с переданными значениями.
     # создание нового словаря с найдеными индексами.
-    return {"header": table['header'], "rows": filtered_rows.copy()} if copy_table else {"header": table['header'], "rows": filtered_rows}
+    return _selected(table, filtered_rows, copy_table)
 
+def _selected(table, rows, copy_table):
+    """
+    Таблица из выбранных строк. При copy_table запись в неё не меняет исходную таблицу:
+    строки списка копируются, а представление (TableView) копирует строки при первой записи.
+    ColumnRows.take и так возвращает новые столбцы.
+    """
+    if copy_table:
+        if isinstance(rows, TableView):
+            rows.copy_on_write = True # представление только что создано, другие таблицы на него не ссылаются
+        elif isinstance(rows, list):
+            rows = [list(row) for row in rows]
+    return {"header": table['header'], "rows": rows}
+
+@instrumented
 def get_column_types(table, by_number=True):
     """
     Возвращает словарь с типами значений для каждого столбца.
     Определяет типы данных по требованию для уже загруженной таблицы.
+    Пустые значения не влияют на тип, столбец без значений получает тип str.
 
     Args:
         table (dict): Таблица с ключами 'header' и 'rows'.
@@ -45,20 +108,9 @@ def get_column_types(table, by_number=True):
     Returns:
         dict: Словарь с типами данных для каждого столбца.
     """
-    column_types = {}
-    for i, col in enumerate(table['header']):
-        values = [row[i] for row in table['rows'] if row[i] != ""]  # cчитываем все значения столбца
-        if all(v.isdigit() for v in values): # если все значения цифры
-            column_type = int
-        elif all(is_float(v) for v in values): # если все значения можно преобразовать в float
-            column_type = float
-        elif all(v.lower() in ("true", "false") for v in values): # если все значения True/False
-            column_type = bool
-        else: # в остальных случаях это строка
-            column_type = str
-        column_types[i if by_number else col] = column_type # здесь выбирается, что будет ключом: индекс столбца или его название
-    return column_types
+    return infer_column_types(table, by_number=by_number) # один проход по каждому столбцу, см. type_inference
 
+@instrumented
 def set_column_types(table, types_dict, by_number=True):
     """
     Задаёт типы значений для столбцов.
@@ -77,12 +129,18 @@ def set_column_types(table, types_dict, by_number=True):
     """
     for key, col_type in types_dict.items(): # перебираем все ключи и значения
         col_index = key if by_number else table['header'].index(key) # если by_number — True, то key используется как индекс столбца. Иначе как название столбца
+        invalidate_index(table, col_index) # значения столбца меняют тип, индекс нужно перестроить
+        if hasattr(table['rows'], 'set_column_type'): # столбцовая таблица преобразует весь столбец сразу
+            table['rows'].set_column_type(col_index, col_type)
+            continue
+        convert = converter_for(col_type) # для bool строка "false" должна давать False
         for row in table['rows']:
             try:
-                row[col_index] = col_type(row[col_index]) # ищем по индексу столбца значение в строке и преобразовываем его тип данных в тип данных из col_type.
+                row[col_index] = convert(row[col_index]) # ищем по индексу столбца значение в строке и преобразовываем его тип данных в тип данных из col_type.
             except ValueError:
                 raise ValueError(f"Невозможно преобразовать значение '{row[col_index]}' в {col_type.__name__}")
 
+@instrumented
 def get_values(table, column=0):
     """
     Возвращает список значений из указанного столбца.
@@ -95,8 +153,11 @@ def get_values(table, column=0):
         list: список значений указанного столбца.
     """
     col_index = column if isinstance(column, int) else table['header'].index(column) # если column - число, то это индекс. Иначе ищет индекс этого столбца в списке заголовков. 
+    if hasattr(table['rows'], 'get_column'): # столбцовая таблица отдаёт столбец целиком
+        return table['rows'].get_column(col_index)
     return [row[col_index] for row in table['rows']] # для каждой строки извлекается значение из столбца с индексом.
 
+@instrumented
 def get_value(table, column=0):
     """
     Возвращает одно значение из столбца для таблицы с одной строкой.
@@ -113,6 +174,7 @@ def get_value(table, column=0):
     col_index = column if isinstance(column, int) else table['header'].index(column) # так же как в get_values
     return table['rows'][0][col_index] # извлекает значение из первой строки таблицы по индексу столбца col_index
 
+@instrumented
 def set_values(table, values, column=0):
     """
     Устанавливает список значений в указанный столбец.
@@ -131,9 +193,14 @@ def set_values(table, values, column=0):
     col_index = column if isinstance(column, int) else table['header'].index(column) # определение индекса столбца.
     if len(values) != len(table['rows']): # проверка соответствия длины списка значений и количества строк.
         raise ValueError("Количество значений не совпадает с количеством строк в таблице.")
+    invalidate_index(table, col_index) # столбец заменяется целиком, индекс перестроится при следующем поиске
+    if hasattr(table['rows'], 'set_column'): # столбцовая таблица заменяет столбец целиком
+        table['rows'].set_column(col_index, values)
+        return
     for i, row in enumerate(table['rows']):
         row[col_index] = values[i] # итерирует по всем строкам таблицы и присваивает значения из списка values.
 
+@instrumented
 def set_value(table, value, column=0):
     """
     Устанавливает одно значение в столбец для таблицы с одной строкой.
@@ -152,25 +219,38 @@ def set_value(table, value, column=0):
     if len(table['rows']) != 1: # проверка, что таблица содержит только одну строку.
         raise ValueError("Функция set_value() применима только для таблицы с одной строкой.")
     col_index = column if isinstance(column, int) else table['header'].index(column) # определение индекса столбца.
+    invalidate_index(table, col_index)
+    if hasattr(table['rows'], 'set_cell'): # строки столбцовой таблицы собираются на лету, пишем прямо в столбец
+        table['rows'].set_cell(0, col_index, value)
+        return
     table['rows'][0][col_index] = value # замена значения в строке на переданное значение.
 
-def print_table(table):
+@instrumented
+def print_table(table, head=None, tail=None, page=None, page_size=100, align=False):
     """
     Печатает таблицу в консоль.
-    
+
+    Строки форматируются и выводятся пачками (см. render_table), а при head, tail
+    или page форматируются только выводимые строки.
+
     Args:
         table (dict): Таблица с ключами.
+        head (int, optional): Вывести только первые head строк.
+        tail (int, optional): Вывести только последние tail строк.
+        page (int, optional): Номер страницы (с 0) из page_size строк.
+        page_size (int): Строк на странице.
+        align (bool): Выровнять столбцы по ширине вместо разделения табуляцией.
 
     Returns:
         None
     """
-    print("\t".join(table['header']))
-    for row in table['rows']:
-        print("\t".join(map(str, row))) # преобразует каждый элемент строки row в строку с помощью str. потому что join работает только со строками.
+    render_table(table, head=head, tail=tail, page=page, page_size=page_size, align=align)
 
+@instrumented
 def concat(table1, table2):
     """
     Склеивает две таблицы по строкам, если у них совпадают заголовки.
+    Строки не копируются: результат ссылается на строки обеих таблиц (ChunkedRows).
     
     Args:
         table1 (dict): Таблица с ключами №1.
@@ -187,10 +267,67 @@ def concat(table1, table2):
 
     new_table = {
         'header': table1['header'],
-        'rows': table1['rows'] + table2['rows']  # Добавляем строки из второй таблицы
+        'rows': ChunkedRows([table1['rows'], table2['rows']])  # Добавляем строки из второй таблицы без копирования
     }
+    indexed_columns = set(table1.get('indexes', {})) | set(table2.get('indexes', {}))
+    if indexed_columns: # индексы объединённой таблицы строятся при первом поиске
+        new_table['indexes'] = dict.fromkeys(indexed_columns)
+    return new_table
+
+@instrumented
+def concat_many(tables):
+    """
+    Склеивает несколько таблиц по строкам за O(количество таблиц), не копируя строки.
+
+    Args:
+        tables (list): Таблицы с одинаковыми заголовками.
+
+    Returns:
+        table (dict): Объединенная таблица с ключами.
+
+    Raises:
+        ValueError: Список таблиц пуст или таблицы имеют разные заголовки.
+    """
+    tables = list(tables)
+    if not tables:
+        raise ValueError("Нет таблиц для объединения.")
+    header = tables[0]['header']
+    for table in tables[1:]:
+        if table['header'] != header:
+            raise ValueError("Таблицы имеют разные заголовки и не могут быть объединены.")
+
+    new_table = {"header": header, "rows": ChunkedRows([table['rows'] for table in tables])}
+    indexed_columns = set().union(*(table.get('indexes', {}) for table in tables))
+    if indexed_columns: # индексы объединённой таблицы строятся при первом поиске
+        new_table['indexes'] = dict.fromkeys(indexed_columns)
     return new_table
 
+@instrumented
+def compact(table):
+    """
+    Собирает строки таблицы в один непрерывный список (или ColumnRows для столбцовых таблиц).
+
+    Нужна после многократных concat или для представлений (TableView), когда важна
+    скорость доступа по номеру строки или независимость от исходных таблиц.
+
+    Args:
+        table (dict): Таблица с ключами.
+
+    Returns:
+        table (dict): Новая таблица с теми же заголовками и собранными строками.
+    """
+    rows = table['rows']
+    if hasattr(rows, 'compact'):
+        rows = rows.compact()
+    elif hasattr(rows, 'materialize'):
+        rows = rows.materialize()
+    new_table = dict(table)
+    new_table['rows'] = rows
+    if table.get('indexes'): # индексы новых строк строятся при первом поиске
+        new_table['indexes'] = dict.fromkeys(table['indexes'])
+    return new_table
+
+@instrumented
 def split(table, row_number):
     """
     Разбивает таблицу на две по номеру строки.
@@ -211,61 +348,89 @@ def split(table, row_number):
 
     table1 = {
         'header': table['header'],
-        'rows': table['rows'][:row_number]  # Строки до row_number
+        'rows': TableView.of(table, None, row_number)  # Строки до row_number (представление без копирования)
     }
     table2 = {
         'header': table['header'],
-        'rows': table['rows'][row_number:]  # Строки с row_number и дальше
+        'rows': TableView.of(table, row_number)  # Строки с row_number и дальше
     }
+    if table.get('indexes'): # индексы частей строятся заново при первом поиске
+        table1['indexes'] = dict.fromkeys(table['indexes'])
+        table2['indexes'] = dict.fromkeys(table['indexes'])
     return table1, table2
 
-def auto_detect_column_types(table):
+@instrumented
+def auto_detect_column_types(table, sample_rows=None, sample_method="head"):
     """
     Автоматически определяет типы столбцов на основе их значений.
     Определяет типы данных при загрузке таблицы из файла.
 
     Args:
         table (dict): Таблица с ключами 'header' и 'rows'.
+        sample_rows (int, optional): Если указано, типы определяются по выборке из sample_rows строк.
+        sample_method (str): "head" - первые строки, "reservoir" - случайная выборка.
 
     Returns:
         dict: Словарь с определенными типами для каждого столбца.
 
     Raises:
-        ValueError: pass если не получилось преобразовать в нужный тип - пропускаем.
-        AttributeError: pass если value не является строкой.
-    """
-    column_types = {}
-
-    for col_index, col_name in enumerate(table['header']):
-        column_values = [row[col_index] for row in table['rows']]
-        try:
-            # Попробуем все значения преобразовать в int
-            if all(isinstance(int(value), int) for value in column_values): # if all() => True
-                column_types[col_name] = int # добавляем ключ со значением
-                continue
-        except ValueError:
-            pass
-
-        try:
-            # Попробуем все значения преобразовать в float
-            if all(isinstance(float(value), float) for value in column_values):
-                column_types[col_name] = float
-                continue
-        except ValueError:
-            pass
-
-        try:
-            # Проверим, если это булевы значения
-            if all(value.lower() in ("true", "false") for value in column_values):
-                column_types[col_name] = bool
-                continue
-        except AttributeError: # ловит ситуацию, если value не является строкой.
-            pass
-
-        # Если ничего не подошло, назначаем тип str
-        column_types[col_name] = str
-
-    return column_types
+        ValueError: Неизвестный способ выборки.
+    """
+    return infer_column_types(table, by_number=False, sample_rows=sample_rows, sample_method=sample_method)
+
+@instrumented
+def create_index(table, column=0):
+    """
+    Создаёт хеш-индекс по столбцу, который затем использует get_rows_by_index.
+
+    Индекс хранится в table['indexes'] и поддерживается функциями set_values, set_value,
+    set_column_types, concat и split, в том числе когда значения меняются через другую
+    таблицу с общими строками (результат concat, части split, представления). После изменения
+    строк в обход этих функций индекс нужно пересоздать (при изменении количества строк
+    он перестраивается сам).
+
+    Args:
+        table (dict): Таблица с ключами.
+        column (int or str): Индекс или имя столбца (по умолчанию 0).
+
+    Returns:
+        None
+
+    Raises:
+        TypeError: Если в столбце есть нехешируемые значения.
+    """
+    col_index = column if isinstance(column, int) else table['header'].index(column)
+    table.setdefault('indexes', {})[col_index] = HashIndex.build(table['rows'], col_index)
+
+@instrumented
+def drop_index(table, column=0):
+    """
+    Удаляет хеш-индекс по столбцу.
+
+    Args:
+        table (dict): Таблица с ключами.
+        column (int or str): Индекс или имя столбца (по умолчанию 0).
+
+    Returns:
+        None
+
+    Raises:
+        KeyError: Для столбца нет индекса.
+    """
+    col_index = column if isinstance(column, int) else table['header'].index(column)
+    if col_index not in table.get('indexes', {}):
+        raise KeyError(f"Для столбца {column} нет индекса.")
+    del table['indexes'][col_index]
+
+def _get_index(table, col_index):
+    """Возвращает актуальный индекс столбца, при необходимости перестраивая его; None, если индекса нет."""
+    indexes = table.get('indexes')
+    if not indexes or col_index not in indexes:
+        return None
+    index = indexes[col_index]
+    if index is None or not index.is_current(table['rows'], col_index): # индекс сброшен, строки изменены, добавлены или удалены
+        index = indexes[col_index] = HashIndex.build(table['rows'], col_index)
+    return index
 
 def is_float(value):
     """
@@ -1,19 +1,55 @@
-def save_table(table, file_path):
+import os
+from .instrumentation import instrumented
+from .io_utils import atomic_write, open_append, open_input
+from .render import render_table
+
+@instrumented(file_io=True)
+def save_table(table, file_path, compression="infer", level=None, background=False):
     """
     Сохраняет таблицу в текстовый файл в удобном для чтения виде.
 
+    Значения любых типов (например, после set_column_types) записываются через str,
+    None - как пустое значение.
+
     Args:
         table (dict): Таблица, представленная в виде словаря с ключами:
         file_path (str): Путь к текстовому файлу, в который будет сохранена таблица.
+        compression (str, optional): Сжатие: "infer" - по расширению (.gz, .bz2, .xz), "gzip", "bz2", "lzma" или None.
+        level (int, optional): Уровень сжатия (по умолчанию 6 для gzip и lzma, 9 для bz2).
+        background (bool): Если True, данные сжимаются в фоновом потоке.
 
     Raises:
         ValueError: Если возникает ошибка при сохранении файла (например, проблемы с доступом к файлу).
     """
     try:
-        with open(file_path, mode='w', encoding='utf-8') as file:
-            file.write('\t'.join(table['header']) + '\n') # записываем заголовок, объединяя элементы через табуляцию
-            for row in table['rows']:
-                file.write('\t'.join(row) + '\n') # записываем каждую строку таблицы
+        with atomic_write(file_path, mode='w', compression=compression, level=level, background=background,
+                          encoding='utf-8') as file: # временный файл заменит исходный после записи
+            render_table(table, file, null='') # заголовок и строки через табуляцию, пачками; None - пустое значение
     except Exception as e:
         raise ValueError(f"Ошибка при сохранении текстового файла {file_path}: {e}")
-        
+
+@instrumented(file_io=True)
+def append_table(table, file_path):
+    """
+    Дописывает строки таблицы в конец текстового файла, не перезаписывая его.
+
+    Args:
+        table (dict): Таблица с новыми строками.
+        file_path (str): Путь к текстовому файлу.
+
+    Raises:
+        ValueError: Заголовок файла не совпадает с заголовком таблицы (как в concat)
+                    или возникает ошибка при записи файла.
+    """
+    if not os.path.exists(file_path) or os.path.getsize(file_path) == 0:
+        save_table(table, file_path)
+        return
+    try:
+        with open_input(file_path, 'r', encoding='utf-8') as file:
+            header = file.readline().rstrip('\n')
+        if header != '\t'.join(table['header']):
+            raise ValueError("Таблицы имеют разные заголовки и не могут быть объединены.")
+        with open_append(file_path, 'a', encoding='utf-8') as file:
+            render_table(table, file, null='', header=False)
+    except Exception as e:
+        raise ValueError(f"Ошибка при дописывании в текстовый файл {file_path}: {e}")
@@ -0,0 +1,298 @@
+import random
+import re
+from collections import deque
+from itertools import islice, repeat
+from operator import itemgetter
+
+# решётка типов: bool и int ⊂ float ⊂ str. bool совместим только с bool,
+# потому что строки "true"/"false" нельзя преобразовать в int или float.
+# регулярные выражения повторяют синтаксис int() и float(), чтобы определённый тип всегда можно было преобразовать
+_DIGITS = r"\d+(?:_\d+)*"
+_INT_RE = re.compile(rf"\s*[+-]?{_DIGITS}\s*\Z")
+_FLOAT_RE = re.compile(rf"\s*[+-]?(?:(?:{_DIGITS}\.?(?:{_DIGITS})?|\.{_DIGITS})(?:[eE][+-]?{_DIGITS})?|inf(?:inity)?|nan)\s*\Z", re.IGNORECASE)
+_BOOL_VALUES = frozenset(("true", "false"))
+_PREFIX_ROWS = 1000 # сколько первых значений проверяется до построения множества различных значений
+
+
+def parse_bool(value):
+    """
+    Преобразует строку "true"/"false" (без учёта регистра) в bool.
+
+    В отличие от bool(value), строка "false" даёт False.
+
+    Args:
+        value (str or bool): Значение.
+
+    Returns:
+        bool
+
+    Raises:
+        ValueError: Если строка не является "true" или "false".
+    """
+    if isinstance(value, str):
+        lowered = value.lower()
+        if lowered == "true":
+            return True
+        if lowered == "false":
+            return False
+        raise ValueError(f"'{value}' не является булевым значением")
+    return bool(value)
+
+
+def converter_for(col_type):
+    """
+    Возвращает функцию преобразования строки в тип col_type.
+
+    Args:
+        col_type (type): Тип столбца.
+
+    Returns:
+        callable: parse_bool для bool, иначе сам тип.
+    """
+    return parse_bool if col_type is bool else col_type
+
+
+def join_types(type1, type2):
+    """
+    Возвращает наименьший тип, которому принадлежат значения обоих типов.
+
+    Args:
+        type1 (type or None): Первый тип (None - значений ещё не было).
+        type2 (type or None): Второй тип.
+
+    Returns:
+        type or None: int, float, bool или str.
+    """
+    if type1 is None or type1 is type2:
+        return type2
+    if type2 is None:
+        return type1
+    if {type1, type2} == {int, float}:
+        return float
+    return str
+
+
+def _widen(values, state):
+    """
+    Расширяет тип state по значениям столбца за один проход.
+
+    Каждое значение классифицируется не более одного раза: проверки идут
+    только от текущего типа вверх по решётке. Как только тип становится str,
+    проход прекращается. Пустые строки считаются пропусками и не влияют на тип.
+    """
+    for value in values:
+        if type(value) is not str: # значения, уже приведённые к типу (например, после set_column_types)
+            if value is None:
+                continue
+            state = join_types(state, type(value) if type(value) in (bool, int, float) else str)
+            if state is str:
+                return str
+            continue
+        if not value:
+            continue
+        if state is None or state is bool:
+            if value.lower() in _BOOL_VALUES:
+                state = bool
+                continue
+            if state is bool:
+                return str
+            state = int
+        if state is int:
+            if value.isdecimal() or _INT_RE.match(value):
+                continue
+            state = float
+        if _FLOAT_RE.match(value):
+            continue
+        return str
+    return state
+
+
+def _widen_bulk(values, state):
+    """
+    То же, что _widen, но сначала проверяет все значения сразу циклами на C
+    (str.isdecimal, int, float через map). Исключение возникает не больше одного раза
+    на проверку; если быстрая проверка не прошла (смешанные значения), используется _widen.
+    """
+    if not values:
+        return state
+    if not all(map(isinstance, values, repeat(str))):
+        return _widen(values, state)
+    try:
+        if state is None or state is bool:
+            if all(map(_BOOL_VALUES.__contains__, map(str.lower, values))):
+                return bool
+        if state is None or state is int:
+            if all(map(str.isdecimal, values)):
+                return int
+            try:
+                deque(map(int, values), maxlen=0)
+                return int
+            except ValueError:
+                pass
+        if state is not bool:
+            deque(map(float, values), maxlen=0)
+            return float
+    except ValueError:
+        pass
+    return _widen(values, state)
+
+
+def _infer_values(values, state):
+    """Расширяет состояние столбца по списку его значений."""
+    prefix = values[:_PREFIX_ROWS]
+    state = _widen(prefix, state) # текстовый столбец обычно виден уже по первым строкам
+    if state is not str and len(values) > _PREFIX_ROWS:
+        rest = values[_PREFIX_ROWS:]
+        try:
+            if len(set(prefix)) * 2 < len(prefix): # мало различных значений: каждое проверяем один раз
+                rest = set(rest)
+        except TypeError: # нехешируемые значения
+            pass
+        if isinstance(rest, set) or "" in rest:
+            rest = [value for value in rest if value != ""] # пустые строки не влияют на тип (None пропускает _widen)
+        state = _widen_bulk(rest, state)
+    return state
+
+def infer_type(values):
+    """
+    Определяет тип одного столбца по его значениям.
+
+    Args:
+        values (list): Значения столбца.
+
+    Returns:
+        type or None: int, float, bool или str; None, если непустых значений нет.
+    """
+    return _infer_values(values if isinstance(values, list) else list(values), None)
+
+
+class TypeInferencer:
+    """
+    Постепенное определение типов столбцов по частям таблицы.
+
+    Состояние каждого столбца - текущая точка решётки типов. Части можно
+    подавать через update по мере чтения файла, а состояния нескольких
+    определителей (например, из разных процессов) объединять через merge.
+
+    Args:
+        header (list): Заголовок таблицы.
+        sample_rows (int, optional): Если указано, типы определяются только по выборке из sample_rows строк.
+        sample_method (str): "head" - первые sample_rows строк, "reservoir" - равномерная случайная выборка.
+        seed (int, optional): Начальное значение генератора случайных чисел для "reservoir".
+    """
+
+    def __init__(self, header, sample_rows=None, sample_method="head", seed=None):
+        if sample_method not in ("head", "reservoir"):
+            raise ValueError(f"Неизвестный способ выборки: {sample_method}")
+        self.header = header
+        self.states = [None] * len(header) # None - в столбце ещё не было значений
+        self.sample_rows = sample_rows
+        self.sample_method = sample_method
+        self.rows_seen = 0
+        self._reservoir = [] if sample_rows is not None and sample_method == "reservoir" else None
+        self._random = random.Random(seed)
+
+    def update(self, rows):
+        """
+        Учитывает очередную часть строк.
+
+        Args:
+            rows: Строки (список строк, ColumnRows или любой итерируемый объект строк).
+        """
+        if self._reservoir is not None: # строки только попадают в выборку, типы считаются в states_for_result
+            reservoir, size = self._reservoir, self.sample_rows
+            for row in rows:
+                self.rows_seen += 1
+                if len(reservoir) < size:
+                    reservoir.append(row)
+                else:
+                    j = self._random.randrange(self.rows_seen)
+                    if j < size:
+                        reservoir[j] = row
+            return
+
+        if self.sample_rows is not None: # режим "head": учитываем строки, пока выборка не заполнится
+            left = self.sample_rows - self.rows_seen
+            if left <= 0:
+                return
+            if not hasattr(rows, '__len__') or len(rows) > left:
+                rows = rows[:left] if hasattr(rows, '__getitem__') else list(islice(rows, left))
+        elif not hasattr(rows, '__len__'):
+            rows = list(rows)
+
+        self.rows_seen += len(rows)
+        self.states = self._infer(rows, self.states)
+
+    def _infer(self, rows, states):
+        """Расширяет состояния столбцов по строкам rows."""
+        states = list(states)
+        stored_types = getattr(rows, 'column_types', None) # у столбцовых строк типы уже известны
+        columns = getattr(rows, 'columns', None)
+        for i, state in enumerate(states):
+            if state is str: # столбец уже расширился до str, дальше смотреть незачем
+                continue
+            if stored_types is not None and stored_types[i] not in (str, object):
+                states[i] = join_types(state, stored_types[i]) if len(rows) else state
+                continue
+            values = getattr(columns[i], 'dictionary', None) if columns is not None else None # словарный столбец: достаточно различных значений
+            if values is None:
+                values = rows.get_column(i) if hasattr(rows, 'get_column') else list(map(itemgetter(i), rows))
+            states[i] = _infer_values(values, state)
+        return states
+
+    def merge(self, other):
+        """
+        Объединяет состояние другого определителя с текущим.
+
+        Args:
+            other (TypeInferencer): Определитель по другой части той же таблицы.
+        """
+        if other._reservoir is not None:
+            other_states = other._infer(other._reservoir, [None] * len(other.header))
+        else:
+            other_states = other.states
+        if self._reservoir is not None:
+            self.states = self._infer(self._reservoir, self.states)
+            self._reservoir = []
+        self.states = [join_types(a, b) for a, b in zip(self.states, other_states)]
+        self.rows_seen += other.rows_seen
+
+    def result(self, by_number=False):
+        """
+        Возвращает определённые типы.
+
+        Args:
+            by_number (bool): Если True, ключами будут индексы столбцов, иначе названия столбцов.
+
+        Returns:
+            dict: Словарь с типами данных для каждого столбца (столбцы без значений получают str).
+        """
+        states = self.states
+        if self._reservoir is not None:
+            states = self._infer(self._reservoir, states)
+        return {i if by_number else col: state or str for i, (col, state) in enumerate(zip(self.header, states))}
+
+
+def infer_column_types(table, by_number=False, sample_rows=None, sample_method="head", seed=None):
+    """
+    Определяет типы столбцов таблицы за один проход по каждому столбцу.
+
+    Args:
+        table (dict): Таблица с ключами 'header' и 'rows'.
+        by_number (bool): Если True, ключами будут индексы столбцов, иначе названия столбцов.
+        sample_rows (int, optional): Определять типы только по выборке из sample_rows строк.
+        sample_method (str): "head" - первые строки, "reservoir" - случайная выборка.
+        seed (int, optional): Начальное значение генератора случайных чисел для "reservoir".
+
+    Returns:
+        dict: Словарь с типами данных для каждого столбца.
+    """
+    inferencer = TypeInferencer(table['header'], sample_rows, sample_method, seed)
+    rows = table['rows']
+    if sample_rows is not None and sample_method == "reservoir" and hasattr(rows, '__getitem__') and len(rows) > sample_rows:
+        # для таблицы в памяти выборка строится сразу по номерам строк
+        positions = sorted(inferencer._random.sample(range(len(rows)), sample_rows))
+        rows = rows.take(positions) if hasattr(rows, 'take') else [rows[i] for i in positions]
+        inferencer = TypeInferencer(table['header'])
+    inferencer.update(rows)
+    return inferencer.result(by_number)
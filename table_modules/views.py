@@ -0,0 +1,154 @@
+from collections.abc import Sequence
+from .index import invalidate_index, touch_storage
+from .type_inference import converter_for
+
+
+class TableView(Sequence):
+    """
+    Представление строк родительской таблицы без копирования.
+
+    Хранит ссылку на родительскую таблицу и номера строк (range или список),
+    поэтому создаётся за O(1) независимо от размера выборки. Используется как
+    значение ключа 'rows', так что print_table, get_values и функции сохранения
+    работают с ним как с обычным списком строк.
+
+    Запись через set_cell/set_column/set_column_type:
+    - copy_on_write=False - изменяет строки родительской таблицы (как срез списка строк);
+    - copy_on_write=True - копирует изменяемую строку при первой записи, родитель не меняется.
+    """
+
+    def __init__(self, table, positions, copy_on_write=False):
+        self.table = table # родительская таблица (dict с ключами 'header' и 'rows')
+        self.positions = positions # номера строк родителя
+        self.copy_on_write = copy_on_write
+        self._copies = {} # номер строки в представлении -> копия строки (только при copy_on_write)
+
+    @classmethod
+    def of(cls, table, start=None, stop=None, step=None, copy_on_write=False):
+        """
+        Создаёт представление диапазона строк таблицы.
+
+        Если таблица сама является представлением без изменённых строк с тем же
+        copy_on_write, новое представление ссылается сразу на исходную таблицу. Иначе
+        оно ссылается на представление: например, запись через представление без
+        копирования попадает в копии строк родительского представления copy_on_write.
+
+        Args:
+            table (dict): Таблица с ключами 'header' и 'rows'.
+            start, stop, step (int, optional): Диапазон строк, как в срезе списка.
+            copy_on_write (bool): Копировать строки при записи.
+
+        Returns:
+            TableView: Представление строк.
+        """
+        rows = table['rows']
+        positions = range(len(rows))[start:stop:step]
+        if isinstance(rows, TableView) and not rows._copies and rows.copy_on_write == copy_on_write: # не строим цепочку представлений
+            return cls(rows.table, rows.positions[start:stop:step], copy_on_write)
+        return cls(table, positions, copy_on_write)
+
+    def __len__(self):
+        return len(self.positions)
+
+    def __getitem__(self, index):
+        if isinstance(index, slice):
+            if self._copies:
+                return TableView({"header": self.table['header'], "rows": self}, range(len(self))[index], self.copy_on_write)
+            return TableView(self.table, self.positions[index], self.copy_on_write)
+        if index < 0:
+            index += len(self.positions)
+        if self._copies and index in self._copies:
+            return self._copies[index]
+        return self.table['rows'][self.positions[index]]
+
+    def __iter__(self):
+        rows = self.table['rows']
+        if not self._copies:
+            return map(rows.__getitem__, self.positions)
+        copies = self._copies
+        return (copies[i] if i in copies else rows[position] for i, position in enumerate(self.positions))
+
+    def __add__(self, other):
+        return list(self) + list(other)
+
+    def __radd__(self, other):
+        return list(other) + list(self)
+
+    def __eq__(self, other):
+        if isinstance(other, Sequence) and not isinstance(other, str):
+            return len(self) == len(other) and all(list(a) == list(b) for a, b in zip(self, other))
+        return NotImplemented
+
+    def __reduce__(self):
+        # при сериализации (например, save_pickle) сохраняются только видимые строки
+        return list, (self.materialize(),)
+
+    @property
+    def column_types(self):
+        """Типы столбцов родителя, если он хранится по столбцам, иначе None."""
+        return None if self._copies else getattr(self.table['rows'], 'column_types', None)
+
+    def materialize(self):
+        """Возвращает видимые строки в виде нового списка строк."""
+        return [list(row) for row in self]
+
+    def get_column(self, col_index):
+        """Возвращает значения столбца списком."""
+        rows = self.table['rows']
+        if hasattr(rows, 'columns') and not self._copies: # столбцовый родитель: читаем прямо из столбца
+            column = rows.columns[col_index]
+            return [column[i] for i in self.positions]
+        return [row[col_index] for row in self]
+
+    def set_cell(self, row_index, col_index, value):
+        """Записывает значение в ячейку (с копированием строки при copy_on_write)."""
+        self._invalidate(col_index)
+        self._write(row_index, col_index, value)
+
+    def set_column(self, col_index, values):
+        """Записывает значения в столбец."""
+        self._invalidate(col_index) # индексы и статистика сбрасываются один раз на столбец, а не на ячейку
+        for row_index, value in enumerate(values):
+            self._write(row_index, col_index, value)
+
+    def set_column_type(self, col_index, col_type):
+        """Приводит значения столбца к типу col_type."""
+        convert = converter_for(col_type)
+        self._invalidate(col_index)
+        for row_index, value in enumerate(self.get_column(col_index)):
+            try:
+                self._write(row_index, col_index, convert(value))
+            except ValueError:
+                raise ValueError(f"Невозможно преобразовать значение '{value}' в {col_type.__name__}")
+
+    def _invalidate(self, col_index):
+        """Сообщает индексам и статистике об изменении столбца: своих копий строк или строк родителя."""
+        if self.copy_on_write:
+            touch_storage(self, col_index) # меняются только копии строк в самом представлении
+        else:
+            invalidate_index(self.table, col_index)
+
+    def _write(self, row_index, col_index, value):
+        if row_index < 0:
+            row_index += len(self.positions)
+        if self.copy_on_write:
+            row = self._copies.get(row_index)
+            if row is None:
+                row = self._copies[row_index] = list(self[row_index])
+            row[col_index] = value
+            return
+        rows = self.table['rows']
+        if hasattr(rows, 'set_cell'):
+            rows.set_cell(self.positions[row_index], col_index, value)
+        else:
+            rows[self.positions[row_index]][col_index] = value
+
+    def take(self, positions):
+        """Возвращает представление строк по указанным позициям (без копирования)."""
+        positions = list(positions)
+        if self._copies:
+            return TableView({"header": self.table['header'], "rows": self}, positions, self.copy_on_write)
+        return TableView(self.table, [self.positions[i] for i in positions], self.copy_on_write)
+
+    def __repr__(self):
+        return f"TableView({len(self.positions)} rows, copy_on_write={self.copy_on_write})"
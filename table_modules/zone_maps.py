@@ -0,0 +1,180 @@
+from .index import RowsStamp
+from .type_inference import converter_for
+
+STATS_STEP = 1000 # строк в одной части (совпадает с шагом индекса строк CSV)
+STATS_VERSION = 1
+
+
+def compute_stats(table, step=STATS_STEP, column_types=None):
+    """
+    Вычисляет статистику частей таблицы (zone maps).
+
+    Строки делятся на части по step строк; для каждого столбца и каждой части
+    запоминаются минимум, максимум, количество пустых значений и количество
+    различных значений. По ней фильтр пропускает части, в которых заведомо нет
+    подходящих строк, а count/min/max вычисляются без чтения данных.
+
+    Args:
+        table (dict): Таблица с ключами 'header' и 'rows'.
+        step (int): Строк в одной части.
+        column_types (dict, optional): Типы столбцов (ключи - имена). С типом статистика считается по
+                                       значениям, какими их прочитает load_csv с такой схемой: в столбцах
+                                       str значения - строки (None - пустая строка), в остальных строки
+                                       приводятся к типу, а пустые считаются пустыми значениями.
+                                       Без типа статистика считается по значениям как они есть.
+
+    Returns:
+        dict: {"version", "step", "rows", "header", "types", "columns", "stamp"}, где columns[имя] -
+              словарь списков по частям: "min", "max", "nulls", "distinct". Если значения части
+              нельзя сравнить между собой, её min и max - None. stamp - отметка строк (RowsStamp):
+              после изменения значений через любую таблицу с общими строками статистика не используется.
+
+    Raises:
+        ValueError: Если step меньше 1 или значение не приводится к типу столбца.
+    """
+    if step < 1:
+        raise ValueError("Размер части step должен быть не меньше 1.")
+    header = table['header']
+    rows = table['rows']
+    column_types = column_types or {}
+    stats = {"version": STATS_VERSION, "step": step, "rows": len(rows), "header": list(header),
+             "types": {name: column_types.get(name) for name in header}, "columns": {}}
+    for i, name in enumerate(header):
+        values = rows.get_column(i) if hasattr(rows, 'get_column') else [row[i] for row in rows]
+        col_type = column_types.get(name)
+        column = stats['columns'][name] = {"min": [], "max": [], "nulls": [], "distinct": []}
+        for start in range(0, len(values), step):
+            _add_chunk(column, _as_read(values[start:start + step], col_type, name))
+    stats['stamp'] = RowsStamp(rows)
+    return stats
+
+def stamp_stats(stats, table):
+    """Возвращает статистику, загруженную вместе с таблицей, с отметкой её строк."""
+    return {**stats, "stamp": RowsStamp(table['rows'])}
+
+def without_stamp(stats):
+    """Статистика без отметки строк - для записи в файл (отметка относится к строкам в памяти)."""
+    return {key: value for key, value in stats.items() if key != 'stamp'}
+
+def _as_read(values, col_type, name):
+    """Значения части столбца такими, какими их прочитает load_csv со схемой (без типа - как есть)."""
+    if col_type is None:
+        return values
+    if col_type is str:
+        return ["" if value is None else value if value.__class__ is str else str(value) for value in values]
+    convert = converter_for(col_type)
+    try:
+        return [None if value is None or value == "" else convert(value) if isinstance(value, str) else value
+                for value in values]
+    except ValueError as e:
+        raise ValueError(f"Невозможно преобразовать столбец '{name}': {e}")
+
+def _add_chunk(column, values):
+    """Добавляет статистику одной части столбца."""
+    present = [value for value in values if value is not None]
+    try:
+        low, high = (min(present), max(present)) if present else (None, None)
+    except TypeError: # значения разных несравнимых типов
+        low = high = None
+    try:
+        distinct = len(set(present))
+    except TypeError: # нехешируемые значения
+        distinct = len(present)
+    column['min'].append(low)
+    column['max'].append(high)
+    column['nulls'].append(len(values) - len(present))
+    column['distinct'].append(distinct)
+
+def chunk_rows(stats, chunk):
+    """Количество строк в части chunk."""
+    return min(stats['step'], stats['rows'] - chunk * stats['step'])
+
+def matching_chunks(stats, column, op, value):
+    """
+    Номера частей, в которых могут быть строки, удовлетворяющие условию "значение op value".
+
+    Части отбрасываются только тогда, когда статистика это гарантирует: пустые значения
+    (None) проходят только условия "!=" и "not in", а часть с несравнимыми значениями
+    или несравнимым value не отбрасывается.
+
+    Args:
+        stats (dict): Статистика (compute_stats).
+        column (str): Имя столбца.
+        op (str or callable): Оператор, как в Query.filter; для функции подходят все части.
+        value: Значение для сравнения (для "in" и "not in" - набор значений).
+
+    Returns:
+        list: Возрастающие номера частей.
+    """
+    count = len(stats['columns'][column]['min'])
+    if callable(op):
+        return list(range(count))
+    column_stats = stats['columns'][column]
+    chunks = []
+    for chunk, (low, high, nulls) in enumerate(zip(column_stats['min'], column_stats['max'], column_stats['nulls'])):
+        rows = chunk_rows(stats, chunk)
+        try:
+            if _may_match(op, value, low, high, nulls, rows):
+                chunks.append(chunk)
+        except TypeError: # value нельзя сравнить со значениями столбца - часть не отбрасываем
+            chunks.append(chunk)
+    return chunks
+
+def _may_match(op, value, low, high, nulls, rows):
+    if op in ("!=", "not in"):
+        if nulls or low is None or low != high: # есть пустые или хотя бы два разных значения
+            return True
+        return low != value if op == "!=" else low not in value
+    if low is None: # все значения пустые (или несравнимые, если nulls < rows)
+        return nulls < rows or (op == "in" and None in value) or (op == "==" and value is None)
+    if op == "==":
+        return low <= value <= high
+    if op == "in":
+        return any(low <= item <= high for item in value if item is not None) or (nulls > 0 and None in value)
+    if op == "<":
+        return low < value
+    if op == "<=":
+        return low <= value
+    if op == ">":
+        return high > value
+    if op == ">=":
+        return high >= value
+    return True
+
+def summarize(stats, column):
+    """
+    Итоговые значения столбца по статистике частей (данные не читаются).
+
+    Args:
+        stats (dict): Статистика (compute_stats).
+        column (str): Имя столбца.
+
+    Returns:
+        dict: {"rows", "count" (непустые значения), "nulls", "min", "max"}. min и max - None,
+              если непустых значений нет.
+
+    Raises:
+        ValueError: Столбца нет в статистике или значения частей нельзя сравнить между собой.
+    """
+    if column not in stats['columns']:
+        raise ValueError(f"Столбец '{column}' не найден.")
+    column_stats = stats['columns'][column]
+    nulls = sum(column_stats['nulls'])
+    lows = [value for value in column_stats['min'] if value is not None]
+    highs = [value for value in column_stats['max'] if value is not None]
+    if len(lows) != sum(1 for chunk, n in enumerate(column_stats['nulls']) if n < chunk_rows(stats, chunk)):
+        raise ValueError(f"Значения столбца '{column}' нельзя сравнить между собой.")
+    try:
+        low, high = (min(lows), max(highs)) if lows else (None, None)
+    except TypeError:
+        raise ValueError(f"Значения столбца '{column}' нельзя сравнить между собой.")
+    return {"rows": stats['rows'], "count": stats['rows'] - nulls, "nulls": nulls, "min": low, "max": high}
+
+def stats_match(stats, table):
+    """
+    True, если статистика относится к таблице: тот же заголовок и количество строк, и значения
+    не менялись с момента вычисления (в том числе через concat, split и представления с общими строками).
+    """
+    return (isinstance(stats, dict) and stats.get('version') == STATS_VERSION
+            and stats['header'] == list(table['header']) and stats['rows'] == len(table['rows'])
+            and stats.get('stamp') is not None and stats['stamp'].is_current(table['rows']))
@@ -0,0 +1,113 @@
+"""Столбцовые таблицы (ColumnRows, DictionaryColumn) ведут себя так же, как списки строк."""
+import pickle
+
+import pytest
+
+from table_modules import (
+    compact, concat, concat_many, create_index, drop_index, format_table, get_column_types, get_rows_by_index,
+    get_rows_by_number, get_value, get_values, set_column_types, set_value, set_values, split, to_columnar, to_rows
+)
+from table_modules.columnar import ColumnRows
+
+HEADER = ["city", "count", "price", "note"]
+ROWS = [["Москва", 3, 1.5, "a"], ["Казань", 1, None, None], ["Москва", 2, 4.0, "b"], ["Омск", 5, 0.5, "c"]]
+TYPES = {"city": str, "count": int, "price": float, "note": str}
+
+
+def row_table():
+    return {"header": list(HEADER), "rows": [list(row) for row in ROWS], "column_types": dict(TYPES)}
+
+def columnar_table():
+    return to_columnar(row_table())
+
+def dictionary_table():
+    return to_columnar(row_table(), dictionary_columns=["city", "note"])
+
+MAKERS = [columnar_table, dictionary_table]
+
+
+def rows(table):
+    return [list(row) for row in table['rows']]
+
+@pytest.fixture(params=MAKERS, ids=["columnar", "dictionary"])
+def pair(request):
+    """(таблица из списка строк, такая же столбцовая таблица)."""
+    return row_table(), request.param()
+
+
+def test_conversion_round_trip(pair):
+    plain, columnar = pair
+    assert isinstance(columnar['rows'], ColumnRows)
+    assert rows(columnar) == ROWS
+    assert to_rows(columnar)['rows'] == ROWS
+
+def test_pickle_keeps_columns(pair):
+    _, columnar = pair
+    for protocol in (4, 5):
+        assert rows({"rows": pickle.loads(pickle.dumps(columnar['rows'], protocol=protocol))}) == ROWS
+
+def test_get_rows_by_number(pair):
+    for table in pair:
+        assert rows(get_rows_by_number(table, 1, 3)) == ROWS[1:3]
+
+@pytest.mark.parametrize("indexed", [False, True])
+def test_get_rows_by_index(pair, indexed):
+    results = []
+    for table in pair:
+        if indexed:
+            create_index(table, "city")
+        results.append((rows(get_rows_by_index(table, "Москва", "Омск", column="city")),
+                        rows(get_rows_by_index(table, "нет", column="city"))))
+    assert results[0] == results[1] == ([ROWS[0], ROWS[2], ROWS[3]], [])
+
+def test_column_types(pair):
+    plain, columnar = pair
+    assert get_column_types(plain, by_number=False) == get_column_types(columnar, by_number=False)
+    for table in pair:
+        set_column_types(table, {"count": float}, by_number=False)
+    assert get_values(plain, "count") == get_values(columnar, "count") == [3.0, 1.0, 2.0, 5.0]
+
+def test_get_values_and_value(pair):
+    plain, columnar = pair
+    first_plain, first_columnar = get_rows_by_number(plain, 1, 2), get_rows_by_number(columnar, 1, 2)
+    for column in HEADER:
+        assert get_values(plain, column) == get_values(columnar, column)
+        assert get_value(first_plain, column) == get_value(first_columnar, column)
+
+@pytest.mark.parametrize("values", [[10, 20, 30, 40], ["w", "x", None, "z"], [1, "два", 3.0, None]])
+@pytest.mark.parametrize("column", HEADER)
+def test_set_values_keeps_value_types(pair, column, values):
+    for table in pair:
+        set_values(table, values, column)
+    assert get_values(pair[0], column) == get_values(pair[1], column) == values
+    assert rows(pair[0]) == rows(pair[1])
+
+def test_set_value(pair):
+    pages = [get_rows_by_number(table, 1, 2) for table in pair]
+    for page in pages:
+        set_value(page, "Тверь", "city")
+        set_value(page, 7, "count")
+    assert rows(pair[0]) == rows(pair[1])
+    assert rows(pair[1])[1][:2] == ["Тверь", 7]
+
+def test_concat_split_compact(pair):
+    results = []
+    for table in pair:
+        joined = concat(table, table)
+        many = concat_many([table, table, table])
+        first, second = split(joined, 3)
+        results.append((rows(joined), rows(many), rows(first), rows(second), rows(compact(joined))))
+    assert results[0] == results[1]
+    assert results[0][0] == ROWS + ROWS
+
+def test_drop_index(pair):
+    for table in pair:
+        create_index(table, "city")
+        drop_index(table, "city")
+        with pytest.raises(KeyError):
+            drop_index(table, "city")
+
+def test_format_table(pair):
+    plain, columnar = pair
+    assert format_table(plain) == format_table(columnar)
+    assert format_table(plain, align=True, head=1, tail=1) == format_table(columnar, align=True, head=1, tail=1)
@@ -0,0 +1,122 @@
+"""Сохранение и загрузка таблиц во всех форматах."""
+import pickle
+
+import pytest
+
+from table_modules import (
+    append_csv, append_pickle, build_csv_stats, get_rows_by_number, iter_csv, load_binary, load_csv,
+    load_csv_parallel, load_pickle, save_binary, save_csv, save_pickle, save_text, scan_csv, to_columnar
+)
+
+HEADER = ["id", "name", "score", "flag"]
+ROWS = [["1", "Анна", "2.5", "true"], ["2", "Борис", "", "false"], ["3", "в \"кавычках\", с запятой", "4", "true"]]
+
+
+def table():
+    return {"header": list(HEADER), "rows": [list(row) for row in ROWS]}
+
+def load_csv_from(tmp_path, source, **options):
+    path = str(tmp_path / "source.csv")
+    save_csv(source, path)
+    return load_csv(path, **options)
+
+def typed_table(tmp_path):
+    return load_csv_from(tmp_path, table(), auto_detect_types=True)
+
+
+@pytest.mark.parametrize("name", ["t.csv", "t.csv.gz", "t.csv.bz2", "t.csv.xz"])
+def test_csv_round_trip(tmp_path, name):
+    path = str(tmp_path / name)
+    save_csv(table(), path)
+    loaded = load_csv(path)
+    assert loaded['header'] == HEADER
+    assert loaded['rows'] == ROWS
+
+def test_csv_types_and_empty_cells(tmp_path):
+    loaded = load_csv_from(tmp_path, table(), auto_detect_types=True)
+    assert loaded['column_types'] == {"id": int, "name": str, "score": float, "flag": bool}
+    columnar = load_csv_from(tmp_path, table(), auto_detect_types=True, columnar=True)
+    assert list(columnar['rows']) == [[1, "Анна", 2.5, True], [2, "Борис", None, False],
+                                      [3, ROWS[2][1], 4.0, True]]
+
+def test_csv_append_and_row_index(tmp_path):
+    path = str(tmp_path / "t.csv")
+    save_csv(table(), path, row_index=True)
+    append_csv({"header": list(HEADER), "rows": [["4", "Вера", "1", "false"]]}, path)
+    assert load_csv(path)['rows'] == ROWS + [["4", "Вера", "1", "false"]]
+    assert list(get_rows_by_number(path, 1, 3)['rows']) == ROWS[1:3]
+
+def test_iter_csv_chunks(tmp_path):
+    path = str(tmp_path / "t.csv")
+    save_csv(table(), path)
+    chunks = list(iter_csv(path, chunk_rows=2))
+    assert [len(chunk['rows']) for chunk in chunks] == [2, 1]
+    assert [row for chunk in chunks for row in chunk['rows']] == ROWS
+
+def test_csv_parallel_matches_serial(tmp_path):
+    path = str(tmp_path / "big.csv")
+    rows = [[str(i), f"имя {i}", f"{i}.5", "true"] for i in range(5000)]
+    save_csv({"header": list(HEADER), "rows": rows}, path)
+    parallel = load_csv_parallel(path, workers=2, min_range_bytes=1024)
+    assert list(parallel['rows']) == rows
+
+def test_scan_csv_with_stats(tmp_path):
+    path = str(tmp_path / "big.csv")
+    rows = [[str(i), f"n{i}", str(i % 7), "true"] for i in range(3000)]
+    save_csv({"header": list(HEADER), "rows": rows}, path, stats=True)
+    query = scan_csv(path, schema={"id": int}).filter("id", ">=", 2990)
+    assert [row[0] for row in query.collect()['rows']] == list(range(2990, 3000))
+    assert scan_csv(path).count() == 3000
+    assert scan_csv(path, schema={"id": int}).max("id") == 2999
+    assert build_csv_stats(path)['rows'] == 3000
+
+@pytest.mark.parametrize("name", ["t.pkl", "t.pkl.gz", "t.pkl.xz"])
+@pytest.mark.parametrize("columnar", [False, True])
+def test_pickle_round_trip(tmp_path, name, columnar):
+    source = typed_table(tmp_path)
+    if columnar:
+        source = to_columnar(source)
+    path = str(tmp_path / name)
+    save_pickle(source, path, stats=True)
+    loaded = load_pickle(path, auto_detect_types=True)
+    assert list(loaded['rows']) == list(source['rows'])
+    assert loaded['column_types'] == source['column_types']
+    assert 'stats' in loaded
+
+def test_pickle_types_are_not_reinferred(tmp_path, monkeypatch):
+    path = str(tmp_path / "t.pkl")
+    save_pickle(table(), path, detect_types=True)
+    import table_modules.pickle_module as pickle_module
+    monkeypatch.setattr(pickle_module, "auto_detect_column_types", lambda *args, **kwargs: pytest.fail("типы определяются заново"))
+    assert load_pickle(path, auto_detect_types=True)['column_types']['score'] is float
+
+def test_pickle_append_and_legacy_files(tmp_path):
+    path = str(tmp_path / "t.pkl")
+    save_pickle(table(), path)
+    append_pickle(table(), path)
+    assert list(load_pickle(path)['rows']) == ROWS + ROWS
+    with pytest.raises(ValueError):
+        append_pickle({"header": ["другой"], "rows": []}, path)
+
+    legacy = str(tmp_path / "legacy.pkl")
+    with open(legacy, "wb") as file:
+        pickle.dump(table(), file)
+    append_pickle(table(), legacy)
+    assert list(load_pickle(legacy)['rows']) == ROWS + ROWS
+
+@pytest.mark.parametrize("use_mmap", [False, True])
+def test_binary_round_trip(tmp_path, use_mmap):
+    source = to_columnar(typed_table(tmp_path), dictionary_columns=["name"])
+    path = str(tmp_path / "t.bin")
+    save_binary(source, path)
+    loaded = load_binary(path, use_mmap=use_mmap)
+    assert loaded['header'] == HEADER
+    assert list(loaded['rows']) == list(source['rows'])
+    save_binary(typed_table(tmp_path), path) # список строк с пустыми ячейками в числовом столбце
+    assert list(load_binary(path, use_mmap=use_mmap)['rows'])[1] == [2, "Борис", None, False]
+
+def test_text_keeps_ragged_rows(tmp_path):
+    path = str(tmp_path / "t.txt")
+    save_text({"header": ["a", "b", "c"], "rows": [["1", "2", "3"], ["4", "5"], ["6", "7", "8", "9"]]}, path)
+    with open(path, encoding="utf-8") as file:
+        assert file.read() == "a\tb\tc\n1\t2\t3\n4\t5\n6\t7\t8\t9\n"
@@ -0,0 +1,126 @@
+"""Индексы и статистика частей остаются верными при изменении строк через concat, split и представления."""
+import gc
+
+import pytest
+
+from table_modules import (
+    compute_stats, concat, create_index, get_rows_by_index, get_rows_by_number, load_csv_cached, load_pickle,
+    save_csv, save_pickle, set_value, set_values, split, to_columnar
+)
+from table_modules import index
+
+
+def table(prefix="k", count=3):
+    return {"header": ["key", "value"], "rows": [[f"{prefix}{i}", str(i)] for i in range(count)]}
+
+def found(table, *values, **options):
+    return [list(row) for row in get_rows_by_index(table, *values, **options)['rows']]
+
+@pytest.fixture(params=["rows", "columnar"])
+def make(request):
+    if request.param == "rows":
+        return table
+    return lambda *args: to_columnar(table(*args), {"key": str, "value": str})
+
+
+def test_source_edit_is_seen_by_concat(make):
+    first, second = make(), make()
+    create_index(first)
+    joined = concat(first, second)
+    create_index(joined)
+    assert len(found(joined, "k0")) == 2
+    set_values(first, ["x", "y", "z"], "key")
+    assert found(joined, "k0") == [["k0", "0"]]
+    assert found(joined, "x") == [["x", "0"]]
+
+def test_concat_edit_is_seen_by_sources(make):
+    first, second = make(), make()
+    create_index(first)
+    create_index(second)
+    joined = concat(first, second)
+    set_values(joined, ["a", "b", "c", "d", "e", "f"], "key")
+    assert found(first, "k0") == []
+    assert found(first, "a") == [["a", "0"]]
+    assert found(second, "d") == [["d", "0"]]
+
+def test_split_half_sees_parent_edit(make):
+    parent = make()
+    create_index(parent)
+    first, second = split(parent, 2)
+    assert found(first, "k0") == [["k0", "0"]]
+    set_values(parent, ["x", "y", "z"], "key")
+    assert found(first, "k0") == []
+    assert found(first, "x") == [["x", "0"]]
+    set_value(get_rows_by_number(second, 0, 1), "q", "key")
+    assert found(parent, "q") == [["q", "2"]]
+
+def test_view_column_write_invalidates_once(monkeypatch):
+    source = table(count=100)
+    create_index(source)
+    calls = []
+    original = index.invalidate_index
+    monkeypatch.setattr("table_modules.views.invalidate_index", lambda *args: calls.append(args) or original(*args))
+    set_values(get_rows_by_number(source, 0, 50), ["v"] * 50, "key")
+    assert len(calls) == 1
+    assert len(found(source, "v")) == 50
+
+def test_version_registry_is_pruned():
+    gc.collect()
+    before = len(index._watched)
+    tables = [table() for _ in range(10)]
+    for item in tables:
+        create_index(item)
+        found(item, "k0")
+    assert len(index._watched) == before + 10
+    del tables, item
+    gc.collect()
+    assert len(index._watched) == before
+
+@pytest.mark.parametrize("copy_table", [False, True])
+@pytest.mark.parametrize("indexed", [False, True])
+def test_copy_table_on_every_path(make, copy_table, indexed):
+    source = make()
+    if indexed:
+        create_index(source)
+    result = get_rows_by_index(source, "k1", copy_table=copy_table)
+    set_values(result, ["changed"], "key")
+    assert found(result, "changed") == [["changed", "1"]]
+    expected = "k1" if copy_table or not isinstance(source['rows'], list) else "changed"
+    assert [row[0] for row in source['rows']][1] == expected
+
+def test_stats_follow_shared_rows(tmp_path):
+    path = str(tmp_path / "t.pkl")
+    save_pickle(table(count=3000), path, stats=True)
+    first, second = load_pickle(path), load_pickle(path)
+    assert found(first, "k5") == [["k5", "5"]]
+    joined = concat(first, second)
+    set_values(joined, ["NEW"] * 6000, "key")
+    assert len(found(first, "NEW")) == 3000
+
+    save_pickle(first, path) # устаревшая статистика пересчитывается, а не записывается как есть
+    reloaded = load_pickle(path)
+    assert reloaded['stats']['columns']['key']['min'] == ["NEW"] * 3
+    assert len(found(reloaded, "NEW")) == 3000
+
+def test_compute_stats_is_stamped():
+    source = table(count=2500)
+    source['stats'] = compute_stats(source)
+    first, _ = split(source, 1000)
+    set_values(first, ["z"] * 1000, "key")
+    assert len(found(source, "z")) == 1000
+
+def test_write_through_page_of_cached_table(tmp_path):
+    path = str(tmp_path / "t.csv")
+    save_csv(table(), path)
+    cached = load_csv_cached(path)
+    set_value(get_rows_by_number(cached, 0, 1), "Z", "key")
+    assert [row[0] for row in cached['rows']] == ["Z", "k1", "k2"]
+    assert [row[0] for row in load_csv_cached(path)['rows']] == ["k0", "k1", "k2"]
+
+def test_copy_on_write_page_of_view():
+    source = table()
+    view = get_rows_by_number(source, 0, 2)
+    set_value(get_rows_by_number(view, 1, 2, copy_table=True), "Q", "key")
+    assert [row[0] for row in view['rows']] == ["k0", "k1"]
+    set_value(get_rows_by_number(view, 1, 2), "R", "key")
+    assert source['rows'][1][0] == "R"
@@ -0,0 +1,108 @@
+"""Группировка, соединение, сортировка, вывод и определение типов."""
+import asyncio
+
+import pytest
+
+from table_modules import (
+    format_table, group_by, join, load_csv, load_csv_async, load_dataset, load_many_async, save_csv, save_pickle,
+    set_column_types, sort_table, to_columnar
+)
+from table_modules.type_inference import infer_column_types, infer_type
+
+
+def test_aggregate_raw_strings():
+    table = {"header": ["k", "v", "s"], "rows": [["a", "1", "x"], ["a", "10", "y"], ["b", "", "z"], ["b", "3", ""]]}
+    result = group_by(table, "k").agg({"v": ["sum", "min", "max", "mean", "count"], "s": "min"})
+    assert result['rows'] == [["a", 11, 1, 10, 5.5, 2, "x"], ["b", 3, 3, 3, 3.0, 1, "z"]]
+    with pytest.raises(ValueError):
+        group_by(table, "k").agg({"s": "sum"})
+
+def test_aggregate_widens_types_across_chunks():
+    partial = group_by({"header": ["k", "v"], "rows": [["a", "1"], ["a", "2"]], "column_types": {"v": int}}, "k").partial({"v": "sum"})
+    partial.update({"header": ["k", "v"], "rows": [["a", "43.5"]], "column_types": {"v": float}})
+    result = partial.result()
+    assert result['rows'] == [["a", 46.5]]
+    assert result['column_types']['v_sum'] is float
+
+def test_aggregate_columnar_matches_rows():
+    table = {"header": ["k", "v"], "rows": [["a", 1], ["b", 2], ["a", 3]], "column_types": {"k": str, "v": int}}
+    spec = {"v": ["sum", "mean", "nunique"]}
+    assert group_by(table, "k").agg(spec) == group_by(to_columnar(table), "k").agg(spec)
+
+@pytest.mark.parametrize("strategy", ["auto", "hash", "merge"])
+@pytest.mark.parametrize("how", ["inner", "left", "outer"])
+def test_join_strategies_agree(strategy, how):
+    left = {"header": ["id", "a"], "rows": [[1, "x"], [2, "y"], [2, "y2"], [4, "w"]]}
+    right = {"header": ["id", "b"], "rows": [[2, "p"], [3, "q"], [4, "r"]]}
+    expected = join(left, right, "id", how=how, strategy="hash")
+    result = join(left, right, "id", how=how, strategy=strategy)
+    assert sorted(result['rows'], key=repr) == sorted(expected['rows'], key=repr)
+
+def test_join_auto_with_incomparable_keys():
+    left = {"header": ["id", "a"], "rows": [[1, "x"], [2, "y"]]}
+    right = {"header": ["id", "b"], "rows": [["1", "p"], ["2", "q"]]}
+    assert join(left, right, "id")['rows'] == join(left, right, "id", strategy="hash")['rows'] == []
+    with pytest.raises(ValueError):
+        join(left, right, "id", strategy="merge")
+
+@pytest.mark.parametrize("max_memory_rows", [3, 100000])
+def test_sort_table(tmp_path, max_memory_rows):
+    rows = [[str(i % 10), f"n{i}"] for i in range(25, 0, -1)] + [["", "empty"]]
+    table = {"header": ["num", "name"], "rows": rows}
+    result = sort_table(table, "num", max_memory_rows=max_memory_rows, temp_dir=str(tmp_path))
+    keys = [row[0] for row in result['rows']]
+    assert keys == sorted(keys[:-1], key=int) + [""]
+    # устойчивость: при равных ключах сохраняется исходный порядок
+    names = [row[1] for row in result['rows'] if row[0] == "5"]
+    assert names == ["n25", "n15", "n5"]
+
+    path = str(tmp_path / "t.csv")
+    save_csv(table, path)
+    from_file = sort_table(path, "num", max_memory_rows=max_memory_rows, temp_dir=str(tmp_path))
+    assert [list(row) for row in from_file['rows']] == [list(row) for row in result['rows']]
+
+def test_infer_type_only_returns_convertible_types():
+    assert infer_type(["1", "²"]) is str
+    assert infer_type(["²"] * 2000) is str
+    assert infer_type(["1", "٣"]) is int
+    assert infer_type(["1", "2.5", ""]) is float
+    assert infer_type(["", None]) is None
+    table = {"header": ["a"], "rows": [["1"], ["²"]]}
+    types = infer_column_types(table)
+    set_column_types(table, types, by_number=False) # определённый тип всегда преобразуется
+
+def test_render_ragged_rows():
+    table = {"header": ["a", "b", "c"], "rows": [["1", "2", "3"], ["4", "5"], ["6", "7", "8", "9"]]}
+    assert format_table(table) == "a\tb\tc\n1\t2\t3\n4\t5\n6\t7\t8\t9\n"
+    assert format_table(table, align=True).splitlines()[2].split() == ["4", "5"]
+
+def test_render_head_tail_page():
+    table = {"header": ["n"], "rows": [[i] for i in range(10)]}
+    assert format_table(table, head=2, tail=1) == "n\n0\n1\n... (7 строк пропущено)\n9\n"
+    assert format_table(table, page=1, page_size=4) == "n\n4\n5\n6\n7\n"
+
+def test_load_dataset(tmp_path):
+    for number in range(3):
+        save_csv({"header": ["d", "v"], "rows": [[str(number), str(i)] for i in range(2)]}, str(tmp_path / f"part{number}.csv"))
+    save_pickle({"header": ["d", "v"], "rows": [["9", "9"]]}, str(tmp_path / "part9.pkl"))
+    dataset = load_dataset([str(tmp_path / "*.csv"), str(tmp_path / "*.pkl")], workers=1, auto_detect_types=True,
+                           source_column="file")
+    assert len(dataset['rows']) == 7
+    assert dataset['column_types']['d'] is int
+    assert dataset['rows'][-1][2].endswith("part9.pkl")
+
+def test_async_loading(tmp_path):
+    paths = []
+    for number in range(3):
+        path = str(tmp_path / f"t{number}.csv")
+        save_csv({"header": ["n"], "rows": [[str(number)]]}, path)
+        paths.append(path)
+
+    async def main():
+        single = await load_csv_async(paths[0])
+        many = await load_many_async(paths, max_concurrency=2)
+        return single, many
+
+    single, many = asyncio.run(main())
+    assert single == load_csv(paths[0])
+    assert [table['rows'] for table in many] == [[["0"]], [["1"]], [["2"]]]